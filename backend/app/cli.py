@@ -0,0 +1,166 @@
+"""Maintenance commands. Run from the backend directory: ``python -m app.cli <command>``."""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from app.services import database
+
+
+def migrate(args: argparse.Namespace) -> int:
+    from app.services.json_store import JsonStore
+    from app.services.sqlite_store import SqliteStore
+
+    # Through the store, so events not yet compacted into the file come along.
+    data = JsonStore(args.source).export_data()
+    store = SqliteStore(args.target)
+    if not store.is_empty() and not args.replace:
+        print(f"{args.target} already contains data; pass --replace to overwrite it", file=sys.stderr)
+        return 1
+    counts = store.import_data(data, replace=args.replace)
+    print(
+        f"Imported {counts['users']} users, {counts['claims']} claims and "
+        f"{counts['positions']} positions into {args.target}"
+    )
+    return 0
+
+
+def rebuild_odds(args: argparse.Namespace) -> int:
+    count = database.rebuild_claim_stats()
+    print(f"Rebuilt odds totals for {count} claims")
+    return 0
+
+
+def check_odds(args: argparse.Namespace) -> int:
+    mismatched = database.check_claim_stats()
+    for claim_id in mismatched:
+        print(f"{claim_id}: stored totals differ from positions", file=sys.stderr)
+    if mismatched:
+        return 1
+    print("Odds totals match positions")
+    return 0
+
+
+def backfill_reputation(args: argparse.Namespace) -> int:
+    count = database.rebuild_reputation()
+    print(f"Rebuilt reputation counters for {count} users")
+    return 0
+
+
+def check_reputation(args: argparse.Namespace) -> int:
+    mismatched = database.check_reputation()
+    for username in mismatched:
+        print(f"{username}: stored reputation differs from history", file=sys.stderr)
+    if mismatched:
+        return 1
+    print("Reputation counters match history")
+    return 0
+
+
+def rebuild_analytics(args: argparse.Namespace) -> int:
+    days = database.rebuild_analytics()
+    print(f"Rebuilt the analytics rollup over {days} days")
+    return 0
+
+
+def check_analytics(args: argparse.Namespace) -> int:
+    if not database.check_analytics():
+        print("Stored analytics rollup differs from history", file=sys.stderr)
+        return 1
+    print("Analytics rollup matches history")
+    return 0
+
+
+def compact(args: argparse.Namespace) -> int:
+    if database.compact(force=True):
+        print(f"Checkpointed the {database.STORAGE_BACKEND} store")
+        return 0
+    print("Checkpoint did not complete; readers are still using the log", file=sys.stderr)
+    return 1
+
+
+def import_rows(args: argparse.Namespace) -> int:
+    from app.services import bulk_import
+
+    run = bulk_import.import_positions if args.kind == "positions" else bulk_import.import_claims
+    if args.file == "-":
+        result = run(sys.stdin.buffer, atomic=args.atomic)
+    else:
+        with open(args.file, "rb") as f:
+            result = run(f, atomic=args.atomic)
+    for error in result.errors:
+        print(f"line {error.line}: {error.error}", file=sys.stderr)
+    print(f"Imported {result.accepted} {args.kind}, rejected {result.rejected}")
+    return 1 if result.rejected else 0
+
+
+def events(args: argparse.Namespace) -> int:
+    from app.services.json_store import JsonStore
+
+    for event in JsonStore(args.source).iter_events():
+        if args.user and args.user not in _event_users(event):
+            continue
+        print(json.dumps(event, separators=(",", ":")))
+    return 0
+
+
+def _event_users(event: dict) -> set[str]:
+    if event["type"] in ("user_added", "user_updated"):
+        return {event["user"]["username"]}
+    if event["type"] == "position_placed":
+        return {event["debit"]}
+    if event["type"] == "positions_placed":
+        return set(event["debits"])
+    if event["type"] == "claim_settled":
+        return {username for username, _, _ in event["payouts"]}
+    return set()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    p = commands.add_parser("migrate", help="Import a data.json file into the SQLite store")
+    p.add_argument("--source", type=Path, default=database.DATA_PATH)
+    p.add_argument("--target", type=Path, default=database.SQLITE_PATH)
+    p.add_argument("--replace", action="store_true", help="Wipe existing rows first")
+    p.set_defaults(func=migrate)
+
+    p = commands.add_parser("rebuild-odds", help="Recompute per-claim odds totals from positions")
+    p.set_defaults(func=rebuild_odds)
+
+    p = commands.add_parser("check-odds", help="Compare per-claim odds totals with a recount")
+    p.set_defaults(func=check_odds)
+
+    p = commands.add_parser("backfill-reputation", help="Rebuild per-user reputation counters from history")
+    p.set_defaults(func=backfill_reputation)
+
+    p = commands.add_parser("check-reputation", help="Compare reputation counters with a recount")
+    p.set_defaults(func=check_reputation)
+
+    p = commands.add_parser("rebuild-analytics", help="Recompute the daily analytics rollup from history")
+    p.set_defaults(func=rebuild_analytics)
+
+    p = commands.add_parser("check-analytics", help="Compare the analytics rollup with a recount")
+    p.set_defaults(func=check_analytics)
+
+    p = commands.add_parser("compact", help="Fold the JSON event log into data.json (or checkpoint the SQLite WAL)")
+    p.set_defaults(func=compact)
+
+    p = commands.add_parser("import", help="Place positions or create claims from a JSON Lines file in one write")
+    p.add_argument("kind", choices=("positions", "claims"))
+    p.add_argument("file", help="JSON Lines file, or - for stdin")
+    p.add_argument("--atomic", action="store_true", help="Import nothing unless every row is valid")
+    p.set_defaults(func=import_rows)
+
+    p = commands.add_parser("events", help="Print the JSON store's event log, oldest first")
+    p.add_argument("--source", type=Path, default=database.DATA_PATH)
+    p.add_argument("--user", help="Only events that move this user's points")
+    p.set_defaults(func=events)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
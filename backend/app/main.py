@@ -1,12 +1,27 @@
-import json
-from datetime import datetime
-from collections import defaultdict, Counter # Added Counter here
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from datetime import date
+from fastapi import FastAPI, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.routers import claims, users, positions, auth
+from app.services import (
+    codec, database, metrics, nonces, odds_stream, oracle, paging, response_cache, scheduler, shared_state,
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    database.start_compactor()
+    if scheduler.SCHEDULER_ENABLED:
+        scheduler.get_scheduler().start()
+    yield
+    await scheduler.get_scheduler().stop()
+    await odds_stream.get_broadcaster().stop()
+    database.stop_compactor()
+    await oracle.close_client()
+
 
-app = FastAPI(title="Oracle API")
+app = FastAPI(title="Oracle API", lifespan=lifespan, default_response_class=codec.ORJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -14,6 +29,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[paging.NEXT_CURSOR_HEADER, response_cache.ETAG_HEADER],
 )
 
 app.include_router(claims.router, prefix="/api/claims", tags=["claims"])
@@ -22,56 +38,29 @@ app.include_router(positions.router, prefix="/api/positions", tags=["positions"]
 app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
 
 @app.get("/api/analytics")
-def get_analytics():
+async def get_analytics(
+    request: Request,
+    start: date | None = Query(None, alias="from"),
+    end: date | None = Query(None, alias="to"),
+):
+    """TVL, sentiment, staking history and top categories, optionally for
+    positions and claims created between ``from`` and ``to`` (inclusive)."""
     try:
-        with open("data.json", "r") as f:
-            data = json.load(f)
-        
-        positions_list = data.get("positions", [])
-        claims_list = data.get("claims", []) # Get the claims list
-        
-        total_tvl = sum(p["stake"] for p in positions_list)
-        
-        # Aggregate Stakes by Date
-        daily_data = defaultdict(lambda: {"stakes_count": 0, "total_value": 0})
-        for p in positions_list:
-            raw = p.get("created_at", "")
-            date_str = raw.split("T")[0] if "T" in raw else raw.split(" ")[0]
-            if not date_str:
-                continue
-            daily_data[date_str]["stakes_count"] += 1
-            daily_data[date_str]["total_value"] += p.get("stake", 0)
-        
-        # Sort history for the graph
-        sorted_history = []
-        for date in sorted(daily_data.keys()):
-            sorted_history.append({
-                "date": date, 
-                "value": daily_data[date]["total_value"],
-                "count": daily_data[date]["stakes_count"]
-            })
-        
-        # Calculate real sentiment (Yes stakes / Total stakes)
-        yes_stakes = sum(p["stake"] for p in positions_list if p["side"] == "yes")
-        sentiment_val = int((yes_stakes / total_tvl * 100)) if total_tvl > 0 else 50
-
-        # Calculate Top 3 Categories
-        # This counts every category occurrence in the claims list
-        category_counts = Counter(c.get("category", "other") for c in claims_list)
-        top_categories = [
-            {"name": cat, "count": count} 
-            for cat, count in category_counts.most_common(3)
-        ]
-
-        return {
-            "tvl": total_tvl,
-            "sentiment": sentiment_val,
-            "history": sorted_history,
-            "top_categories": top_categories # Send this to the frontend
-        }
+        return await response_cache.respond(request, lambda: (database.get_analytics(start, end), {}))
     except Exception as e:
         return {"error": str(e), "tvl": 0, "sentiment": 0, "history": [], "top_categories": []}
 
 @app.get("/api/health")
-def health():
-    return {"status": "ok"}
\ No newline at end of file
+async def health():
+    return {"status": "ok"}
+
+
+@app.get("/api/metrics")
+async def get_metrics():
+    return {
+        **metrics.snapshot(),
+        "oracle_providers": oracle.provider_health(),
+        "scheduler": scheduler.get_scheduler().status(),
+        "odds_stream": odds_stream.get_broadcaster().status(),
+        "nonces_outstanding": await shared_state.call(nonces.get_nonces().outstanding),
+    }
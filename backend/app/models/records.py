@@ -0,0 +1,44 @@
+"""Lightweight NamedTuple records the stores hand out in bulk instead of pydantic
+models."""
+import uuid
+from datetime import datetime
+from typing import NamedTuple
+from app.models.schemas import Position
+
+
+def new_id(prefix: str) -> str:
+    """A fresh id for a new record, e.g. ``pos-1a2b3c4d5e6f``."""
+    return f"{prefix}-{uuid.uuid4().hex[:12]}"
+
+
+def _datetime(value: datetime | str) -> datetime:
+    return value if isinstance(value, datetime) else datetime.fromisoformat(value)
+
+
+class PositionRecord(NamedTuple):
+    id: str
+    claim_id: str
+    username: str
+    side: str
+    stake: float
+    confidence: float
+    created_at: datetime
+    reasoning: str | None = None
+
+    @classmethod
+    def from_dict(cls, raw: dict) -> "PositionRecord":
+        """Build from a stored row (data.json entry, event or SQLite row)."""
+        return cls(
+            raw["id"],
+            raw["claim_id"],
+            raw["username"],
+            raw["side"],
+            float(raw["stake"]),
+            float(raw["confidence"]),
+            _datetime(raw["created_at"]),
+            raw.get("reasoning"),
+        )
+
+    @classmethod
+    def from_model(cls, position: Position) -> "PositionRecord":
+        return cls(**position.model_dump())
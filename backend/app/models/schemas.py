@@ -63,6 +63,32 @@ class CreatePositionRequest(BaseModel):
     reasoning: str | None = Field(default=None, max_length=500)
 
 
+class ImportClaimRow(CreateClaimRequest):
+    """One line of a bulk claim import; ``id`` and ``created_at`` are generated if absent."""
+
+    id: str | None = Field(default=None, min_length=1)
+    created_at: datetime | None = None
+
+
+class ImportPositionRow(CreatePositionRequest):
+    """One line of a bulk position import; ``id`` and ``created_at`` are generated if absent."""
+
+    id: str | None = Field(default=None, min_length=1)
+    created_at: datetime | None = None
+
+
+class ImportRowError(BaseModel):
+    line: int
+    error: str
+
+
+class ImportResult(BaseModel):
+    accepted: int
+    rejected: int
+    ids: list[str]
+    errors: list[ImportRowError]
+
+
 class ResolveClaimRequest(BaseModel):
     resolution: Literal["yes", "no"]
     username: str
@@ -86,13 +112,18 @@ class ClaimWithOdds(BaseModel):
     position_count: int
 
 
-class UserProfile(BaseModel):
+class UserSummary(BaseModel):
+    """A profile without its embedded positions (the users listing default)."""
+
     username: str
     display_name: str
     wallet_address: str | None = None
     points: float
     accuracy: float | None = None
     total_resolved: int = 0
+
+
+class UserProfile(UserSummary):
     category_stats: dict[str, dict] = {}
     active_positions: list[Position] = []
     resolved_positions: list[Position] = []
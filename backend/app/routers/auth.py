@@ -1,24 +1,12 @@
-import secrets
-import time
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from siwe import SiweMessage
 
 from app.models.schemas import User
-from app.services import database
+from app.services import async_db, database, nonces, shared_state
 
 router = APIRouter()
 
-NONCE_TTL = 300  # 5 minutes
-NONCES: dict[str, tuple[str, float]] = {}  # address -> (nonce, created_at)
-
-
-def _prune_expired_nonces() -> None:
-    now = time.time()
-    expired = [k for k, (_, ts) in NONCES.items() if now - ts > NONCE_TTL]
-    for k in expired:
-        del NONCES[k]
-
 
 class ConnectWalletRequest(BaseModel):
     message: str
@@ -26,17 +14,15 @@ class ConnectWalletRequest(BaseModel):
 
 
 @router.get("/nonce")
-def get_nonce(address: str):
+async def get_nonce(address: str):
     if not address:
         raise HTTPException(status_code=400, detail="Missing address")
-    _prune_expired_nonces()
-    nonce = secrets.token_hex(8)
-    NONCES[address.lower()] = (nonce, time.time())
+    nonce = await shared_state.call(nonces.get_nonces().issue, address)
     return {"nonce": nonce}
 
 
 @router.post("/connect-wallet")
-def connect_wallet(req: ConnectWalletRequest):
+async def connect_wallet(req: ConnectWalletRequest):
     try:
         if hasattr(SiweMessage, "from_message"):
             siwe_msg = SiweMessage.from_message(req.message)
@@ -46,14 +32,12 @@ def connect_wallet(req: ConnectWalletRequest):
         raise HTTPException(status_code=400, detail=f"Invalid SIWE message: {exc}")
 
     address = siwe_msg.address
-    nonce_entry = NONCES.get(address.lower())
-    if not nonce_entry:
-        raise HTTPException(status_code=400, detail="Missing or expired nonce")
-    expected_nonce, created_at = nonce_entry
-    if time.time() - created_at > NONCE_TTL:
+    store = nonces.get_nonces()
+    pending = await shared_state.call(store.pending, address)
+    if not pending:
         raise HTTPException(status_code=400, detail="Missing or expired nonce")
 
-    if siwe_msg.nonce != expected_nonce:
+    if siwe_msg.nonce not in pending:
         raise HTTPException(status_code=400, detail="Nonce mismatch")
 
     try:
@@ -61,14 +45,17 @@ def connect_wallet(req: ConnectWalletRequest):
     except Exception as exc:
         raise HTTPException(status_code=400, detail=f"Signature validation failed: {exc}")
 
-    NONCES.pop(address.lower(), None)
+    # Single use: of concurrent logins with the same signed message, only
+    # the one that consumes the nonce proceeds.
+    if not await shared_state.call(store.consume, address, siwe_msg.nonce):
+        raise HTTPException(status_code=400, detail="Missing or expired nonce")
 
-    user = database.get_user_by_wallet(address)
+    user = await async_db.lookup(database.get_user_by_wallet, address)
     if user is None:
         username = address
         display_name = f"{address[:6]}...{address[-4:]}"
         user = User(username=username, display_name=display_name, wallet_address=address)
-        database.add_user(user)
+        await async_db.write(database.add_user, user)
 
     return {
         "username": user.username,
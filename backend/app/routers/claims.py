@@ -1,58 +1,128 @@
-import uuid
 from datetime import datetime, timezone
-from fastapi import APIRouter, HTTPException
+from typing import Literal
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from app.models.records import new_id
 from app.models.schemas import (
     Claim,
     ClaimWithOdds,
     CreateClaimRequest,
+    ImportClaimRow,
+    ImportResult,
     ResolveClaimRequest,
 )
-from app.services import database, odds, oracle
+from app.services import (
+    async_db, bulk_import, database, odds, odds_stream, oracle, paging, response_cache, scheduler,
+)
 from app.services.resolution import resolve_claim
 
 router = APIRouter()
 
 
 @router.get("/", response_model=list[ClaimWithOdds])
-def list_claims():
-    claims = database.get_all_claims()
+async def list_claims(
+    request: Request,
+    status: Literal["active", "resolved_yes", "resolved_no"] | None = None,
+    category: str | None = None,
+    created_by: str | None = None,
+    cursor: str | None = None,
+    limit: int | None = Query(None, ge=1, le=paging.MAX_LIMIT),
+):
+    """Claims in creation order. With ``limit``, the next page's cursor is
+    returned in the X-Next-Cursor header."""
+    return await response_cache.respond(
+        request,
+        lambda: _list_claims(status, category, created_by, cursor, limit),
+        list[ClaimWithOdds],
+    )
+
+
+def _list_claims(
+    status: str | None,
+    category: str | None,
+    created_by: str | None,
+    cursor: str | None,
+    limit: int | None,
+):
+    try:
+        page = database.page_claims(status, category, created_by, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    headers = {paging.NEXT_CURSOR_HEADER: page.next_cursor} if page.next_cursor else {}
+    if limit is None:
+        claim_stats = database.get_all_claim_stats()
+    else:
+        claim_stats = {c.id: database.get_claim_stats(c.id) for c in page.items}
     result = []
-    for claim in claims:
-        positions = database.get_positions_for_claim(claim.id)
-        yes_pct, no_pct = odds.calculate_odds(positions)
+    for claim in page.items:
+        totals = claim_stats.get(claim.id)
+        o = totals.to_odds() if totals else odds.ClaimOdds()
         result.append(
             ClaimWithOdds(
                 **claim.model_dump(),
-                yes_percentage=yes_pct,
-                no_percentage=no_pct,
-                total_staked=sum(p.stake for p in positions),
-                position_count=len(positions),
+                yes_percentage=o.yes_percentage,
+                no_percentage=o.no_percentage,
+                total_staked=o.total_staked,
+                position_count=o.position_count,
             )
         )
-    return result
+    return result, headers
+
+
+@router.get("/stream")
+async def stream_odds(claim_id: list[str] | None = Query(None)):
+    """Server-sent events: ``odds`` when a claim's odds move and ``resolved``
+    when it is resolved, for the given claims (every claim when none are
+    given). Streams for given claims start with their current odds."""
+    broadcaster = odds_stream.get_broadcaster()
+    sub = broadcaster.subscribe(claim_id)
+    try:
+        events = await async_db.read(odds_stream.current_events, list(dict.fromkeys(claim_id or [])))
+        if claim_id and {e["claim_id"] for e in events} != set(claim_id):
+            raise HTTPException(status_code=404, detail="Claim not found")
+    except BaseException:
+        broadcaster.unsubscribe(sub)
+        raise
+
+    async def body():
+        try:
+            yield b"".join(odds_stream.frame(e) for e in events) or b": connected\n\n"
+            async for chunk in sub.frames():
+                yield chunk
+        finally:
+            broadcaster.unsubscribe(sub)
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("/{claim_id}", response_model=ClaimWithOdds)
-def get_claim(claim_id: str):
+async def get_claim(claim_id: str, request: Request):
+    return await response_cache.respond(request, lambda: (_get_claim(claim_id), {}), ClaimWithOdds)
+
+
+def _get_claim(claim_id: str) -> ClaimWithOdds:
     claim = database.get_claim(claim_id)
     if claim is None:
         raise HTTPException(status_code=404, detail="Claim not found")
 
-    positions = database.get_positions_for_claim(claim_id)
-    yes_pct, no_pct = odds.calculate_odds(positions)
+    o = database.get_claim_stats(claim_id).to_odds()
     return ClaimWithOdds(
         **claim.model_dump(),
-        yes_percentage=yes_pct,
-        no_percentage=no_pct,
-        total_staked=sum(p.stake for p in positions),
-        position_count=len(positions),
+        yes_percentage=o.yes_percentage,
+        no_percentage=o.no_percentage,
+        total_staked=o.total_staked,
+        position_count=o.position_count,
     )
 
 
 @router.post("/", response_model=Claim, status_code=201)
-def create_claim(req: CreateClaimRequest):
+async def create_claim(req: CreateClaimRequest):
     if req.created_by:
-        user = database.get_user(req.created_by)
+        user = await async_db.lookup(database.get_user, req.created_by)
         if user is None:
             raise HTTPException(status_code=404, detail="User not found")
     oracle_config = req.oracle_config
@@ -62,36 +132,12 @@ def create_claim(req: CreateClaimRequest):
         oracle_config = None
 
     if resolution_type == "oracle":
-        if not req.resolution_date:
-            raise HTTPException(status_code=400, detail="Missing resolution date")
-        if req.resolution_date <= datetime.now(timezone.utc):
-            raise HTTPException(status_code=400, detail="Resolution date must be in the future")
-        if not isinstance(oracle_config, dict):
-            raise HTTPException(status_code=400, detail="Missing oracle config")
-        oracle_type = oracle_config.get("type")
-        feed = oracle_config.get("feed")
-        comparator = oracle_config.get("comparator")
-        target = oracle_config.get("target")
-        if oracle_type != "chainlink_price":
-            raise HTTPException(status_code=400, detail="Unsupported oracle type")
-        if not feed or not comparator or target is None:
-            raise HTTPException(status_code=400, detail="Incomplete oracle config")
-        if feed not in oracle.CHAINLINK_FEEDS:
-            raise HTTPException(status_code=400, detail=f"Unsupported oracle feed: {feed}")
-        if comparator not in [">", ">=", "<", "<="]:
-            raise HTTPException(status_code=400, detail="Invalid comparator")
         try:
-            target = float(target)
-        except ValueError as exc:
-            raise HTTPException(status_code=400, detail=f"Invalid target: {exc}")
-        oracle_config = {
-            "type": oracle_type,
-            "feed": feed,
-            "comparator": comparator,
-            "target": target,
-        }
+            oracle_config = oracle.validate_config(req.resolution_date, oracle_config)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
     claim = Claim(
-        id=f"claim-{uuid.uuid4().hex[:8]}",
+        id=new_id("claim"),
         title=req.title,
         description=req.description,
         category=req.category,
@@ -100,13 +146,24 @@ def create_claim(req: CreateClaimRequest):
         resolution_date=req.resolution_date,
         oracle_config=oracle_config,
     )
-    database.add_claim(claim)
+    await async_db.write(database.add_claim, claim)
+    scheduler.schedule_claim(claim)
     return claim
 
 
+@router.post("/import", response_model=ImportResult)
+async def import_claims(request: Request, atomic: bool = False):
+    """Create the claims in a JSON Lines body (one claim request per line,
+    optionally with ``id`` and ``created_at``) in a single write. Rejected
+    rows are listed by line number; with ``atomic`` none are created unless
+    all are valid."""
+    rows, errors = await bulk_import.parse_stream(request.stream(), ImportClaimRow)
+    return await async_db.write(bulk_import.import_claim_rows, rows, errors, atomic)
+
+
 @router.delete("/{claim_id}", status_code=204)
-def delete_claim(claim_id: str, username: str):
-    claim = database.get_claim(claim_id)
+async def delete_claim(claim_id: str, username: str):
+    claim = await async_db.lookup(database.get_claim, claim_id)
     if claim is None:
         raise HTTPException(status_code=404, detail="Claim not found")
     if claim.created_by is None:
@@ -114,23 +171,23 @@ def delete_claim(claim_id: str, username: str):
     if claim.created_by != username:
         raise HTTPException(status_code=403, detail="Not allowed to delete this claim")
 
-    positions = database.get_positions_for_claim(claim_id)
+    positions = await async_db.read(database.get_positions_for_claim, claim_id)
     if positions:
         raise HTTPException(status_code=400, detail="Cannot delete a claim with positions")
 
-    database.delete_claim(claim_id)
+    await async_db.write(database.delete_claim, claim_id)
     return None
 
 
 @router.post("/{claim_id}/resolve", response_model=Claim)
-def resolve(claim_id: str, req: ResolveClaimRequest):
-    claim = database.get_claim(claim_id)
+async def resolve(claim_id: str, req: ResolveClaimRequest):
+    claim = await async_db.lookup(database.get_claim, claim_id)
     if claim is None:
         raise HTTPException(status_code=404, detail="Claim not found")
     if claim.created_by is None or claim.created_by != req.username:
         raise HTTPException(status_code=403, detail="Only the claim creator can resolve it")
     try:
-        return resolve_claim(claim_id, req.resolution)
+        return await async_db.write(resolve_claim, claim_id, req.resolution)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -144,8 +201,8 @@ def _normalize_resolution_date(value: datetime | None) -> datetime | None:
 
 
 @router.get("/{claim_id}/oracle-status")
-def oracle_status(claim_id: str):
-    claim = database.get_claim(claim_id)
+async def oracle_status(claim_id: str):
+    claim = await async_db.lookup(database.get_claim, claim_id)
     if claim is None:
         raise HTTPException(status_code=404, detail="Claim not found")
     if claim.resolution_type != "oracle" or not claim.oracle_config:
@@ -155,7 +212,7 @@ def oracle_status(claim_id: str):
     comparator = claim.oracle_config.get("comparator")
     target = claim.oracle_config.get("target")
     try:
-        result = oracle.get_chainlink_price(feed)
+        result = await oracle.get_chainlink_price_async(feed)
     except (ConnectionError, ValueError) as exc:
         raise HTTPException(status_code=502, detail=str(exc))
     would_resolve = oracle.evaluate_condition(result.value, comparator, float(target))
@@ -175,8 +232,8 @@ def oracle_status(claim_id: str):
 
 
 @router.post("/{claim_id}/check-oracle")
-def check_oracle(claim_id: str):
-    claim = database.get_claim(claim_id)
+async def check_oracle(claim_id: str):
+    claim = await async_db.lookup(database.get_claim, claim_id)
     if claim is None:
         raise HTTPException(status_code=404, detail="Claim not found")
     if claim.status != "active":
@@ -188,7 +245,7 @@ def check_oracle(claim_id: str):
     comparator = claim.oracle_config.get("comparator")
     target = claim.oracle_config.get("target")
     try:
-        result = oracle.get_chainlink_price(feed)
+        result = await oracle.get_chainlink_price_async(feed)
     except (ConnectionError, ValueError) as exc:
         raise HTTPException(status_code=502, detail=str(exc))
     would_resolve = oracle.evaluate_condition(result.value, comparator, float(target))
@@ -202,7 +259,10 @@ def check_oracle(claim_id: str):
             "resolution_date": resolution_date.isoformat(),
         }
 
-    resolved_claim = resolve_claim(claim_id, "yes" if would_resolve else "no")
+    try:
+        resolved_claim = await async_db.write(resolve_claim, claim_id, "yes" if would_resolve else "no")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     return {
         "resolved": True,
         "resolution": "yes" if would_resolve else "no",
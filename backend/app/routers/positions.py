@@ -1,25 +1,40 @@
-import uuid
-from fastapi import APIRouter, HTTPException
-from app.models.schemas import Position, CreatePositionRequest
-from app.services import database
+from datetime import datetime, timezone
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from app.models.records import PositionRecord, new_id
+from app.models.schemas import Position, CreatePositionRequest, ImportPositionRow, ImportResult
+from app.services import async_db, bulk_import, database, odds_stream, paging
 
 router = APIRouter()
 
 
 @router.get("/", response_model=list[Position])
-def list_positions():
-    return database.get_all_positions()
+async def list_positions(
+    response: Response,
+    claim_id: str | None = None,
+    username: str | None = None,
+    cursor: str | None = None,
+    limit: int | None = Query(None, ge=1, le=paging.MAX_LIMIT),
+):
+    """Positions in creation order. With ``limit``, the next page's cursor is
+    returned in the X-Next-Cursor header."""
+    try:
+        page = await async_db.read(database.page_positions, claim_id, username, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if page.next_cursor:
+        response.headers[paging.NEXT_CURSOR_HEADER] = page.next_cursor
+    return [p._asdict() for p in page.items]
 
 
 @router.post("/", response_model=Position, status_code=201)
-def create_position(req: CreatePositionRequest):
+async def create_position(req: CreatePositionRequest):
     # Validate user exists
-    user = database.get_user(req.username)
+    user = await async_db.lookup(database.get_user, req.username)
     if user is None:
         raise HTTPException(status_code=404, detail="User not found")
 
     # Validate claim exists and is active
-    claim = database.get_claim(req.claim_id)
+    claim = await async_db.lookup(database.get_claim, req.claim_id)
     if claim is None:
         raise HTTPException(status_code=404, detail="Claim not found")
     if claim.status != "active":
@@ -32,23 +47,35 @@ def create_position(req: CreatePositionRequest):
             detail=f"Insufficient points: have {user.points}, need {req.stake}",
         )
 
-    # Deduct points
-    updated_user = user.model_copy(update={"points": user.points - req.stake})
-    database.update_user(updated_user)
-
     reasoning = req.reasoning.strip() if req.reasoning else None
     if reasoning == "":
         reasoning = None
 
-    # Create position
-    position = Position(
-        id=f"pos-{uuid.uuid4().hex[:8]}",
+    # Create position and deduct points in one write
+    position = PositionRecord(
+        id=new_id("pos"),
         claim_id=req.claim_id,
         username=req.username,
         side=req.side,
         stake=req.stake,
         confidence=req.confidence,
+        created_at=datetime.now(timezone.utc),
         reasoning=reasoning,
     )
-    database.add_position(position)
-    return position
+    try:
+        await async_db.write(database.place_position, position)
+    except ValueError as e:
+        # Lost a race with a concurrent stake or resolution
+        raise HTTPException(status_code=400, detail=str(e))
+    odds_stream.publish(position.claim_id)
+    return position._asdict()
+
+
+@router.post("/import", response_model=ImportResult)
+async def import_positions(request: Request, atomic: bool = False):
+    """Place the stakes in a JSON Lines body (one position request per line,
+    optionally with ``id`` and ``created_at``) in a single write. Rejected
+    rows are listed by line number; with ``atomic`` none are placed unless
+    all are valid."""
+    rows, errors = await bulk_import.parse_stream(request.stream(), ImportPositionRow)
+    return await async_db.write(bulk_import.import_position_rows, rows, errors, atomic)
@@ -1,56 +1,103 @@
-from fastapi import APIRouter, HTTPException
-from app.models.schemas import UserProfile
-from app.services import database
-from app.services.reputation import calculate_accuracy, calculate_category_stats
+from fastapi import APIRouter, HTTPException, Query, Request
+from app.models.schemas import UserProfile, UserSummary
+from app.services import async_db, database, paging, response_cache
+from app.services.reputation import UserStats, calculate_user_stats_bulk, summarize
 
 router = APIRouter()
 
 
-@router.get("/", response_model=list[UserProfile])
-def list_users():
-    users = database.get_all_users()
-    claims = database.get_all_claims()
-    claim_map = {c.id: c for c in claims}
+def _claims_of(positions: list) -> list:
+    """The claims these positions are on, fetched by id."""
+    return [c for cid in {p.claim_id for p in positions} if (c := database.get_claim(cid))]
+
+
+@router.get("/", response_model=list[UserSummary | UserProfile])
+async def list_users(
+    request: Request,
+    include_positions: bool = False,
+    cursor: str | None = None,
+    limit: int | None = Query(None, ge=1, le=paging.MAX_LIMIT),
+):
+    """Users in sign-up order, without their positions unless
+    ``include_positions`` is set. With ``limit``, the next page's cursor is
+    returned in the X-Next-Cursor header."""
+    return await response_cache.respond(
+        request,
+        lambda: _list_users(include_positions, cursor, limit),
+        list[UserSummary | UserProfile],
+    )
+
+
+def _list_users(include_positions: bool, cursor: str | None, limit: int | None):
+    try:
+        page = database.page_users(cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    headers = {paging.NEXT_CURSOR_HEADER: page.next_cursor} if page.next_cursor else {}
+    if limit is None:
+        reputation = database.get_all_reputation()
+    else:
+        reputation = {u.username: database.get_reputation(u.username) for u in page.items}
+
+    user_stats: dict[str, UserStats] = {}
+    if include_positions:
+        if limit is None:
+            positions, claims = database.get_all_positions(), database.get_all_claims()
+        else:
+            positions = [p for u in page.items for p in database.get_positions_for_user(u.username)]
+            claims = _claims_of(positions)
+        user_stats = calculate_user_stats_bulk(positions, claims)
+
     result = []
-    for user in users:
-        positions = database.get_positions_for_user(user.username)
-        active = [p for p in positions if claim_map.get(p.claim_id) and claim_map[p.claim_id].status == "active"]
-        resolved = [p for p in positions if p not in active]
+    for user in page.items:
+        counters = reputation.get(user.username, {})
+        accuracy, _ = summarize(counters)
+        summary = UserSummary(
+            username=user.username,
+            display_name=user.display_name,
+            wallet_address=user.wallet_address,
+            points=user.points,
+            accuracy=accuracy,
+            # Reputation counters cover exactly the positions on resolved claims.
+            total_resolved=sum(c["total"] for c in counters.values()),
+        )
+        if not include_positions:
+            result.append(summary)
+            continue
+        stats = user_stats.get(user.username) or UserStats()
         result.append(
             UserProfile(
-                username=user.username,
-                display_name=user.display_name,
-                wallet_address=user.wallet_address,
-                points=user.points,
-                accuracy=calculate_accuracy(positions, claims),
-                total_resolved=len(resolved),
-                active_positions=active,
-                resolved_positions=resolved,
+                **summary.model_dump(exclude={"total_resolved"}),
+                total_resolved=stats.total_resolved,
+                active_positions=[p._asdict() for p in stats.active_positions],
+                resolved_positions=[p._asdict() for p in stats.resolved_positions],
             )
         )
-    return result
+    return result, headers
 
 
 @router.get("/{username}", response_model=UserProfile)
-def get_user(username: str):
+async def get_user(username: str):
+    return await async_db.read(_get_user, username)
+
+
+def _get_user(username: str) -> UserProfile:
     user = database.get_user(username)
     if user is None:
         raise HTTPException(status_code=404, detail="User not found")
 
-    claims = database.get_all_claims()
-    claim_map = {c.id: c for c in claims}
     positions = database.get_positions_for_user(username)
-    active = [p for p in positions if claim_map.get(p.claim_id) and claim_map[p.claim_id].status == "active"]
-    resolved = [p for p in positions if p not in active]
+    stats = calculate_user_stats_bulk(positions, _claims_of(positions)).get(username) or UserStats()
+    accuracy, category_stats = summarize(database.get_reputation(username))
 
     return UserProfile(
         username=user.username,
         display_name=user.display_name,
         wallet_address=user.wallet_address,
         points=user.points,
-        accuracy=calculate_accuracy(positions, claims),
-        total_resolved=len(resolved),
-        category_stats=calculate_category_stats(positions, claims),
-        active_positions=active,
-        resolved_positions=resolved,
+        accuracy=accuracy,
+        total_resolved=stats.total_resolved,
+        category_stats=category_stats,
+        active_positions=[p._asdict() for p in stats.active_positions],
+        resolved_positions=[p._asdict() for p in stats.resolved_positions],
     )
@@ -0,0 +1,132 @@
+"""Market analytics (TVL, sentiment, staking history, top categories) from the
+rollups the stores keep, so a report costs O(days) however many positions exist."""
+import math
+from collections import Counter
+from datetime import date
+from app.models.records import PositionRecord
+from app.models.schemas import Claim
+
+
+def empty_rollup() -> dict:
+    return {
+        "total": {"count": 0, "value": 0, "yes_value": 0},
+        "days": {},
+        "categories": {},
+        "category_totals": {},
+    }
+
+
+def _day(record: PositionRecord | Claim) -> str:
+    return record.created_at.date().isoformat()
+
+
+def _bump(bucket: dict, position: PositionRecord) -> None:
+    bucket["count"] += 1
+    bucket["value"] += position.stake
+    if position.side == "yes":
+        bucket["yes_value"] += position.stake
+
+
+def add_position(rollup: dict, position: PositionRecord) -> None:
+    _bump(rollup["total"], position)
+    day = rollup["days"].setdefault(_day(position), {"count": 0, "value": 0, "yes_value": 0})
+    _bump(day, position)
+
+
+def add_claim(rollup: dict, claim: Claim) -> None:
+    cats = rollup["categories"].setdefault(_day(claim), {})
+    cats[claim.category] = cats.get(claim.category, 0) + 1
+    totals = rollup["category_totals"]
+    totals[claim.category] = totals.get(claim.category, 0) + 1
+
+
+def remove_claim(rollup: dict, claim: Claim) -> None:
+    day = _day(claim)
+    cats = rollup["categories"].get(day, {})
+    if cats.get(claim.category, 0) <= 1:
+        cats.pop(claim.category, None)
+        if not cats:
+            rollup["categories"].pop(day, None)
+    else:
+        cats[claim.category] -= 1
+    totals = rollup["category_totals"]
+    if totals.get(claim.category, 0) <= 1:
+        totals.pop(claim.category, None)
+    else:
+        totals[claim.category] -= 1
+
+
+def copy_rollup(rollup: dict) -> dict:
+    return {
+        "total": dict(rollup["total"]),
+        "days": {d: dict(b) for d, b in rollup["days"].items()},
+        "categories": {d: dict(c) for d, c in rollup["categories"].items()},
+        "category_totals": dict(rollup["category_totals"]),
+    }
+
+
+def build_rollup(positions: list[PositionRecord], claims: list[Claim]) -> dict:
+    """Rollup from raw history (rebuilds and consistency checks)."""
+    rollup = empty_rollup()
+    for p in positions:
+        add_position(rollup, p)
+    for c in claims:
+        add_claim(rollup, c)
+    return rollup
+
+
+def _number(value: float) -> float | int:
+    """A day's stake sum as an int when whole, as the full scan over data.json gave it."""
+    return int(value) if float(value).is_integer() else value
+
+
+def report(rollup: dict, start: date | None = None, end: date | None = None) -> dict:
+    """The /api/analytics payload, optionally limited to days in [start, end]."""
+    lo = start.isoformat() if start else None
+    hi = end.isoformat() if end else None
+
+    def in_range(day: str) -> bool:
+        return (lo is None or day >= lo) and (hi is None or day <= hi)
+
+    days = sorted(d for d in rollup["days"] if in_range(d))
+    if lo is None and hi is None:
+        total = rollup["total"]
+        category_counts = Counter(rollup["category_totals"])
+    else:
+        total = {"count": 0, "value": 0, "yes_value": 0}
+        for d in days:
+            for key in total:
+                total[key] += rollup["days"][d][key]
+        category_counts = Counter()
+        for d in sorted(d for d in rollup["categories"] if in_range(d)):
+            category_counts.update(rollup["categories"][d])
+
+    tvl = total["value"]
+    return {
+        "tvl": tvl,
+        "sentiment": int((total["yes_value"] / tvl * 100)) if tvl > 0 else 50,
+        "history": [
+            {"date": d, "value": _number(rollup["days"][d]["value"]), "count": rollup["days"][d]["count"]}
+            for d in days
+        ],
+        "top_categories": [
+            {"name": cat, "count": count} for cat, count in category_counts.most_common(3)
+        ],
+    }
+
+
+def rollups_match(a: dict, b: dict) -> bool:
+    """Equal up to float rounding in the stake sums."""
+
+    def close(x: dict, y: dict) -> bool:
+        return x["count"] == y["count"] and all(
+            math.isclose(x[k], y[k], rel_tol=1e-9, abs_tol=1e-9) for k in ("value", "yes_value")
+        )
+
+    return (
+        close(a["total"], b["total"])
+        and a["days"].keys() == b["days"].keys()
+        and all(close(a["days"][d], b["days"][d]) for d in a["days"])
+        and a["categories"] == b["categories"]
+        and list(a["category_totals"].items()) == list(b["category_totals"].items())
+    )
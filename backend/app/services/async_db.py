@@ -0,0 +1,39 @@
+"""Awaitable access to ``database``: reads and writes on separate thread pools,
+and cheap index lookups inline when the JSON store can answer from memory."""
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, TypeVar
+
+from app.services import database
+
+T = TypeVar("T")
+
+# Threads for reads the store cannot answer from memory (SQLite, JSON reloads).
+READ_THREADS = int(os.getenv("STORAGE_READ_THREADS", "8"))
+# Threads for writes; the stores serialize writes, so a few are enough.
+WRITE_THREADS = int(os.getenv("STORAGE_WRITE_THREADS", "2"))
+
+_readers = ThreadPoolExecutor(READ_THREADS, thread_name_prefix="storage-read")
+_writers = ThreadPoolExecutor(WRITE_THREADS, thread_name_prefix="storage-write")
+
+
+async def read(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """``fn(*args, **kwargs)``, which must only read from the store, on a reader thread."""
+    return await asyncio.get_running_loop().run_in_executor(_readers, partial(fn, *args, **kwargs))
+
+
+async def lookup(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """``read`` for cheap index lookups, inline when the store can answer from memory."""
+    store = database.get_store()
+    if hasattr(store, "memory_reads"):
+        with store.memory_reads() as in_memory:
+            if in_memory:
+                return fn(*args, **kwargs)
+    return await read(fn, *args, **kwargs)
+
+
+async def write(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """``fn(*args, **kwargs)`` on a writer thread."""
+    return await asyncio.get_running_loop().run_in_executor(_writers, partial(fn, *args, **kwargs))
@@ -0,0 +1,171 @@
+"""Bulk import of positions or claims from JSON Lines, validated like the
+single-row endpoints and written to the store in one batch."""
+import asyncio
+from datetime import datetime, timezone
+from typing import AsyncIterable, Iterable, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+from app.models.records import PositionRecord, new_id
+from app.models.schemas import Claim, ImportClaimRow, ImportPositionRow, ImportResult, ImportRowError
+from app.services import database, odds_stream, oracle, scheduler
+
+M = TypeVar("M", bound=BaseModel)
+
+# Lines validated per thread hop when parsing a streamed body.
+PARSE_BATCH = 1000
+
+
+def _describe(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(map(str, e['loc']))}: {e['msg']}" if e["loc"] else e["msg"]
+        for e in error.errors(include_url=False)
+    )
+
+
+def parse_lines(
+    lines: Iterable[bytes | str], model: type[M], start: int = 1
+) -> tuple[list[tuple[int, M]], list[ImportRowError]]:
+    """Validate each non-blank line as ``model``, numbering lines from ``start``.
+    Returns (line number, row) pairs and the errors of the lines that failed."""
+    rows: list[tuple[int, M]] = []
+    errors: list[ImportRowError] = []
+    for number, line in enumerate(lines, start):
+        if not line.strip():
+            continue
+        try:
+            rows.append((number, model.model_validate_json(line)))
+        except ValidationError as e:
+            errors.append(ImportRowError(line=number, error=_describe(e)))
+    return rows, errors
+
+
+async def parse_stream(
+    chunks: AsyncIterable[bytes], model: type[M]
+) -> tuple[list[tuple[int, M]], list[ImportRowError]]:
+    """``parse_lines`` over a body arriving in chunks, e.g. ``request.stream()``.
+
+    Lines are validated on a thread in batches of ``PARSE_BATCH`` as they
+    arrive, so only the rows are kept, never the whole body.
+    """
+    rows: list[tuple[int, M]] = []
+    errors: list[ImportRowError] = []
+    pending: list[bytes] = []
+    tail = b""
+    number = 1
+
+    async def flush() -> None:
+        nonlocal number
+        parsed, failed = await asyncio.to_thread(parse_lines, pending, model, number)
+        rows.extend(parsed)
+        errors.extend(failed)
+        number += len(pending)
+        pending.clear()
+
+    async for chunk in chunks:
+        lines = (tail + chunk).split(b"\n")
+        tail = lines.pop()
+        pending.extend(lines)
+        if len(pending) >= PARSE_BATCH:
+            await flush()
+    if tail:
+        pending.append(tail)
+    if pending:
+        await flush()
+    return rows, errors
+
+
+def _created_at(value: datetime | None) -> datetime:
+    if value is None:
+        return datetime.now(timezone.utc)
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+def _result(numbers: list[int], ids: list[str], rejected: dict[int, str],
+            errors: list[ImportRowError], atomic: bool) -> ImportResult:
+    """Combine parse errors with the store's rejections (indexes into ``numbers``)."""
+    errors = sorted(
+        errors + [ImportRowError(line=numbers[i], error=message) for i, message in rejected.items()],
+        key=lambda e: e.line,
+    )
+    accepted = [] if atomic and errors else [id_ for i, id_ in enumerate(ids) if i not in rejected]
+    return ImportResult(accepted=len(accepted), rejected=len(errors), ids=accepted, errors=errors)
+
+
+def import_positions(lines: Iterable[bytes | str], atomic: bool = False) -> ImportResult:
+    """Place the stakes in ``lines`` (JSON objects, one per line) in one write."""
+    return import_position_rows(*parse_lines(lines, ImportPositionRow), atomic)
+
+
+def import_position_rows(rows: list[tuple[int, ImportPositionRow]], errors: list[ImportRowError],
+                         atomic: bool = False) -> ImportResult:
+    """Place parsed position rows in one write; ``errors`` are the lines that failed to parse."""
+    positions = []
+    for _, row in rows:
+        reasoning = row.reasoning.strip() if row.reasoning else None
+        positions.append(PositionRecord(
+            id=row.id or new_id("pos"),
+            claim_id=row.claim_id,
+            username=row.username,
+            side=row.side,
+            stake=row.stake,
+            confidence=row.confidence,
+            created_at=_created_at(row.created_at),
+            reasoning=reasoning or None,
+        ))
+    rejected = {}
+    if positions:
+        # With parse errors an atomic import commits nothing, but every row is still checked.
+        rejected = database.place_positions(positions, atomic, dry_run=atomic and bool(errors))
+    result = _result([n for n, _ in rows], [p.id for p in positions], rejected, errors, atomic)
+    if result.accepted:
+        for claim_id in {p.claim_id for i, p in enumerate(positions) if i not in rejected}:
+            odds_stream.publish(claim_id)
+    return result
+
+
+def import_claims(lines: Iterable[bytes | str], atomic: bool = False) -> ImportResult:
+    """Create the claims in ``lines`` (JSON objects, one per line) in one write."""
+    return import_claim_rows(*parse_lines(lines, ImportClaimRow), atomic)
+
+
+def import_claim_rows(rows: list[tuple[int, ImportClaimRow]], errors: list[ImportRowError],
+                      atomic: bool = False) -> ImportResult:
+    """Create parsed claim rows in one write; ``errors`` are the lines that failed to parse."""
+    numbers: list[int] = []
+    claims: list[Claim] = []
+    creators: dict[str, bool] = {}
+    for number, row in rows:
+        try:
+            if row.created_by:
+                if row.created_by not in creators:
+                    creators[row.created_by] = database.get_user(row.created_by) is not None
+                if not creators[row.created_by]:
+                    raise ValueError("User not found")
+            oracle_config = None
+            if row.resolution_type == "oracle":
+                oracle_config = oracle.validate_config(row.resolution_date, row.oracle_config)
+        except ValueError as e:
+            errors.append(ImportRowError(line=number, error=str(e)))
+            continue
+        numbers.append(number)
+        claims.append(Claim(
+            id=row.id or new_id("claim"),
+            title=row.title,
+            description=row.description,
+            category=row.category,
+            created_at=_created_at(row.created_at),
+            created_by=row.created_by,
+            resolution_type=row.resolution_type,
+            resolution_date=row.resolution_date,
+            oracle_config=oracle_config,
+        ))
+    rejected = {}
+    if claims:
+        rejected = database.add_claims(claims, atomic, dry_run=atomic and bool(errors))
+    result = _result(numbers, [c.id for c in claims], rejected, errors, atomic)
+    if result.accepted:
+        for i, claim in enumerate(claims):
+            if i not in rejected:
+                scheduler.schedule_claim(claim)
+    return result
@@ -0,0 +1,45 @@
+"""JSON encoding for the JSON store and API responses: orjson when installed,
+the stdlib ``json`` otherwise, with identical output but for float exponents."""
+import json
+import os
+from datetime import date, datetime
+from typing import Any
+
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+# data.json is written compactly; set DATA_JSON_INDENT=1 for a readable file.
+INDENT = os.getenv("DATA_JSON_INDENT", "0") not in ("0", "false", "no", "")
+
+
+def _default(value: Any) -> str:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(obj, indent=2, default=_default, ensure_ascii=False).encode()
+    return json.dumps(obj, separators=(",", ":"), default=_default, ensure_ascii=False).encode()
+
+
+def loads(data: bytes | str) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson when available (stdlib otherwise)."""
+
+    def render(self, content: Any) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
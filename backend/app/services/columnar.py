@@ -0,0 +1,213 @@
+"""Optional NumPy engine for bulk odds, analytics and reputation, enabled by
+``COLUMNAR_ENGINE=1``; results match the pure-Python functions exactly."""
+import logging
+import os
+from datetime import date, datetime, timedelta
+from app.models.records import PositionRecord
+from app.models.schemas import Claim
+from app.services import analytics, odds, reputation
+from app.services.odds import ClaimOdds, OddsTotals
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+logger = logging.getLogger(__name__)
+
+ENABLED = os.getenv("COLUMNAR_ENGINE", "0") not in ("0", "false", "no", "")
+# Below this many positions, building the columns costs more than it saves.
+MIN_POSITIONS = 10_000
+
+if ENABLED and np is None:  # pragma: no cover - optional dependency
+    logger.warning("COLUMNAR_ENGINE is set but numpy is not installed; using the pure-Python aggregates")
+
+_EPOCH_DATE = date(1970, 1, 1)
+_EPOCH_ORDINAL = _EPOCH_DATE.toordinal()
+_US_PER_DAY = 86_400_000_000
+
+
+def available() -> bool:
+    return np is not None
+
+
+def aggregate(
+    positions: list[PositionRecord], claims: list[Claim]
+) -> tuple[dict[str, OddsTotals], dict[str, dict[str, dict]], dict]:
+    """Odds totals, reputation tally and analytics rollup of ``positions``.
+
+    Built from one set of columns when the engine is enabled, else with the
+    pure-Python functions; the results are identical either way.
+    """
+    if ENABLED and np is not None and len(positions) >= MIN_POSITIONS:
+        columns = PositionColumns.from_positions(positions)
+        return columns.accumulate_totals(), columns.tally_all(claims), columns.build_rollup(claims)
+    return (
+        odds.accumulate_totals(positions),
+        reputation.tally_all(positions, claims),
+        analytics.build_rollup(positions, claims),
+    )
+
+
+def _wall_clock_us(when: datetime) -> int:
+    # Field arithmetic rather than (when - epoch) // 1us: about 4x faster.
+    seconds = (when.toordinal() - _EPOCH_ORDINAL) * 86_400 + when.hour * 3600 + when.minute * 60 + when.second
+    return seconds * 1_000_000 + when.microsecond
+
+
+def _group(keys) -> tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+    """Group ``keys`` for ``bincount``.
+
+    Returns (distinct keys in first-seen order, each element's bucket, perm),
+    where ``np.bincount(bucket, ...)[perm]`` lines up with the distinct keys,
+    matching the insertion order of a dict filled by a Python loop.
+    """
+    values, first, bucket = np.unique(keys, return_index=True, return_inverse=True)
+    perm = np.argsort(first, kind="stable")
+    return values[perm], bucket, perm
+
+
+def _seq_sum(values) -> float:
+    """Left-to-right sum, like Python's ``sum`` (``np.sum`` is pairwise)."""
+    return float(np.cumsum(values)[-1])
+
+
+class PositionColumns:
+    def __init__(self, claim_ids: list[str], usernames: list[str], claim, user,
+                 side, stake, confidence, created_at):
+        self.claim_ids = claim_ids
+        self.usernames = usernames
+        self.claim = claim
+        self.user = user
+        self.side = side
+        self.stake = stake
+        self.confidence = confidence
+        self.created_at = created_at
+
+    @classmethod
+    def from_positions(cls, positions: list[PositionRecord]) -> "PositionColumns":
+        if np is None:
+            raise RuntimeError("The columnar engine requires numpy (pip install numpy)")
+        claim_index: dict[str, int] = {}
+        user_index: dict[str, int] = {}
+        n = len(positions)
+
+        def column(values, dtype):
+            return np.fromiter(values, dtype=dtype, count=n)
+
+        claim = column((claim_index.setdefault(p.claim_id, len(claim_index)) for p in positions), np.int32)
+        user = column((user_index.setdefault(p.username, len(user_index)) for p in positions), np.int32)
+        return cls(
+            list(claim_index),
+            list(user_index),
+            claim,
+            user,
+            column((p.side == "yes" for p in positions), np.int8),
+            column((p.stake for p in positions), np.float64),
+            column((p.confidence for p in positions), np.float64),
+            column((_wall_clock_us(p.created_at) for p in positions), np.int64),
+        )
+
+    def __len__(self) -> int:
+        return len(self.stake)
+
+    # ── Odds ───────────────────────────────────────────────
+
+    def accumulate_totals(self) -> dict[str, OddsTotals]:
+        """Same as ``odds.accumulate_totals`` over these positions."""
+        n = len(self.claim_ids)
+        yes = self.side == 1
+        weight = self.stake * self.confidence
+        yes_weight = np.bincount(self.claim[yes], weights=weight[yes], minlength=n)
+        no_weight = np.bincount(self.claim[~yes], weights=weight[~yes], minlength=n)
+        yes_count = np.bincount(self.claim[yes], minlength=n)
+        count = np.bincount(self.claim, minlength=n)
+        staked = np.bincount(self.claim, weights=self.stake, minlength=n)
+        totals = {}
+        for i, claim_id in enumerate(self.claim_ids):
+            totals[claim_id] = OddsTotals(
+                # Sums over no positions stay the int 0 they start as in OddsTotals.
+                float(yes_weight[i]) if yes_count[i] else 0,
+                float(no_weight[i]) if yes_count[i] < count[i] else 0,
+                float(staked[i]),
+                int(count[i]),
+            )
+        return totals
+
+    def calculate_odds_bulk(self) -> dict[str, ClaimOdds]:
+        """Same as ``odds.calculate_odds_bulk`` over these positions."""
+        return {claim_id: t.to_odds() for claim_id, t in self.accumulate_totals().items()}
+
+    # ── Analytics ──────────────────────────────────────────
+
+    def build_rollup(self, claims: list[Claim]) -> dict:
+        """Same as ``analytics.build_rollup(positions, claims)``."""
+        rollup = analytics.empty_rollup()
+        for c in claims:
+            analytics.add_claim(rollup, c)
+        if not len(self):
+            return rollup
+
+        yes = self.side == 1
+        day = self.created_at // _US_PER_DAY
+        days, bucket, order = _group(day)
+        count = np.bincount(bucket, minlength=len(days))[order]
+        value = np.bincount(bucket, weights=self.stake, minlength=len(days))[order]
+        yes_count = np.bincount(bucket[yes], minlength=len(days))[order]
+        yes_value = np.bincount(bucket[yes], weights=self.stake[yes], minlength=len(days))[order]
+        for i, d in enumerate(days.tolist()):
+            rollup["days"][(_EPOCH_DATE + timedelta(days=d)).isoformat()] = {
+                "count": int(count[i]),
+                "value": float(value[i]),
+                "yes_value": float(yes_value[i]) if yes_count[i] else 0,
+            }
+        total = rollup["total"]
+        total["count"] = len(self)
+        total["value"] = _seq_sum(self.stake)
+        if yes.any():
+            total["yes_value"] = _seq_sum(self.stake[yes])
+        return rollup
+
+    # ── Reputation ─────────────────────────────────────────
+
+    def tally_all(self, claims: list[Claim]) -> dict[str, dict[str, dict]]:
+        """Same as ``reputation.tally_all(positions, claims)``."""
+        by_id = {c.id: c for c in claims}
+        categories: dict[str, int] = {}
+        # Per claim index: 1 resolved yes, 0 resolved no, -1 active or missing.
+        outcome = np.full(len(self.claim_ids), -1, dtype=np.int8)
+        category = np.zeros(len(self.claim_ids), dtype=np.int32)
+        for i, claim_id in enumerate(self.claim_ids):
+            c = by_id.get(claim_id)
+            if c is not None and c.status != "active":
+                outcome[i] = c.status == "resolved_yes"
+                category[i] = categories.setdefault(c.category, len(categories))
+
+        graded = outcome[self.claim] >= 0
+        if not graded.any():
+            return {}
+        key = self.user[graded].astype(np.int64) * len(categories) + category[self.claim[graded]]
+        correct = self.side[graded] == outcome[self.claim[graded]]
+        keys, bucket, order = _group(key)
+        total = np.bincount(bucket, minlength=len(keys))[order]
+        hits = np.bincount(bucket[correct], minlength=len(keys))[order]
+
+        names = list(categories)
+        tally: dict[str, dict[str, dict]] = {}
+        for i, k in enumerate(keys.tolist()):
+            u, cat = divmod(k, len(categories))
+            tally.setdefault(self.usernames[u], {})[names[cat]] = {
+                "correct": int(hits[i]), "total": int(total[i]),
+            }
+        return tally
+
+    def accuracy(self, claims: list[Claim]) -> dict[str, float | None]:
+        """``reputation.calculate_accuracy`` for every user with positions."""
+        tally = self.tally_all(claims)
+        result = {}
+        for username in self.usernames:
+            counters = tally.get(username, {}).values()
+            correct = sum(c["correct"] for c in counters)
+            total = sum(c["total"] for c in counters)
+            result[username] = round(correct / total * 100, 1) if total > 0 else None
+        return result
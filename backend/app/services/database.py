@@ -1,124 +1,315 @@
-import json
+import logging
+import os
+import threading
 from pathlib import Path
-from app.models.schemas import User, Claim, Position
+from typing import TYPE_CHECKING, Callable
+from datetime import date
+from app.models.records import PositionRecord
+from app.models.schemas import User, Claim
+from app.services import analytics
+from app.services.paging import Page
+from app.services.odds import OddsTotals, accumulate_totals, totals_match
+from app.services.reputation import tally_all
 
-DATA_PATH = Path(__file__).resolve().parent.parent.parent / "data.json"
+if TYPE_CHECKING:
+    from app.services.resolution import Settlement
 
+BACKEND_DIR = Path(__file__).resolve().parent.parent.parent
+DATA_PATH = Path(os.getenv("DATA_PATH", BACKEND_DIR / "data.json"))
+SQLITE_PATH = Path(os.getenv("SQLITE_PATH", BACKEND_DIR / "data.db"))
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "json")
+# JSON backend: fold the event log into a snapshot after this many events.
+LOG_COMPACT_EVENTS = int(os.getenv("LOG_COMPACT_EVENTS", "1000"))
+# Seconds between background compaction checks; 0 disables the compactor.
+COMPACT_INTERVAL = float(os.getenv("COMPACT_INTERVAL", "30"))
 
-def _read_db() -> dict:
-    with open(DATA_PATH, "r") as f:
-        return json.load(f)
+logger = logging.getLogger(__name__)
 
+_store = None
+_store_lock = threading.Lock()
 
-def _write_db(data: dict) -> None:
-    with open(DATA_PATH, "w") as f:
-        json.dump(data, f, indent=2, default=str)
+
+def _create_store():
+    if STORAGE_BACKEND == "json":
+        from app.services.json_store import JsonStore
+        return JsonStore(DATA_PATH, compact_events=LOG_COMPACT_EVENTS)
+    if STORAGE_BACKEND == "sqlite":
+        from app.services.sqlite_store import SqliteStore
+        return SqliteStore(SQLITE_PATH)
+    raise ValueError(f"Unknown storage backend: {STORAGE_BACKEND}")
+
+
+def _given(filters: dict[str, str | None]) -> dict[str, str]:
+    return {name: value for name, value in filters.items() if value is not None}
+
+
+def get_store():
+    """Return the configured storage backend, creating it on first use."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = _create_store()
+    return _store
+
+
+def cache_stats() -> dict[str, int]:
+    """Hit/miss counters of the in-process dataset cache (JSON backend only)."""
+    store = get_store()
+    return store.cache_stats() if hasattr(store, "cache_stats") else {}
+
+
+def data_version() -> str:
+    """An opaque token that changes whenever stored data does, in any worker.
+
+    The JSON store derives it from the event sequence, SQLite from a counter
+    bumped by every write transaction. Used for ETags and response caching.
+    """
+    return get_store().data_version()
+
+
+def export_data() -> dict:
+    """The whole dataset as a data.json-shaped document."""
+    return get_store().export_data()
+
+
+# ── Compaction ─────────────────────────────────────────────
+
+_compactor: threading.Thread | None = None
+_compactor_stop = threading.Event()
+
+
+def compact(force: bool = False) -> bool:
+    """Checkpoint the store's log (JSON event log or SQLite WAL) if it is due.
+
+    Returns True if a checkpoint was written.
+    """
+    return get_store().compact(force)
+
+
+def start_compactor(interval: float = COMPACT_INTERVAL) -> None:
+    """Run ``compact`` every ``interval`` seconds on a daemon thread."""
+    global _compactor
+    if interval <= 0 or _compactor is not None:
+        return
+
+    def run() -> None:
+        while not _compactor_stop.wait(interval):
+            try:
+                compact()
+            except Exception:
+                logger.exception("Background compaction failed")
+
+    _compactor_stop.clear()
+    _compactor = threading.Thread(target=run, name="store-compactor", daemon=True)
+    _compactor.start()
+
+
+def stop_compactor() -> None:
+    global _compactor
+    if _compactor is None:
+        return
+    _compactor_stop.set()
+    _compactor.join()
+    _compactor = None
 
 
 # ── Users ──────────────────────────────────────────────────
 
 def get_all_users() -> list[User]:
-    data = _read_db()
-    return [User(**u) for u in data["users"]]
+    return get_store().get_all_users()
+
+
+def page_users(cursor: str | None = None, limit: int | None = None) -> Page[User]:
+    """Users in sign-up order after ``cursor`` (a username)."""
+    return get_store().page_users(cursor, limit)
 
 
 def get_user(username: str) -> User | None:
-    data = _read_db()
-    for u in data["users"]:
-        if u["username"] == username:
-            return User(**u)
-        if username.startswith("0x"):
-            if u.get("wallet_address", "").lower() == username.lower():
-                return User(**u)
-            if u.get("username", "").lower() == username.lower():
-                return User(**u)
-    return None
+    return get_store().get_user(username)
 
 
 def get_user_by_wallet(wallet_address: str) -> User | None:
-    data = _read_db()
-    for u in data["users"]:
-        if u.get("wallet_address", "").lower() == wallet_address.lower():
-            return User(**u)
-    return None
+    return get_store().get_user_by_wallet(wallet_address)
 
 
 def add_user(user: User) -> None:
-    data = _read_db()
-    if any(u["username"] == user.username for u in data["users"]):
-        raise ValueError(f"User {user.username} already exists")
-    data["users"].append(user.model_dump())
-    _write_db(data)
+    get_store().add_user(user)
 
 
 def update_user(user: User) -> None:
-    data = _read_db()
-    for i, u in enumerate(data["users"]):
-        if u["username"] == user.username:
-            data["users"][i] = user.model_dump()
-            _write_db(data)
-            return
-    raise ValueError(f"User {user.username} not found")
+    get_store().update_user(user)
 
 
 # ── Claims ─────────────────────────────────────────────────
 
 def get_all_claims() -> list[Claim]:
-    data = _read_db()
-    return [Claim(**c) for c in data["claims"]]
+    return get_store().get_all_claims()
 
 
 def get_claim(claim_id: str) -> Claim | None:
-    data = _read_db()
-    for c in data["claims"]:
-        if c["id"] == claim_id:
-            return Claim(**c)
-    return None
+    return get_store().get_claim(claim_id)
 
 
 def add_claim(claim: Claim) -> None:
-    data = _read_db()
-    data["claims"].append(claim.model_dump())
-    _write_db(data)
+    get_store().add_claim(claim)
+
+
+def add_claims(claims: list[Claim], atomic: bool = False, dry_run: bool = False) -> dict[int, str]:
+    """Add many claims in one write. Returns {index: error} for the rows
+    rejected (duplicate ids); the rest are added, or none if ``atomic`` or
+    ``dry_run``."""
+    return get_store().add_claims(claims, atomic, dry_run)
 
 
 def update_claim(claim: Claim) -> None:
-    data = _read_db()
-    for i, c in enumerate(data["claims"]):
-        if c["id"] == claim.id:
-            data["claims"][i] = claim.model_dump()
-            _write_db(data)
-            return
-    raise ValueError(f"Claim {claim.id} not found")
+    get_store().update_claim(claim)
+
+
+def page_claims(
+    status: str | None = None,
+    category: str | None = None,
+    created_by: str | None = None,
+    cursor: str | None = None,
+    limit: int | None = None,
+) -> Page[Claim]:
+    """Claims in creation order after ``cursor`` (a claim id), optionally filtered.
+
+    Raises ValueError for an unknown cursor. ``limit=None`` returns the rest.
+    """
+    filters = {"status": status, "category": category, "created_by": created_by}
+    return get_store().page_claims(_given(filters), cursor, limit)
 
 
 def delete_claim(claim_id: str) -> None:
-    data = _read_db()
-    original_len = len(data["claims"])
-    data["claims"] = [c for c in data["claims"] if c["id"] != claim_id]
-    if len(data["claims"]) == original_len:
-        raise ValueError(f"Claim {claim_id} not found")
-    _write_db(data)
+    get_store().delete_claim(claim_id)
 
 
 # ── Positions ──────────────────────────────────────────────
 
-def get_all_positions() -> list[Position]:
-    data = _read_db()
-    return [Position(**p) for p in data["positions"]]
+def page_positions(
+    claim_id: str | None = None,
+    username: str | None = None,
+    cursor: str | None = None,
+    limit: int | None = None,
+) -> Page[PositionRecord]:
+    """Positions in creation order after ``cursor`` (a position id), optionally filtered."""
+    filters = {"claim_id": claim_id, "username": username}
+    return get_store().page_positions(_given(filters), cursor, limit)
+
+
+def get_all_positions() -> list[PositionRecord]:
+    return get_store().get_all_positions()
+
+
+def get_positions_for_claim(claim_id: str) -> list[PositionRecord]:
+    return get_store().get_positions_for_claim(claim_id)
+
+
+def get_positions_for_user(username: str) -> list[PositionRecord]:
+    return get_store().get_positions_for_user(username)
+
+
+def add_position(position: PositionRecord) -> None:
+    get_store().add_position(position)
+
+
+def place_position(position: PositionRecord) -> None:
+    """Debit the stake from the user and record the position in one atomic write.
+
+    Balance and claim status are re-checked under the store's write lock, so
+    concurrent stakes can neither overdraw a user nor land on a resolved claim.
+    Raises ValueError if the stake is no longer allowed.
+    """
+    get_store().place_position(position)
+
+
+def place_positions(
+    positions: list[PositionRecord], atomic: bool = False, dry_run: bool = False
+) -> dict[int, str]:
+    """Place many stakes in one atomic write, checked in order as ``place_position`` would.
+
+    Each stake sees its user's balance less the batch's earlier stakes.
+    Returns {index: error} for the rejected rows; the others are committed,
+    or none of them if ``atomic`` and any row was rejected. With ``dry_run``
+    the rows are only checked.
+    """
+    return get_store().place_positions(positions, atomic, dry_run)
+
+
+# ── Aggregates ─────────────────────────────────────────────
+
+def get_claim_stats(claim_id: str) -> OddsTotals:
+    """Running odds totals for one claim, maintained by add_position."""
+    return get_store().get_claim_stats(claim_id)
+
+
+def get_all_claim_stats() -> dict[str, OddsTotals]:
+    return get_store().get_all_claim_stats()
+
+
+def rebuild_claim_stats() -> int:
+    """Recompute every claim's totals from raw positions. Returns the claim count."""
+    return get_store().rebuild_claim_stats()
+
+
+def check_claim_stats() -> list[str]:
+    """Return ids of claims whose stored totals disagree with a recount."""
+    stored = get_all_claim_stats()
+    expected = accumulate_totals(get_all_positions())
+    return sorted(
+        claim_id
+        for claim_id in stored.keys() | expected.keys()
+        if not totals_match(stored.get(claim_id, OddsTotals()), expected.get(claim_id, OddsTotals()))
+    )
+
+
+def get_reputation(username: str) -> dict[str, dict]:
+    """Per-category {"correct", "total"} counters over the user's resolved positions."""
+    return get_store().get_reputation(username)
+
+
+def get_all_reputation() -> dict[str, dict[str, dict]]:
+    return get_store().get_all_reputation()
+
+
+def rebuild_reputation() -> int:
+    """Backfill reputation counters from history. Returns the user count."""
+    return get_store().rebuild_reputation()
+
+
+def check_reputation() -> list[str]:
+    """Return usernames whose stored counters disagree with a recount."""
+    stored = get_all_reputation()
+    expected = tally_all(get_all_positions(), get_all_claims())
+    return sorted(u for u in stored.keys() | expected.keys() if stored.get(u) != expected.get(u))
+
+
+def get_analytics(start: date | None = None, end: date | None = None) -> dict:
+    """The /api/analytics report from the store's rollup, limited to [start, end]."""
+    return analytics.report(get_store().get_analytics(), start, end)
+
+
+def rebuild_analytics() -> int:
+    """Recompute the analytics rollup from history. Returns the day count."""
+    return get_store().rebuild_analytics()
 
 
-def get_positions_for_claim(claim_id: str) -> list[Position]:
-    data = _read_db()
-    return [Position(**p) for p in data["positions"] if p["claim_id"] == claim_id]
+def check_analytics() -> bool:
+    """Whether the stored rollup agrees with a full recount."""
+    expected = analytics.build_rollup(get_all_positions(), get_all_claims())
+    return analytics.rollups_match(get_store().get_analytics(), expected)
 
 
-def get_positions_for_user(username: str) -> list[Position]:
-    data = _read_db()
-    return [Position(**p) for p in data["positions"] if p["username"] == username]
+# ── Settlement ─────────────────────────────────────────────
 
+def settle_claim(
+    claim_id: str, plan: Callable[[Claim | None, list[PositionRecord]], "Settlement"]
+) -> "Settlement":
+    """Resolve a claim as one atomic write.
 
-def add_position(position: Position) -> None:
-    data = _read_db()
-    data["positions"].append(position.model_dump())
-    _write_db(data)
+    The store loads the claim and its positions, calls ``plan`` to compute the
+    settlement, then commits the new claim status, every payout and the
+    reputation counters together. Exceptions from ``plan`` abort with no write.
+    """
+    return get_store().settle_claim(claim_id, plan)
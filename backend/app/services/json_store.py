@@ -0,0 +1,720 @@
+import os
+import stat
+import tempfile
+import threading
+from contextlib import contextmanager
+from bisect import insort
+from dataclasses import asdict, dataclass, field, replace
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterator, Sequence
+from app.models.records import PositionRecord
+from app.models.schemas import User, Claim
+from app.services import analytics, codec, columnar, metrics, paging
+from app.services.odds import OddsTotals, accumulate_totals
+from app.services.reputation import tally_all, tally_outcomes
+from app.services.staking import check_stake, check_stakes
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None
+
+if TYPE_CHECKING:
+    from app.services.resolution import Settlement
+
+
+@dataclass
+class _Snapshot:
+    """Parsed contents of the data file plus the raw document, kept so untouched
+    rows re-serialize exactly as they were on disk."""
+
+    stamp: tuple[int, int, int]
+    data: dict
+    users: list[User]
+    claims: list[Claim]
+    positions: list[PositionRecord]
+    # Copy-on-write: entries are replaced, never mutated, so readers can hold them.
+    claim_stats: dict[str, OddsTotals]
+    # Sequence number of the last event applied, and of the last one in the data file.
+    seq: int = 0
+    snapshot_seq: int = 0
+    # Which log file (by inode) has been read, and how far.
+    log_ino: int | None = None
+    log_offset: int = 0
+    # Indexes into the lists above: id -> position, and (field, value) ->
+    # ascending positions of the rows with that value.
+    user_pos: dict[str, int] = field(default_factory=dict)
+    claim_pos: dict[str, int] = field(default_factory=dict)
+    position_pos: dict[str, int] = field(default_factory=dict)
+    claims_by: dict[tuple[str, str | None], list[int]] = field(default_factory=dict)
+    positions_by: dict[tuple[str, str], list[int]] = field(default_factory=dict)
+    # (field, lowercased value) -> ascending positions of the users with that
+    # username or wallet address, for the case-insensitive 0x lookups.
+    users_by: dict[tuple[str, str], list[int]] = field(default_factory=dict)
+
+
+# Fields the listing endpoints filter on, each backed by an index.
+CLAIM_FILTERS = ("status", "category", "created_by")
+POSITION_FILTERS = ("claim_id", "username")
+# User fields get_user and get_user_by_wallet match case-insensitively.
+USER_KEYS = ("username", "wallet_address")
+
+
+class _StaleLog(Exception):
+    """The event log was archived under a reader; reload from the snapshot."""
+
+
+class JsonStore:
+    """Flat-file backend: a JSON snapshot plus an append-only event log
+    (``<data file>.log``), folded into a new snapshot by ``compact``."""
+
+    def __init__(self, path: Path, compact_events: int = 1000):
+        self.path = Path(path)
+        self.lock_path = self.path.with_name(self.path.name + ".lock")
+        self.log_path = self.path.with_name(self.path.name + ".log")
+        self.compact_events = compact_events
+        # Guards the cached snapshot; held by readers and by the writer that
+        # holds the write lock while it catches up and commits.
+        self._lock = threading.RLock()
+        # Serializes this process's writers; the flock serializes processes.
+        self._writers = threading.Lock()
+        self._writer: int | None = None
+        self._snapshot: _Snapshot | None = None
+
+    @contextmanager
+    def _write_lock(self) -> Iterator[None]:
+        if self._writer == threading.get_ident():
+            # Re-entered by the thread that holds it.
+            yield
+            return
+        # Queue behind other threads and then other processes *before* taking
+        # the snapshot lock, so readers never wait on a writer that is itself
+        # waiting for another worker's flock.
+        with self._writers:
+            lock_file = open(self.lock_path, "a") if fcntl is not None else None
+            try:
+                if lock_file is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                with self._lock:
+                    self._writer = threading.get_ident()
+                    try:
+                        yield
+                    finally:
+                        self._writer = None
+            finally:
+                if lock_file is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+                    lock_file.close()
+
+    @staticmethod
+    def _stamp(st: os.stat_result) -> tuple[int, int, int]:
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def _load(self) -> _Snapshot:
+        with self._lock:
+            while True:
+                snap = self._snapshot
+                if snap is not None and snap.stamp == self._stamp(os.stat(self.path)):
+                    metrics.incr("json_cache.hits")
+                else:
+                    metrics.incr("json_cache.misses")
+                    snap = self._snapshot = self._read_snapshot()
+                try:
+                    self._catch_up(snap)
+                    return snap
+                except _StaleLog:
+                    self._snapshot = None
+
+    def _read_snapshot(self) -> _Snapshot:
+        with open(self.path, "rb") as f:
+            stamp = self._stamp(os.fstat(f.fileno()))
+            data = codec.loads(f.read())
+        claims = [Claim(**c) for c in data["claims"]]
+        positions = [PositionRecord.from_dict(p) for p in data["positions"]]
+        # Files written before the aggregates existed: derive them once.
+        if "claim_stats" in data:
+            claim_stats = {cid: OddsTotals(**t) for cid, t in data["claim_stats"].items()}
+        else:
+            claim_stats, tally, rollup = columnar.aggregate(positions, claims)
+            data["claim_stats"] = {cid: asdict(t) for cid, t in claim_stats.items()}
+            data.setdefault("reputation", tally)
+            data.setdefault("analytics", rollup)
+        if "reputation" not in data:
+            data["reputation"] = tally_all(positions, claims)
+        if "analytics" not in data:
+            data["analytics"] = analytics.build_rollup(positions, claims)
+        seq = data.get("log_seq", 0)
+        snap = _Snapshot(
+            stamp=stamp,
+            data=data,
+            users=[User(**u) for u in data["users"]],
+            claims=claims,
+            positions=positions,
+            claim_stats=claim_stats,
+            seq=seq,
+            snapshot_seq=seq,
+        )
+        for i, u in enumerate(snap.users):
+            self._index_user(snap, i, u)
+        self._index_claims(snap)
+        for i, p in enumerate(positions):
+            self._index_position(snap, i, p)
+        return snap
+
+    def _catch_up(self, snap: _Snapshot) -> None:
+        """Apply the log lines appended since this snapshot last looked."""
+        try:
+            f = open(self.log_path, "rb")
+        except FileNotFoundError:
+            return
+        with f:
+            st = os.fstat(f.fileno())
+            if st.st_ino != snap.log_ino or st.st_size < snap.log_offset:
+                snap.log_ino, snap.log_offset = st.st_ino, 0
+            if st.st_size == snap.log_offset:
+                return
+            f.seek(snap.log_offset)
+            chunk = f.read(st.st_size - snap.log_offset)
+        # Whole lines only; a writer may be mid-append.
+        end = chunk.rfind(b"\n") + 1
+        replayed = 0
+        for line in chunk[:end].splitlines():
+            event = codec.loads(line)
+            if event["seq"] <= snap.seq:
+                continue
+            if event["seq"] != snap.seq + 1:
+                raise _StaleLog()
+            self._apply(snap, event)
+            snap.seq = event["seq"]
+            replayed += 1
+        snap.log_offset += end
+        if replayed:
+            metrics.incr("json_cache.replayed_events", replayed)
+
+    def _commit(self, snap: _Snapshot, event: dict) -> None:
+        """Apply ``event``, then append it to the log. Call under the write lock.
+
+        An event that fails to apply never reaches the log, where it would
+        break every later replay; a failed append is truncated away.
+        """
+        event = {"seq": snap.seq + 1, "at": datetime.now(timezone.utc).isoformat(), **event}
+        line = codec.dumps(event) + b"\n"
+        try:
+            self._apply(snap, event)
+            with open(self.log_path, "ab", buffering=0) as f:
+                start = f.seek(0, os.SEEK_END)
+                try:
+                    if f.write(line) != len(line):
+                        raise OSError(f"Short write to {self.log_path}")
+                    os.fsync(f.fileno())
+                except BaseException:
+                    f.truncate(start)
+                    raise
+                st = os.fstat(f.fileno())
+        except BaseException:
+            # Memory may now disagree with disk; force a re-read next time.
+            self._snapshot = None
+            raise
+        snap.seq = event["seq"]
+        # _load caught up on this same file, so our line is the last one in it.
+        snap.log_ino, snap.log_offset = st.st_ino, st.st_size
+        metrics.incr("json_store.events")
+
+    def _write_snapshot(self, snap: _Snapshot) -> None:
+        """Write the full state atomically and archive the log it absorbed."""
+        snap.data["log_seq"] = snap.seq
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=self.path.name, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(codec.dumps(snap.data, indent=codec.INDENT))
+                f.flush()
+                os.fsync(f.fileno())
+            os.chmod(tmp, stat.S_IMODE(os.stat(self.path).st_mode))
+            os.replace(tmp, self.path)
+            snap.stamp = self._stamp(os.stat(self.path))
+        except BaseException:
+            self._snapshot = None
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+        snap.snapshot_seq = snap.seq
+        # A crash before this rename is harmless: replay skips seq <= log_seq.
+        if os.path.exists(self.log_path) and os.path.getsize(self.log_path) > 0:
+            os.replace(self.log_path, self.log_path.with_name(f"{self.log_path.name}.{snap.seq:012d}"))
+        snap.log_ino, snap.log_offset = None, 0
+
+    def compact(self, force: bool = False) -> bool:
+        """Fold the event log into a new snapshot once it holds enough events."""
+        with self._write_lock():
+            snap = self._load()
+            if not force and snap.seq - snap.snapshot_seq < self.compact_events:
+                return False
+            self._write_snapshot(snap)
+            metrics.incr("json_store.compactions")
+            return True
+
+    @contextmanager
+    def memory_reads(self) -> Iterator[bool]:
+        """Yield True, holding the store lock, if reads can be answered from the
+        cached snapshot without waiting or parsing; otherwise yield False."""
+        if not self._lock.acquire(blocking=False):
+            yield False
+            return
+        try:
+            snap = self._snapshot
+            yield (
+                snap is not None
+                and snap.stamp == self._stamp(os.stat(self.path))
+                and self._log_replayed(snap)
+            )
+        finally:
+            self._lock.release()
+
+    def _log_replayed(self, snap: _Snapshot) -> bool:
+        try:
+            st = os.stat(self.log_path)
+        except FileNotFoundError:
+            return True
+        return st.st_ino == snap.log_ino and st.st_size == snap.log_offset
+
+    def data_version(self) -> str:
+        """Changes with every applied event, and when the data file is replaced."""
+        snap = self._load()
+        mtime_ns, _, inode = snap.stamp
+        return f"{inode:x}.{mtime_ns:x}.{snap.seq}"
+
+    def iter_events(self) -> Iterator[dict]:
+        """Every event still on disk, oldest first: archived segments, then the live log."""
+        archives = sorted(self.path.parent.glob(self.log_path.name + ".*"))
+        for path in archives + [self.log_path]:
+            try:
+                f = open(path, "rb")
+            except FileNotFoundError:
+                continue
+            with f:
+                for line in f:
+                    if line.endswith(b"\n"):
+                        yield codec.loads(line)
+
+    def export_data(self) -> dict:
+        """The current state as a data.json-shaped document (snapshot plus log)."""
+        with self._lock:
+            return codec.loads(codec.dumps(self._load().data))
+
+    def cache_stats(self) -> dict[str, int]:
+        counters = metrics.snapshot()["counters"]
+        return {
+            "hits": counters.get("json_cache.hits", 0),
+            "misses": counters.get("json_cache.misses", 0),
+            "replayed_events": counters.get("json_cache.replayed_events", 0),
+        }
+
+    # ── Events ─────────────────────────────────────────────
+    #
+    # The only code that mutates a snapshot. Live writes and log replay both go
+    # through _apply, so replaying the log always reproduces the live state.
+
+    def _apply(self, snap: _Snapshot, event: dict) -> None:
+        kind = event["type"]
+        if kind == "user_added":
+            user = User(**event["user"])
+            self._index_user(snap, len(snap.users), user)
+            snap.users.append(user)
+            snap.data["users"].append(event["user"])
+        elif kind == "user_updated":
+            self._set_user(snap, self._exact_user_index(snap, event["user"]["username"]), event["user"])
+        elif kind == "claim_added":
+            self._append_claim(snap, event["claim"])
+        elif kind == "claims_added":
+            for raw in event["claims"]:
+                self._append_claim(snap, raw)
+        elif kind == "claim_updated":
+            self._set_claim(snap, self._claim_index(snap, event["claim"]["id"]), event["claim"])
+        elif kind == "claim_deleted":
+            claim_id = event["claim_id"]
+            analytics.remove_claim(snap.data["analytics"], snap.claims[self._claim_index(snap, claim_id)])
+            keep = [i for i, c in enumerate(snap.claims) if c.id != claim_id]
+            snap.data["claims"] = [snap.data["claims"][i] for i in keep]
+            snap.claims = [snap.claims[i] for i in keep]
+            self._index_claims(snap)
+            snap.claim_stats.pop(claim_id, None)
+            snap.data["claim_stats"].pop(claim_id, None)
+        elif kind == "position_added":
+            self._append_positions(snap, [event["position"]])
+        elif kind == "position_placed":
+            i = self._exact_user_index(snap, event["debit"])
+            user = snap.users[i]
+            stake = event["position"]["stake"]
+            self._set_user(snap, i, user.model_copy(update={"points": user.points - stake}).model_dump())
+            self._append_positions(snap, [event["position"]])
+        elif kind == "positions_placed":
+            for username, total in event["debits"].items():
+                i = self._exact_user_index(snap, username)
+                user = snap.users[i]
+                self._set_user(snap, i, user.model_copy(update={"points": user.points - total}).model_dump())
+            self._append_positions(snap, event["positions"])
+        elif kind == "claim_settled":
+            credited: dict[int, User] = {}
+            for username, stake, share in event["payouts"]:
+                i = self._exact_user_index(snap, username)
+                user = credited.get(i, snap.users[i])
+                credited[i] = user.model_copy(update={"points": user.points + stake + share})
+            for i, user in credited.items():
+                self._set_user(snap, i, user.model_dump())
+            claim = Claim(**event["claim"])
+            self._set_claim(snap, self._claim_index(snap, claim.id), event["claim"])
+            positions = self._claim_positions(snap, claim.id)
+            tally_outcomes(snap.data["reputation"], claim, positions)
+        else:
+            raise ValueError(f"Unknown event type: {kind}")
+
+    @staticmethod
+    def _exact_user_index(snap: _Snapshot, username: str) -> int:
+        return snap.user_pos[username]
+
+    @staticmethod
+    def _claim_index(snap: _Snapshot, claim_id: str) -> int | None:
+        return snap.claim_pos.get(claim_id)
+
+    @staticmethod
+    def _index_user(snap: _Snapshot, i: int, user: User) -> None:
+        snap.user_pos[user.username] = i
+        for name in USER_KEYS:
+            snap.users_by.setdefault((name, (getattr(user, name) or "").lower()), []).append(i)
+
+    @staticmethod
+    def _index_claims(snap: _Snapshot) -> None:
+        """Rebuild the claim indexes (on load, and when deletion shifts positions)."""
+        snap.claim_pos = {c.id: i for i, c in enumerate(snap.claims)}
+        snap.claims_by = {}
+        for i, c in enumerate(snap.claims):
+            for name in CLAIM_FILTERS:
+                snap.claims_by.setdefault((name, getattr(c, name)), []).append(i)
+
+    @staticmethod
+    def _index_position(snap: _Snapshot, i: int, position: PositionRecord) -> None:
+        snap.position_pos[position.id] = i
+        for name in POSITION_FILTERS:
+            snap.positions_by.setdefault((name, getattr(position, name)), []).append(i)
+
+    @staticmethod
+    def _claim_positions(snap: _Snapshot, claim_id: str) -> list[PositionRecord]:
+        return [snap.positions[i] for i in snap.positions_by.get(("claim_id", claim_id), ())]
+
+    @staticmethod
+    def _set_user(snap: _Snapshot, i: int, raw: dict) -> None:
+        old, new = snap.users[i], User(**raw)
+        for name in USER_KEYS:
+            before, after = (getattr(old, name) or "").lower(), (getattr(new, name) or "").lower()
+            if before != after:
+                snap.users_by[(name, before)].remove(i)
+                insort(snap.users_by.setdefault((name, after), []), i)
+        snap.users[i] = new
+        snap.data["users"][i] = raw
+
+    @staticmethod
+    def _set_claim(snap: _Snapshot, i: int, raw: dict) -> None:
+        old, new = snap.claims[i], Claim(**raw)
+        if (old.category, old.created_at) != (new.category, new.created_at):
+            analytics.remove_claim(snap.data["analytics"], old)
+            analytics.add_claim(snap.data["analytics"], new)
+        for name in CLAIM_FILTERS:
+            before, after = getattr(old, name), getattr(new, name)
+            if before != after:
+                snap.claims_by[(name, before)].remove(i)
+                insort(snap.claims_by.setdefault((name, after), []), i)
+        snap.claims[i] = new
+        snap.data["claims"][i] = raw
+
+    @staticmethod
+    def _append_claim(snap: _Snapshot, raw: dict) -> None:
+        claim = Claim(**raw)
+        i = snap.claim_pos[claim.id] = len(snap.claims)
+        for name in CLAIM_FILTERS:
+            snap.claims_by.setdefault((name, getattr(claim, name)), []).append(i)
+        snap.claims.append(claim)
+        snap.data["claims"].append(raw)
+        analytics.add_claim(snap.data["analytics"], claim)
+
+    @staticmethod
+    def _append_positions(snap: _Snapshot, raws: list[dict]) -> None:
+        """Append positions, copying each touched claim's totals once."""
+        touched: dict[str, OddsTotals] = {}
+        for raw in raws:
+            position = PositionRecord.from_dict(raw)
+            snap.data["positions"].append(raw)
+            JsonStore._index_position(snap, len(snap.positions), position)
+            snap.positions.append(position)
+            totals = touched.get(position.claim_id)
+            if totals is None:
+                totals = touched[position.claim_id] = replace(snap.claim_stats.get(position.claim_id) or OddsTotals())
+            totals.add(position)
+            analytics.add_position(snap.data["analytics"], position)
+        for claim_id, totals in touched.items():
+            snap.claim_stats[claim_id] = totals
+            snap.data["claim_stats"][claim_id] = asdict(totals)
+
+    # ── Users ──────────────────────────────────────────────
+
+    def get_all_users(self) -> list[User]:
+        return list(self._load().users)
+
+    @staticmethod
+    def _user_index(snap: _Snapshot, username: str) -> int | None:
+        """The earliest user whose username is ``username`` or, for 0x input,
+        whose wallet address or username matches it case-insensitively."""
+        i = snap.user_pos.get(username)
+        if username.startswith("0x"):
+            lowered = username.lower()
+            for name in USER_KEYS:
+                matches = snap.users_by.get((name, lowered))
+                if matches and (i is None or matches[0] < i):
+                    i = matches[0]
+        return i
+
+    def get_user(self, username: str) -> User | None:
+        snap = self._load()
+        i = self._user_index(snap, username)
+        return snap.users[i] if i is not None else None
+
+    def get_user_by_wallet(self, wallet_address: str) -> User | None:
+        snap = self._load()
+        matches = snap.users_by.get(("wallet_address", wallet_address.lower()))
+        return snap.users[matches[0]] if matches else None
+
+    def add_user(self, user: User) -> None:
+        with self._write_lock():
+            snap = self._load()
+            if user.username in snap.user_pos:
+                raise ValueError(f"User {user.username} already exists")
+            self._commit(snap, {"type": "user_added", "user": user.model_dump()})
+
+    def update_user(self, user: User) -> None:
+        with self._write_lock():
+            snap = self._load()
+            if user.username not in snap.user_pos:
+                raise ValueError(f"User {user.username} not found")
+            self._commit(snap, {"type": "user_updated", "user": user.model_dump()})
+
+    # ── Claims ─────────────────────────────────────────────
+
+    def get_all_claims(self) -> list[Claim]:
+        return list(self._load().claims)
+
+    def get_claim(self, claim_id: str) -> Claim | None:
+        snap = self._load()
+        i = snap.claim_pos.get(claim_id)
+        return snap.claims[i] if i is not None else None
+
+    def add_claim(self, claim: Claim) -> None:
+        with self._write_lock():
+            snap = self._load()
+            self._commit(snap, {"type": "claim_added", "claim": claim.model_dump()})
+
+    def add_claims(self, claims: list[Claim], atomic: bool = False, dry_run: bool = False) -> dict[int, str]:
+        with self._write_lock():
+            snap = self._load()
+            errors, seen = {}, set()
+            for i, claim in enumerate(claims):
+                if claim.id in seen or claim.id in snap.claim_pos:
+                    errors[i] = f"Claim {claim.id} already exists"
+                seen.add(claim.id)
+            if len(errors) < len(claims) and not (atomic and errors) and not dry_run:
+                self._commit(snap, {
+                    "type": "claims_added",
+                    "claims": [c.model_dump() for i, c in enumerate(claims) if i not in errors],
+                })
+            return errors
+
+    def update_claim(self, claim: Claim) -> None:
+        with self._write_lock():
+            snap = self._load()
+            if self._claim_index(snap, claim.id) is None:
+                raise ValueError(f"Claim {claim.id} not found")
+            self._commit(snap, {"type": "claim_updated", "claim": claim.model_dump()})
+
+    def delete_claim(self, claim_id: str) -> None:
+        with self._write_lock():
+            snap = self._load()
+            if self._claim_index(snap, claim_id) is None:
+                raise ValueError(f"Claim {claim_id} not found")
+            self._commit(snap, {"type": "claim_deleted", "claim_id": claim_id})
+
+    # ── Positions ──────────────────────────────────────────
+
+    def get_all_positions(self) -> list[PositionRecord]:
+        return list(self._load().positions)
+
+    def get_positions_for_claim(self, claim_id: str) -> list[PositionRecord]:
+        return self._claim_positions(self._load(), claim_id)
+
+    def get_positions_for_user(self, username: str) -> list[PositionRecord]:
+        snap = self._load()
+        return [snap.positions[i] for i in snap.positions_by.get(("username", username), ())]
+
+    def add_position(self, position: PositionRecord) -> None:
+        with self._write_lock():
+            snap = self._load()
+            self._commit(snap, {"type": "position_added", "position": position._asdict()})
+
+    def place_position(self, position: PositionRecord) -> None:
+        with self._write_lock():
+            snap = self._load()
+            i = self._user_index(snap, position.username)
+            user = snap.users[i] if i is not None else None
+            j = snap.claim_pos.get(position.claim_id)
+            claim = snap.claims[j] if j is not None else None
+            check_stake(user, claim, position.stake)
+            self._commit(snap, {
+                "type": "position_placed",
+                "debit": user.username,
+                "position": position._asdict(),
+            })
+
+    def place_positions(
+        self, positions: list[PositionRecord], atomic: bool = False, dry_run: bool = False
+    ) -> dict[int, str]:
+        with self._write_lock():
+            snap = self._load()
+
+            def find_user(username: str) -> User | None:
+                i = self._user_index(snap, username)
+                return snap.users[i] if i is not None else None
+
+            def find_claim(claim_id: str) -> Claim | None:
+                j = snap.claim_pos.get(claim_id)
+                return snap.claims[j] if j is not None else None
+
+            debits, errors = check_stakes(positions, find_user, find_claim, snap.position_pos.__contains__)
+            if debits and not (atomic and errors) and not dry_run:
+                self._commit(snap, {
+                    "type": "positions_placed",
+                    "debits": debits,
+                    "positions": [p._asdict() for i, p in enumerate(positions) if i not in errors],
+                })
+            return errors
+
+    # ── Listings ───────────────────────────────────────────
+
+    @staticmethod
+    def _after(pos: dict[str, int], cursor: str | None) -> int:
+        if cursor is None:
+            return 0
+        if cursor not in pos:
+            raise ValueError(f"Unknown cursor {cursor!r}")
+        return pos[cursor] + 1
+
+    @staticmethod
+    def _narrowest(index: dict, filters: dict[str, str], size: int) -> Sequence[int]:
+        """The smallest index list covering one of ``filters`` (all rows if none)."""
+        lists = [index.get(item, []) for item in filters.items()]
+        return min(lists, key=len) if lists else range(size)
+
+    def page_users(self, cursor: str | None, limit: int | None) -> paging.Page[User]:
+        with self._lock:
+            snap = self._load()
+            return paging.scan(
+                range(len(snap.users)), self._after(snap.user_pos, cursor), limit,
+                snap.users.__getitem__, lambda u: u.username,
+            )
+
+    def page_claims(
+        self, filters: dict[str, str], cursor: str | None, limit: int | None
+    ) -> paging.Page[Claim]:
+        with self._lock:
+            snap = self._load()
+            return paging.scan(
+                self._narrowest(snap.claims_by, filters, len(snap.claims)),
+                self._after(snap.claim_pos, cursor), limit,
+                snap.claims.__getitem__, lambda c: c.id,
+                lambda c: all(getattr(c, k) == v for k, v in filters.items()),
+            )
+
+    def page_positions(
+        self, filters: dict[str, str], cursor: str | None, limit: int | None
+    ) -> paging.Page[PositionRecord]:
+        with self._lock:
+            snap = self._load()
+            return paging.scan(
+                self._narrowest(snap.positions_by, filters, len(snap.positions)),
+                self._after(snap.position_pos, cursor), limit,
+                snap.positions.__getitem__, lambda p: p.id,
+                lambda p: all(getattr(p, k) == v for k, v in filters.items()),
+            )
+
+    # ── Aggregates ─────────────────────────────────────────
+
+    def get_claim_stats(self, claim_id: str) -> OddsTotals:
+        return self._load().claim_stats.get(claim_id) or OddsTotals()
+
+    def get_all_claim_stats(self) -> dict[str, OddsTotals]:
+        return dict(self._load().claim_stats)
+
+    def rebuild_claim_stats(self) -> int:
+        with self._write_lock():
+            snap = self._load()
+            snap.claim_stats = accumulate_totals(snap.positions)
+            snap.data["claim_stats"] = {cid: asdict(t) for cid, t in snap.claim_stats.items()}
+            self._write_snapshot(snap)
+            return len(snap.claim_stats)
+
+    def get_reputation(self, username: str) -> dict[str, dict]:
+        with self._lock:
+            cats = self._load().data["reputation"].get(username, {})
+            return {cat: dict(c) for cat, c in cats.items()}
+
+    def get_all_reputation(self) -> dict[str, dict[str, dict]]:
+        with self._lock:
+            return {
+                username: {cat: dict(c) for cat, c in cats.items()}
+                for username, cats in self._load().data["reputation"].items()
+            }
+
+    def get_analytics(self) -> dict:
+        with self._lock:
+            return analytics.copy_rollup(self._load().data["analytics"])
+
+    def rebuild_analytics(self) -> int:
+        with self._write_lock():
+            snap = self._load()
+            snap.data["analytics"] = analytics.build_rollup(snap.positions, snap.claims)
+            self._write_snapshot(snap)
+            return len(snap.data["analytics"]["days"])
+
+    # ── Settlement ─────────────────────────────────────────
+
+    def settle_claim(
+        self,
+        claim_id: str,
+        plan: Callable[[Claim | None, list[PositionRecord]], "Settlement"],
+    ) -> "Settlement":
+        with self._write_lock():
+            snap = self._load()
+            index = self._claim_index(snap, claim_id)
+            positions = self._claim_positions(snap, claim_id)
+            settlement = plan(snap.claims[index] if index is not None else None, positions)
+
+            # Log stored usernames, so replay never depends on lookup rules.
+            resolved: dict[str, str | None] = {}
+            payouts = []
+            for username, stake, share in settlement.payouts:
+                if username not in resolved:
+                    i = self._user_index(snap, username)
+                    resolved[username] = snap.users[i].username if i is not None else None
+                if resolved[username] is not None:
+                    payouts.append((resolved[username], stake, share))
+
+            self._commit(snap, {
+                "type": "claim_settled",
+                "claim": settlement.claim.model_dump(),
+                "payouts": payouts,
+            })
+            return settlement
+
+    def rebuild_reputation(self) -> int:
+        with self._write_lock():
+            snap = self._load()
+            snap.data["reputation"] = tally_all(snap.positions, snap.claims)
+            self._write_snapshot(snap)
+            return len(snap.data["reputation"])
@@ -0,0 +1,36 @@
+"""Process-local counters and timings, exposed at GET /api/metrics.
+
+Each uvicorn worker keeps its own numbers; scrape every worker to aggregate.
+"""
+import threading
+from collections import defaultdict
+
+_lock = threading.Lock()
+_counters: dict[str, int] = defaultdict(int)
+_timings: dict[str, dict[str, float]] = {}
+
+
+def incr(name: str, amount: int = 1) -> None:
+    with _lock:
+        _counters[name] += amount
+
+
+def observe(name: str, value: float) -> None:
+    """Record one sample (seconds, usually) under ``name``."""
+    with _lock:
+        t = _timings.get(name)
+        if t is None:
+            _timings[name] = {"count": 1, "total": value, "max": value, "last": value}
+            return
+        t["count"] += 1
+        t["total"] += value
+        t["max"] = max(t["max"], value)
+        t["last"] = value
+
+
+def snapshot() -> dict:
+    with _lock:
+        timings = {
+            name: {**t, "avg": t["total"] / t["count"]} for name, t in _timings.items()
+        }
+        return {"counters": dict(_counters), "timings": timings}
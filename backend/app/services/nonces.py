@@ -0,0 +1,202 @@
+"""Bounded store of outstanding SIWE login nonces, expired oldest-first and
+kept in this process or the shared state file per ``SHARED_STATE``."""
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from app.services import metrics, shared_state
+
+NONCE_TTL = float(os.getenv("NONCE_TTL", "300"))
+NONCES_PER_ADDRESS = int(os.getenv("NONCES_PER_ADDRESS", "5"))
+MAX_NONCES = int(os.getenv("MAX_NONCES", "100000"))
+# Expired nonces removed per issue at most; any backlog drains over later calls.
+EXPIRE_BATCH = 64
+
+
+class MemoryNonces:
+    """Nonces in this process: one ordered dict in expiry order plus a per-address index."""
+
+    def __init__(self, ttl: float = NONCE_TTL, per_address: int = NONCES_PER_ADDRESS,
+                 max_total: int = MAX_NONCES):
+        self.ttl = ttl
+        self.per_address = per_address
+        self.max_total = max_total
+        self._lock = threading.Lock()
+        # (address, nonce) -> expiry (monotonic), oldest first
+        self._expiry: OrderedDict[tuple[str, str], float] = OrderedDict()
+        # address -> its nonces, oldest first
+        self._by_address: dict[str, list[str]] = {}
+
+    def _remove(self, key: tuple[str, str]) -> None:
+        del self._expiry[key]
+        address, nonce = key
+        pending = self._by_address[address]
+        pending.remove(nonce)
+        if not pending:
+            del self._by_address[address]
+
+    def _expire(self, now: float, limit: int | None = EXPIRE_BATCH) -> None:
+        expired = 0
+        while self._expiry and (limit is None or expired < limit):
+            key, expires_at = next(iter(self._expiry.items()))
+            if expires_at > now:
+                break
+            self._remove(key)
+            expired += 1
+        if expired:
+            metrics.incr("nonces.expired", expired)
+
+    def issue(self, address: str) -> str:
+        address = address.lower()
+        nonce = secrets.token_hex(8)
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            evicted = 0
+            pending = self._by_address.get(address, ())
+            while len(pending) >= self.per_address:
+                self._remove((address, pending[0]))
+                pending = self._by_address.get(address, ())
+                evicted += 1
+            while len(self._expiry) >= self.max_total:
+                self._remove(next(iter(self._expiry)))
+                evicted += 1
+            self._expiry[(address, nonce)] = now + self.ttl
+            self._by_address.setdefault(address, []).append(nonce)
+        metrics.incr("nonces.issued")
+        if evicted:
+            metrics.incr("nonces.evicted", evicted)
+        return nonce
+
+    def pending(self, address: str) -> list[str]:
+        """Live nonces issued to ``address``, oldest first."""
+        address = address.lower()
+        now = time.monotonic()
+        with self._lock:
+            return [n for n in self._by_address.get(address, ()) if self._expiry[(address, n)] > now]
+
+    def consume(self, address: str, nonce: str) -> bool:
+        """Use up ``nonce``; True only for the first caller while it is live."""
+        key = (address.lower(), nonce)
+        with self._lock:
+            expires_at = self._expiry.get(key)
+            if expires_at is None:
+                return False
+            self._remove(key)
+        if expires_at <= time.monotonic():
+            metrics.incr("nonces.expired")
+            return False
+        metrics.incr("nonces.consumed")
+        return True
+
+    def outstanding(self) -> int:
+        return len(self._expiry)
+
+
+NONCE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS nonces (
+    address TEXT NOT NULL,
+    nonce TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (address, nonce)
+);
+CREATE INDEX IF NOT EXISTS idx_nonces_expires ON nonces (expires_at);
+CREATE INDEX IF NOT EXISTS idx_nonces_address ON nonces (address, expires_at);
+-- Outstanding nonces, kept in step so the global cap needs no COUNT(*).
+CREATE TABLE IF NOT EXISTS nonce_count (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    n INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO nonce_count VALUES (0, 0);
+"""
+
+
+class SqliteNonces:
+    """Nonces in the shared state file, indexed by expiry and address."""
+
+    def __init__(self, state: shared_state.SqliteState, ttl: float = NONCE_TTL,
+                 per_address: int = NONCES_PER_ADDRESS, max_total: int = MAX_NONCES):
+        self.state = state
+        self.ttl = ttl
+        self.per_address = per_address
+        self.max_total = max_total
+        state.connection().executescript(NONCE_SCHEMA)
+
+    @staticmethod
+    def _delete_oldest(conn: sqlite3.Connection, where: str, params: tuple, limit: int) -> int:
+        removed = conn.execute(
+            f"DELETE FROM nonces WHERE rowid IN (SELECT rowid FROM nonces WHERE {where}"
+            " ORDER BY expires_at LIMIT ?)",
+            (*params, limit),
+        ).rowcount
+        if removed:
+            conn.execute("UPDATE nonce_count SET n = n - ? WHERE id = 0", (removed,))
+        return removed
+
+    def issue(self, address: str) -> str:
+        address = address.lower()
+        nonce = secrets.token_hex(8)
+        now = time.time()
+        with self.state.transaction() as conn:
+            expired = self._delete_oldest(conn, "expires_at <= ?", (now,), EXPIRE_BATCH)
+            held = conn.execute("SELECT COUNT(*) FROM nonces WHERE address = ?", (address,)).fetchone()[0]
+            evicted = 0
+            if held >= self.per_address:
+                evicted += self._delete_oldest(conn, "address = ?", (address,), held - self.per_address + 1)
+            total = conn.execute("SELECT n FROM nonce_count WHERE id = 0").fetchone()[0]
+            if total >= self.max_total:
+                evicted += self._delete_oldest(conn, "1", (), total - self.max_total + 1)
+            conn.execute("INSERT INTO nonces VALUES (?, ?, ?)", (address, nonce, now + self.ttl))
+            conn.execute("UPDATE nonce_count SET n = n + 1 WHERE id = 0")
+        metrics.incr("nonces.issued")
+        if expired:
+            metrics.incr("nonces.expired", expired)
+        if evicted:
+            metrics.incr("nonces.evicted", evicted)
+        return nonce
+
+    def pending(self, address: str) -> list[str]:
+        rows = self.state.connection().execute(
+            "SELECT nonce FROM nonces WHERE address = ? AND expires_at > ? ORDER BY expires_at",
+            (address.lower(), time.time()),
+        )
+        return [r[0] for r in rows]
+
+    def consume(self, address: str, nonce: str) -> bool:
+        with self.state.transaction() as conn:
+            row = conn.execute(
+                "SELECT expires_at FROM nonces WHERE address = ? AND nonce = ?", (address.lower(), nonce)
+            ).fetchone()
+            if row is None:
+                return False
+            conn.execute("DELETE FROM nonces WHERE address = ? AND nonce = ?", (address.lower(), nonce))
+            conn.execute("UPDATE nonce_count SET n = n - 1 WHERE id = 0")
+        if row[0] <= time.time():
+            metrics.incr("nonces.expired")
+            return False
+        metrics.incr("nonces.consumed")
+        return True
+
+    def outstanding(self) -> int:
+        return self.state.connection().execute("SELECT n FROM nonce_count WHERE id = 0").fetchone()[0]
+
+
+_nonces: MemoryNonces | SqliteNonces | None = None
+_nonces_lock = threading.Lock()
+
+
+def get_nonces() -> MemoryNonces | SqliteNonces:
+    """The nonce store for the configured ``SHARED_STATE`` backend."""
+    global _nonces
+    if _nonces is None:
+        with _nonces_lock:
+            if _nonces is None:
+                state = shared_state.get_state()
+                if isinstance(state, shared_state.SqliteState):
+                    _nonces = SqliteNonces(state)
+                else:
+                    _nonces = MemoryNonces()
+    return _nonces
@@ -1,16 +1,85 @@
-from app.models.schemas import Position
+import math
+from dataclasses import dataclass
+from app.models.records import PositionRecord
 
 
-def calculate_odds(positions: list[Position]) -> tuple[float, float]:
+@dataclass
+class ClaimOdds:
+    yes_percentage: float = 50.0
+    no_percentage: float = 50.0
+    total_staked: float = 0
+    position_count: int = 0
+
+
+def _percentages(yes_weight: float, no_weight: float) -> tuple[float, float]:
+    total = yes_weight + no_weight
+    if total == 0:
+        return 50.0, 50.0
+    return round(yes_weight / total * 100, 1), round(no_weight / total * 100, 1)
+
+
+def calculate_odds(positions: list[PositionRecord]) -> tuple[float, float]:
     """Calculate yes/no percentages from positions. Returns (yes%, no%)."""
     if not positions:
         return 50.0, 50.0
 
     yes_weight = sum(p.stake * p.confidence for p in positions if p.side == "yes")
     no_weight = sum(p.stake * p.confidence for p in positions if p.side == "no")
-    total = yes_weight + no_weight
+    return _percentages(yes_weight, no_weight)
 
-    if total == 0:
-        return 50.0, 50.0
 
-    return round(yes_weight / total * 100, 1), round(no_weight / total * 100, 1)
+@dataclass
+class OddsTotals:
+    """Running per-claim sums that the odds are derived from.
+
+    Stores keep one of these per claim and ``add`` each new position to it, so
+    reading a claim's odds does not require scanning its positions.
+    """
+
+    yes_weight: float = 0
+    no_weight: float = 0
+    total_staked: float = 0
+    position_count: int = 0
+
+    def add(self, position: PositionRecord) -> None:
+        if position.side == "yes":
+            self.yes_weight += position.stake * position.confidence
+        elif position.side == "no":
+            self.no_weight += position.stake * position.confidence
+        self.total_staked += position.stake
+        self.position_count += 1
+
+    def to_odds(self) -> ClaimOdds:
+        if self.position_count == 0:
+            return ClaimOdds()
+        yes_pct, no_pct = _percentages(self.yes_weight, self.no_weight)
+        return ClaimOdds(yes_pct, no_pct, self.total_staked, self.position_count)
+
+
+def accumulate_totals(positions: list[PositionRecord]) -> dict[str, OddsTotals]:
+    """Build OddsTotals for every claim from raw positions in one pass."""
+    totals: dict[str, OddsTotals] = {}
+    for p in positions:
+        t = totals.get(p.claim_id)
+        if t is None:
+            t = totals[p.claim_id] = OddsTotals()
+        t.add(p)
+    return totals
+
+
+def calculate_odds_bulk(positions: list[PositionRecord]) -> dict[str, ClaimOdds]:
+    """Odds, total stake and position count for every claim in one pass.
+
+    Claims without positions are absent from the result; use ``ClaimOdds()``
+    as the default for them.
+    """
+    return {claim_id: t.to_odds() for claim_id, t in accumulate_totals(positions).items()}
+
+
+def totals_match(a: OddsTotals, b: OddsTotals) -> bool:
+    return (
+        a.position_count == b.position_count
+        and math.isclose(a.yes_weight, b.yes_weight, rel_tol=1e-9, abs_tol=1e-6)
+        and math.isclose(a.no_weight, b.no_weight, rel_tol=1e-9, abs_tol=1e-6)
+        and math.isclose(a.total_staked, b.total_staked, rel_tol=1e-9, abs_tol=1e-6)
+    )
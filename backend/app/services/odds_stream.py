@@ -0,0 +1,213 @@
+"""Server-sent odds and resolution events for claims, coalesced per data
+version and sent to each subscriber as the latest frame per claim."""
+import asyncio
+import logging
+import os
+from typing import AsyncIterator
+
+from app.models.schemas import Claim
+from app.services import async_db, codec, database, metrics
+from app.services.odds import ClaimOdds, OddsTotals
+
+logger = logging.getLogger(__name__)
+
+# Collect writes for this long before sending, so a burst becomes one frame per claim.
+COALESCE_SECONDS = float(os.getenv("STREAM_COALESCE_MS", "250")) / 1000
+# Check the data version this often to pick up writes made by other workers.
+POLL_INTERVAL = float(os.getenv("STREAM_POLL_INTERVAL", "1"))
+# Send an SSE comment this often on idle connections so proxies keep them open.
+HEARTBEAT_INTERVAL = 15.0
+
+# Subscription key for "every claim".
+ALL = "*"
+_HEARTBEAT = b": ping\n\n"
+
+
+def _event(claim: Claim, totals: OddsTotals | None) -> dict:
+    o = totals.to_odds() if totals else ClaimOdds()
+    event = {
+        "claim_id": claim.id,
+        "status": claim.status,
+        "yes_percentage": o.yes_percentage,
+        "no_percentage": o.no_percentage,
+        "total_staked": o.total_staked,
+        "position_count": o.position_count,
+    }
+    if claim.status != "active":
+        event["resolved_at"] = claim.resolved_at
+    return event
+
+
+def frame(event: dict) -> bytes:
+    """Encode an event as an SSE ``odds`` or ``resolved`` message."""
+    kind = "odds" if event["status"] == "active" else "resolved"
+    return b"event: " + kind.encode() + b"\ndata: " + codec.dumps(event) + b"\n\n"
+
+
+def current_events(claim_ids: list[str]) -> list[dict]:
+    """Events for the current state of these claims; unknown ids are skipped."""
+    events = []
+    for claim_id in claim_ids:
+        claim = database.get_claim(claim_id)
+        if claim is not None:
+            events.append(_event(claim, database.get_claim_stats(claim_id)))
+    return events
+
+
+class Subscriber:
+    """One connection's pending frames, newest per claim. Loop-thread only."""
+
+    def __init__(self, claim_ids: frozenset[str] | None):
+        self.claim_ids = claim_ids
+        self._pending: dict[str, bytes] = {}
+        self._ready = asyncio.Event()
+
+    def offer(self, claim_id: str, data: bytes) -> None:
+        if claim_id in self._pending:
+            metrics.incr("stream.coalesced")
+        self._pending[claim_id] = data
+        self._ready.set()
+
+    async def frames(self, heartbeat: float = HEARTBEAT_INTERVAL) -> AsyncIterator[bytes]:
+        while True:
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                yield _HEARTBEAT
+                continue
+            self._ready.clear()
+            batch, self._pending = self._pending, {}
+            yield b"".join(batch.values())
+
+
+class OddsBroadcaster:
+    def __init__(self, window: float = COALESCE_SECONDS, poll_interval: float = POLL_INTERVAL):
+        self.window = window
+        self.poll_interval = poll_interval
+        # claim id (or ALL) -> subscribers watching it
+        self._subscribers: dict[str, set[Subscriber]] = {}
+        # claim id -> last event sent for it
+        self._last: dict[str, dict] = {}
+        self._version: str | None = None
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._count = 0
+
+    def subscribe(self, claim_ids: list[str] | None = None) -> Subscriber:
+        """Watch ``claim_ids``, or every claim when None. Call on the loop."""
+        self.start()
+        sub = Subscriber(frozenset(claim_ids) if claim_ids else None)
+        for key in sub.claim_ids or (ALL,):
+            self._subscribers.setdefault(key, set()).add(sub)
+        self._count += 1
+        # Re-read on the next flush even if nothing is written, so a frame a
+        # flush computed before this subscriber read its initial odds is
+        # followed by the current ones.
+        self._version = None
+        metrics.incr("stream.connections")
+        return sub
+
+    def unsubscribe(self, sub: Subscriber) -> None:
+        for key in sub.claim_ids or (ALL,):
+            subs = self._subscribers.get(key)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del self._subscribers[key]
+        self._count -= 1
+
+    def publish(self, claim_id: str) -> None:
+        """Note that ``claim_id`` changed. Safe to call from any thread."""
+        loop = self._loop
+        if loop is None or not loop.is_running():
+            return
+        if claim_id in self._subscribers or ALL in self._subscribers:
+            loop.call_soon_threadsafe(self._wakeup.set)
+
+    def status(self) -> dict:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "subscribers": self._count,
+            "claims_watched": len(self._subscribers) - (ALL in self._subscribers),
+        }
+
+    def _watched(self) -> list[str] | None:
+        """Claim ids anyone is watching; None means every claim."""
+        if ALL in self._subscribers:
+            return None
+        return list(self._subscribers)
+
+    @staticmethod
+    def _read(claim_ids: list[str] | None) -> list[dict]:
+        if claim_ids is not None:
+            return current_events(claim_ids)
+        stats = database.get_all_claim_stats()
+        return [_event(c, stats.get(c.id)) for c in database.get_all_claims()]
+
+    async def flush(self) -> int:
+        """Send frames for every watched claim that changed. Returns how many."""
+        if not self._subscribers:
+            return 0
+        version = await async_db.lookup(database.data_version)
+        if version == self._version:
+            return 0
+        self._version = version
+        events = await async_db.read(self._read, self._watched())
+        sent = 0
+        everyone = self._subscribers.get(ALL, ())
+        for event in events:
+            claim_id = event["claim_id"]
+            if self._last.get(claim_id) == event:
+                continue
+            self._last[claim_id] = event
+            data = frame(event)
+            for sub in (*self._subscribers.get(claim_id, ()), *everyone):
+                sub.offer(claim_id, data)
+            sent += 1
+        metrics.incr("stream.events", sent)
+        return sent
+
+    async def _run(self) -> None:
+        # The first read records a baseline; only later changes are sent.
+        self._version = await async_db.lookup(database.data_version)
+        self._last = {e["claim_id"]: e for e in await async_db.read(self._read, None)}
+        while True:
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            await asyncio.sleep(self.window)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Odds stream flush failed")
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._loop = asyncio.get_running_loop()
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run(), name="odds-stream")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self._loop = None
+
+
+_broadcaster = OddsBroadcaster()
+
+
+def get_broadcaster() -> OddsBroadcaster:
+    return _broadcaster
+
+
+def publish(claim_id: str) -> None:
+    """Tell this worker's subscribers that ``claim_id`` changed."""
+    _broadcaster.publish(claim_id)
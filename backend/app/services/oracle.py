@@ -1,6 +1,14 @@
+import asyncio
 import os
+import threading
+import time
+from concurrent.futures import Future
 from dataclasses import dataclass
+from datetime import datetime, timezone
 from web3 import Web3
+from app.models.schemas import Claim
+from app.services import metrics, shared_state
+from app.services.oracle_client import AsyncOracleClient
 
 
 CHAINLINK_FEEDS = {
@@ -51,11 +59,64 @@ def _get_provider_url() -> str:
     return os.getenv("WEB3_PROVIDER_URL", "")
 
 
-def _get_web3_instances() -> list[Web3]:
-    """Return a list of Web3 instances to try, custom env URL first."""
+# Seconds a fetched price is served from memory before the next RPC round trip.
+PRICE_CACHE_TTL = float(os.getenv("ORACLE_CACHE_TTL", "10"))
+RPC_TIMEOUT = float(os.getenv("ORACLE_RPC_TIMEOUT", "10"))
+# Seconds to wait on one provider before racing the next (async client).
+HEDGE_DELAY = float(os.getenv("ORACLE_HEDGE_DELAY", "0.5"))
+
+# Providers and contracts hold HTTP sessions, so build each one once per URL.
+_web3_by_url: dict[str, Web3] = {}
+_contracts: dict[tuple[str, str], object] = {}
+# Aggregator address -> decimals. They never change; read them once per feed.
+_decimals: dict[str, int] = {}
+# feed -> (monotonic time fetched, result)
+_prices: dict[str, tuple[float, "OracleResult"]] = {}
+# Shared-state namespace of prices any worker fetched:
+# feed -> [value, updated_at, fetched at (epoch seconds)].
+SHARED_PRICES = "oracle_prices"
+# feed -> fetch in progress, shared by every concurrent caller.
+_inflight: dict[str, Future] = {}
+_async_inflight: dict[str, asyncio.Future] = {}
+_client: AsyncOracleClient | None = None
+_lock = threading.Lock()
+
+
+def _provider_urls() -> list[str]:
     custom = _get_provider_url()
-    urls = [custom] + FALLBACK_RPCS if custom else FALLBACK_RPCS
-    return [Web3(Web3.HTTPProvider(url)) for url in urls]
+    return [custom] + FALLBACK_RPCS if custom else list(FALLBACK_RPCS)
+
+
+def _get_web3_instances() -> list[Web3]:
+    """Return the Web3 instances to try, custom env URL first."""
+    urls = _provider_urls()
+    with _lock:
+        for url in urls:
+            if url not in _web3_by_url:
+                _web3_by_url[url] = Web3(Web3.HTTPProvider(url, request_kwargs={"timeout": RPC_TIMEOUT}))
+        return [_web3_by_url[url] for url in urls]
+
+
+def _contract(w3: Web3, address: str):
+    key = (w3.provider.endpoint_uri, address)
+    contract = _contracts.get(key)
+    if contract is None:
+        contract = _contracts[key] = w3.eth.contract(
+            address=Web3.to_checksum_address(address), abi=AGGREGATOR_ABI
+        )
+    return contract
+
+
+def clear_cache() -> None:
+    """Forget cached prices, decimals and providers (e.g. after changing RPC URLs)."""
+    with _lock:
+        _prices.clear()
+        _decimals.clear()
+        _contracts.clear()
+        _web3_by_url.clear()
+    state = shared_state.get_state()
+    for feed in CHAINLINK_FEEDS:
+        state.delete(SHARED_PRICES, feed)
 
 
 def get_provider_label() -> str:
@@ -68,16 +129,224 @@ def get_provider_label() -> str:
         return url
 
 
-def get_chainlink_price(feed: str) -> OracleResult:
-    address = CHAINLINK_FEEDS.get(feed)
-    if address is None:
+def get_chainlink_price(feed: str, max_age: float | None = None) -> OracleResult:
+    """Latest answer for ``feed``, served from memory if fetched within ``max_age`` seconds.
+
+    ``max_age`` defaults to ``PRICE_CACHE_TTL``. Concurrent callers for the same
+    feed share a single in-flight fetch; failures are not cached.
+    """
+    if feed not in CHAINLINK_FEEDS:
+        raise ValueError(f"Unsupported feed: {feed}")
+    max_age = PRICE_CACHE_TTL if max_age is None else max_age
+
+    with _lock:
+        cached = _fresh_price(feed, max_age)
+        if cached is not None:
+            return cached
+        future = _inflight.get(feed)
+        leader = future is None
+        if leader:
+            future = _inflight[feed] = Future()
+    if not leader:
+        metrics.incr("oracle.coalesced")
+        return future.result()
+
+    metrics.incr("oracle.cache_misses")
+    try:
+        result = _shared_price(feed, max_age)
+        if result is None:
+            start = time.perf_counter()
+            result = _fetch_chainlink_price(feed)
+            metrics.observe("oracle.fetch_seconds", time.perf_counter() - start)
+            _share_price(feed, result)
+    except BaseException as exc:
+        with _lock:
+            del _inflight[feed]
+        future.set_exception(exc)
+        raise
+    with _lock:
+        _prices[feed] = (time.monotonic(), result)
+        del _inflight[feed]
+    future.set_result(result)
+    return result
+
+
+def _fresh_price(feed: str, max_age: float) -> OracleResult | None:
+    """Cached result for ``feed`` if younger than ``max_age``. Call under _lock."""
+    cached = _prices.get(feed)
+    if cached is not None and time.monotonic() - cached[0] < max_age:
+        metrics.incr("oracle.cache_hits")
+        return cached[1]
+    return None
+
+
+def _shared_price(feed: str, max_age: float) -> OracleResult | None:
+    """A price another worker fetched within ``max_age``, adopted into this worker's cache."""
+    if max_age <= 0:
+        return None
+    entry = shared_state.get_state().get(SHARED_PRICES, feed)
+    if entry is None:
+        return None
+    value, updated_at, fetched_at = entry
+    age = time.time() - fetched_at
+    if age >= max_age:
+        return None
+    result = OracleResult(value=value, updated_at=updated_at)
+    with _lock:
+        _prices[feed] = (time.monotonic() - age, result)
+    metrics.incr("oracle.shared_hits")
+    return result
+
+
+def _share_price(feed: str, result: OracleResult) -> None:
+    shared_state.get_state().set(
+        SHARED_PRICES, feed, [result.value, result.updated_at, time.time()], ttl=PRICE_CACHE_TTL
+    )
+
+
+def get_client() -> AsyncOracleClient:
+    """The shared async client for the configured providers."""
+    global _client
+    urls = _provider_urls()
+    with _lock:
+        if _client is None or _client.urls != urls:
+            _client = AsyncOracleClient(
+                urls, hedge_delay=HEDGE_DELAY, timeout=RPC_TIMEOUT, decimals=_decimals
+            )
+        return _client
+
+
+async def close_client() -> None:
+    if _client is not None:
+        await _client.close()
+
+
+def provider_health() -> dict[str, dict]:
+    """Per-provider latency/error EWMAs of the async client, best first."""
+    if _client is None:
+        return {}
+    return {url: vars(_client.health[url]) for url in _client.ranked()}
+
+
+async def get_chainlink_price_async(feed: str, max_age: float | None = None) -> OracleResult:
+    """Async ``get_chainlink_price``: same cache, hedged across providers.
+
+    Never blocks the event loop on a slow RPC. Concurrent awaits for the same
+    feed share one fetch.
+    """
+    if feed not in CHAINLINK_FEEDS:
         raise ValueError(f"Unsupported feed: {feed}")
+    max_age = PRICE_CACHE_TTL if max_age is None else max_age
+
+    with _lock:
+        cached = _fresh_price(feed, max_age)
+    if cached is not None:
+        return cached
+    task = _async_inflight.get(feed)
+    if task is None or task.get_loop() is not asyncio.get_running_loop():
+        metrics.incr("oracle.cache_misses")
+        task = _async_inflight[feed] = asyncio.ensure_future(_fetch_chainlink_price_async(feed, max_age))
+        task.add_done_callback(lambda _: _async_inflight.pop(feed, None))
+    else:
+        metrics.incr("oracle.coalesced")
+    # Shielded so one caller disconnecting does not cancel the others' fetch.
+    return await asyncio.shield(task)
+
+
+async def _fetch_chainlink_price_async(feed: str, max_age: float) -> OracleResult:
+    shared = await shared_state.call(_shared_price, feed, max_age)
+    if shared is not None:
+        return shared
+    client = get_client()
+    start = time.perf_counter()
+    try:
+        value, updated_at = await client.hedged(client.read_feed, CHAINLINK_FEEDS[feed])
+    except ConnectionError as exc:
+        raise ConnectionError(f"Failed to fetch oracle data for {feed}: {exc}") from exc
+    metrics.observe("oracle.fetch_seconds", time.perf_counter() - start)
+    result = OracleResult(value=value, updated_at=updated_at)
+    with _lock:
+        _prices[feed] = (time.monotonic(), result)
+    await shared_state.call(_share_price, feed, result)
+    return result
+
+
+async def get_price_snapshot(
+    feeds: list[str] | None = None, max_age: float | None = None
+) -> dict[str, OracleResult]:
+    """Latest answer for each feed (default: all of CHAINLINK_FEEDS) in one round trip.
+
+    Feeds cached within ``max_age`` are not re-read; the rest go out as a single
+    JSON-RPC batch, hedged across providers like single reads. Every claim
+    watching a feed can then be evaluated against the same snapshot.
+    """
+    feeds = list(CHAINLINK_FEEDS) if feeds is None else feeds
+    for feed in feeds:
+        if feed not in CHAINLINK_FEEDS:
+            raise ValueError(f"Unsupported feed: {feed}")
+    max_age = PRICE_CACHE_TTL if max_age is None else max_age
+
+    snapshot: dict[str, OracleResult] = {}
+    with _lock:
+        for feed in feeds:
+            cached = _fresh_price(feed, max_age)
+            if cached is not None:
+                snapshot[feed] = cached
+    for feed in feeds:
+        if feed not in snapshot:
+            shared = await shared_state.call(_shared_price, feed, max_age)
+            if shared is not None:
+                snapshot[feed] = shared
+    stale = [feed for feed in feeds if feed not in snapshot]
+    if stale:
+        metrics.incr("oracle.cache_misses", len(stale))
+        metrics.incr("oracle.batch_reads")
+        client = get_client()
+        start = time.perf_counter()
+        try:
+            readings = await client.hedged(client.read_feeds, [CHAINLINK_FEEDS[f] for f in stale])
+        except ConnectionError as exc:
+            raise ConnectionError(f"Failed to fetch oracle data for {', '.join(stale)}: {exc}") from exc
+        metrics.observe("oracle.batch_fetch_seconds", time.perf_counter() - start)
+        now = time.monotonic()
+        with _lock:
+            for feed in stale:
+                value, updated_at = readings[CHAINLINK_FEEDS[feed]]
+                snapshot[feed] = OracleResult(value=value, updated_at=updated_at)
+                _prices[feed] = (now, snapshot[feed])
+        for feed in stale:
+            await shared_state.call(_share_price, feed, snapshot[feed])
+    return {feed: snapshot[feed] for feed in feeds}
+
+
+def evaluate_claims(claims: list[Claim], snapshot: dict[str, OracleResult]) -> dict[str, bool]:
+    """Whether each oracle claim's condition holds at ``snapshot`` prices.
+
+    Claims that are not oracle-resolved, or whose feed is not in the snapshot,
+    are left out.
+    """
+    outcomes = {}
+    for claim in claims:
+        config = claim.oracle_config or {}
+        reading = snapshot.get(config.get("feed"))
+        if claim.resolution_type != "oracle" or reading is None:
+            continue
+        outcomes[claim.id] = evaluate_condition(
+            reading.value, config.get("comparator"), float(config.get("target"))
+        )
+    return outcomes
+
+
+def _fetch_chainlink_price(feed: str) -> OracleResult:
+    address = CHAINLINK_FEEDS[feed]
 
     last_exc: Exception | None = None
     for w3 in _get_web3_instances():
         try:
-            contract = w3.eth.contract(address=Web3.to_checksum_address(address), abi=AGGREGATOR_ABI)
-            decimals = contract.functions.decimals().call()
+            contract = _contract(w3, address)
+            decimals = _decimals.get(address)
+            if decimals is None:
+                decimals = _decimals[address] = contract.functions.decimals().call()
             round_data = contract.functions.latestRoundData().call()
             answer = round_data[1]
             updated_at = round_data[3]
@@ -100,3 +369,39 @@ def evaluate_condition(value: float, comparator: str, target: float) -> bool:
     if comparator == "<=":
         return value <= target
     raise ValueError("Unsupported comparator")
+
+
+def validate_config(resolution_date: datetime | None, config: dict | None) -> dict:
+    """Check a new oracle claim's resolution date and config.
+
+    Returns the config reduced to its known fields; raises ValueError with a
+    message fit for a 400 response.
+    """
+    if not resolution_date:
+        raise ValueError("Missing resolution date")
+    if resolution_date <= datetime.now(timezone.utc):
+        raise ValueError("Resolution date must be in the future")
+    if not isinstance(config, dict):
+        raise ValueError("Missing oracle config")
+    oracle_type = config.get("type")
+    feed = config.get("feed")
+    comparator = config.get("comparator")
+    target = config.get("target")
+    if oracle_type != "chainlink_price":
+        raise ValueError("Unsupported oracle type")
+    if not feed or not comparator or target is None:
+        raise ValueError("Incomplete oracle config")
+    if feed not in CHAINLINK_FEEDS:
+        raise ValueError(f"Unsupported oracle feed: {feed}")
+    if comparator not in [">", ">=", "<", "<="]:
+        raise ValueError("Invalid comparator")
+    try:
+        target = float(target)
+    except ValueError as exc:
+        raise ValueError(f"Invalid target: {exc}")
+    return {
+        "type": oracle_type,
+        "feed": feed,
+        "comparator": comparator,
+        "target": target,
+    }
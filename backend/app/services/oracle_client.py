@@ -0,0 +1,179 @@
+"""Async Chainlink reads over raw JSON-RPC, hedged across providers ranked by
+latency and error-rate EWMAs."""
+import asyncio
+import itertools
+import time
+from dataclasses import dataclass
+
+import aiohttp
+
+from app.services import metrics
+
+DECIMALS_CALL = "0x313ce567"
+LATEST_ROUND_CALL = "0xfeaf968c"
+
+
+@dataclass
+class ProviderHealth:
+    latency: float = 0.0
+    error_rate: float = 0.0
+    requests: int = 0
+    errors: int = 0
+
+    def score(self, timeout: float) -> float:
+        """Expected seconds to an answer; failures cost a full timeout."""
+        return self.latency + self.error_rate * timeout
+
+
+def _decode_int(hex_data: str, word: int = 0, signed: bool = False) -> int:
+    raw = bytes.fromhex(hex_data[2:])[32 * word:32 * (word + 1)]
+    if len(raw) != 32:
+        raise ValueError("Short eth_call result")
+    return int.from_bytes(raw, "big", signed=signed)
+
+
+class AsyncOracleClient:
+    def __init__(
+        self,
+        urls: list[str],
+        hedge_delay: float = 0.5,
+        timeout: float = 10.0,
+        alpha: float = 0.2,
+        decimals: dict[str, int] | None = None,
+    ):
+        self.urls = list(urls)
+        self.hedge_delay = hedge_delay
+        self.timeout = timeout
+        self.alpha = alpha
+        # Untried providers are assumed to answer within the hedge budget: they
+        # rank behind providers known to be faster, ahead of slower ones.
+        self.health = {url: ProviderHealth(latency=hedge_delay) for url in self.urls}
+        # Aggregator address -> decimals; they never change, so fetch each once.
+        self.decimals = {} if decimals is None else decimals
+        self._ids = itertools.count(1)
+        self._session: aiohttp.ClientSession | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        # Sessions are bound to the loop they were created on.
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            self._loop = loop
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=16, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def ranked(self) -> list[str]:
+        """Provider URLs, healthiest first (ties keep configured order)."""
+        return sorted(self.urls, key=lambda url: self.health[url].score(self.timeout))
+
+    def _record(self, url: str, latency: float | None) -> None:
+        h = self.health[url]
+        h.requests += 1
+        failed = latency is None
+        if failed:
+            h.errors += 1
+            latency = self.timeout
+        if h.requests == 1:
+            h.latency, h.error_rate = latency, float(failed)
+        else:
+            h.latency += self.alpha * (latency - h.latency)
+            h.error_rate += self.alpha * (float(failed) - h.error_rate)
+
+    async def _rpc_batch(self, url: str, calls: list[tuple[str, list]]) -> list:
+        """POST one JSON-RPC batch and return the results in request order."""
+        ids = [next(self._ids) for _ in calls]
+        body = [
+            {"jsonrpc": "2.0", "id": i, "method": method, "params": params}
+            for i, (method, params) in zip(ids, calls)
+        ]
+        start = time.perf_counter()
+        try:
+            async with self._get_session().post(url, json=body) as resp:
+                resp.raise_for_status()
+                replies = await resp.json(content_type=None)
+            if not isinstance(replies, list):
+                raise ValueError(f"Expected a batch reply, got: {replies!r}"[:200])
+            by_id = {r.get("id"): r for r in replies}
+            results = []
+            for i in ids:
+                reply = by_id.get(i)
+                if reply is None or "error" in reply:
+                    raise ValueError(f"RPC error: {reply and reply.get('error')}")
+                results.append(reply["result"])
+        except asyncio.CancelledError:
+            # Lost a hedge race: not an error, but it was at least this slow.
+            self._record(url, time.perf_counter() - start)
+            raise
+        except Exception:
+            self._record(url, None)
+            metrics.incr("oracle.rpc_errors")
+            raise
+        self._record(url, time.perf_counter() - start)
+        return results
+
+    async def read_feed(self, url: str, address: str) -> tuple[float, int]:
+        """(value, updated_at) for one aggregator from one provider."""
+        return (await self.read_feeds(url, [address]))[address]
+
+    async def read_feeds(self, url: str, addresses: list[str]) -> dict[str, tuple[float, int]]:
+        """(value, updated_at) for many aggregators in a single batch round trip."""
+        missing = [a for a in addresses if a not in self.decimals]
+        calls = [("eth_call", [{"to": a, "data": DECIMALS_CALL}, "latest"]) for a in missing]
+        calls += [("eth_call", [{"to": a, "data": LATEST_ROUND_CALL}, "latest"]) for a in addresses]
+        results = await self._rpc_batch(url, calls)
+        for address, raw in zip(missing, results):
+            self.decimals[address] = _decode_int(raw)
+        readings = {}
+        for address, round_data in zip(addresses, results[len(missing):]):
+            answer = _decode_int(round_data, 1, signed=True)
+            updated_at = _decode_int(round_data, 3)
+            readings[address] = (float(answer) / (10 ** self.decimals[address]), updated_at)
+        return readings
+
+    async def hedged(self, fn, *args):
+        """Run ``fn(url, *args)`` against providers best-first, hedging slow ones.
+
+        Returns the first successful result; raises ConnectionError once every
+        provider has failed.
+        """
+        pending_urls = self.ranked()
+        running: dict[asyncio.Task, str] = {}
+        last_exc: Exception | None = None
+
+        def launch() -> None:
+            url = pending_urls.pop(0)
+            running[asyncio.ensure_future(fn(url, *args))] = url
+
+        launch()
+        try:
+            while running:
+                # Wait for an answer, but no longer than the hedge budget if
+                # there is another provider left to try.
+                timeout = self.hedge_delay if pending_urls else None
+                done, _ = await asyncio.wait(
+                    running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    metrics.incr("oracle.hedged_requests")
+                    launch()
+                    continue
+                for task in done:
+                    del running[task]
+                    if task.exception() is None:
+                        return task.result()
+                    last_exc = task.exception()
+                if pending_urls:
+                    # A failure frees a slot: try the next provider right away.
+                    launch()
+        finally:
+            for task in running:
+                task.cancel()
+        raise ConnectionError(f"All RPC providers failed: {last_exc}") from last_exc
@@ -0,0 +1,42 @@
+"""Keyset pagination shared by the stores: a cursor is the id of the last item
+on the previous page."""
+from bisect import bisect_left
+from typing import Callable, Generic, NamedTuple, Sequence, TypeVar
+
+T = TypeVar("T")
+
+MAX_LIMIT = 500
+# Response header carrying the cursor for the next page.
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class Page(NamedTuple, Generic[T]):
+    items: list[T]
+    # Cursor for the next page, or None when this page is the last.
+    next_cursor: str | None
+
+
+def scan(
+    ordinals: Sequence[int],
+    start: int,
+    limit: int | None,
+    fetch: Callable[[int], T],
+    key: Callable[[T], str],
+    keep: Callable[[T], bool] = lambda item: True,
+) -> Page[T]:
+    """Read a page from a sorted index of positions in a store's list.
+
+    ``ordinals`` is the index (ascending list positions), ``start`` the first
+    list position to consider, ``fetch`` maps a position to its item and
+    ``keep`` applies any filters the index does not cover. ``limit=None``
+    reads to the end.
+    """
+    items: list[T] = []
+    for n in range(bisect_left(ordinals, start), len(ordinals)):
+        item = fetch(ordinals[n])
+        if not keep(item):
+            continue
+        if limit is not None and len(items) == limit:
+            return Page(items, key(items[-1]))
+        items.append(item)
+    return Page(items, None)
@@ -1,7 +1,14 @@
-from app.models.schemas import Position, Claim
+from dataclasses import dataclass, field
+from app.models.records import PositionRecord
+from app.models.schemas import Claim
 
 
-def calculate_accuracy(positions: list[Position], claims: list[Claim]) -> float | None:
+def _is_correct(pos: PositionRecord, claim: Claim) -> bool:
+    resolved_yes = claim.status == "resolved_yes"
+    return (pos.side == "yes" and resolved_yes) or (pos.side == "no" and not resolved_yes)
+
+
+def calculate_accuracy(positions: list[PositionRecord], claims: list[Claim]) -> float | None:
     """Calculate a user's prediction accuracy across resolved claims."""
     claim_map = {c.id: c for c in claims}
     correct = 0
@@ -12,15 +19,14 @@ def calculate_accuracy(positions: list[Position], claims: list[Claim]) -> float
         if claim is None or claim.status == "active":
             continue
         total += 1
-        resolved_yes = claim.status == "resolved_yes"
-        if (pos.side == "yes" and resolved_yes) or (pos.side == "no" and not resolved_yes):
+        if _is_correct(pos, claim):
             correct += 1
 
     return round(correct / total * 100, 1) if total > 0 else None
 
 
 def calculate_category_stats(
-    positions: list[Position], claims: list[Claim]
+    positions: list[PositionRecord], claims: list[Claim]
 ) -> dict[str, dict]:
     """Break down accuracy by category."""
     claim_map = {c.id: c for c in claims}
@@ -36,8 +42,7 @@ def calculate_category_stats(
             stats[cat] = {"correct": 0, "total": 0}
 
         stats[cat]["total"] += 1
-        resolved_yes = claim.status == "resolved_yes"
-        if (pos.side == "yes" and resolved_yes) or (pos.side == "no" and not resolved_yes):
+        if _is_correct(pos, claim):
             stats[cat]["correct"] += 1
 
     for cat in stats:
@@ -46,3 +51,104 @@ def calculate_category_stats(
         stats[cat]["accuracy"] = round(c / t * 100, 1) if t > 0 else 0
 
     return stats
+
+
+@dataclass
+class UserStats:
+    """Everything a user profile needs, derived from that user's positions."""
+
+    active_positions: list[PositionRecord] = field(default_factory=list)
+    # Positions on resolved claims, plus any whose claim no longer exists.
+    resolved_positions: list[PositionRecord] = field(default_factory=list)
+    correct: int = 0
+    graded: int = 0
+    category_stats: dict[str, dict] = field(default_factory=dict)
+
+    @property
+    def accuracy(self) -> float | None:
+        return round(self.correct / self.graded * 100, 1) if self.graded > 0 else None
+
+    @property
+    def total_resolved(self) -> int:
+        return len(self.resolved_positions)
+
+
+def calculate_user_stats_bulk(
+    positions: list[PositionRecord], claims: list[Claim]
+) -> dict[str, UserStats]:
+    """Accuracy, category stats and active/resolved split for every user at once.
+
+    Equivalent to calling ``calculate_accuracy`` and ``calculate_category_stats``
+    per user, but with one shared claim index and a single scan of positions.
+    Users without positions are absent; use ``UserStats()`` for them.
+    """
+    claim_map = {c.id: c for c in claims}
+    result: dict[str, UserStats] = {}
+
+    for pos in positions:
+        stats = result.get(pos.username)
+        if stats is None:
+            stats = result[pos.username] = UserStats()
+        claim = claim_map.get(pos.claim_id)
+        if claim is not None and claim.status == "active":
+            stats.active_positions.append(pos)
+            continue
+        stats.resolved_positions.append(pos)
+        if claim is None:
+            continue
+
+        cat = stats.category_stats.get(claim.category)
+        if cat is None:
+            cat = stats.category_stats[claim.category] = {"correct": 0, "total": 0}
+        stats.graded += 1
+        cat["total"] += 1
+        if _is_correct(pos, claim):
+            stats.correct += 1
+            cat["correct"] += 1
+
+    for stats in result.values():
+        for cat in stats.category_stats.values():
+            cat["accuracy"] = round(cat["correct"] / cat["total"] * 100, 1)
+
+    return result
+
+
+# ── Materialized counters ──────────────────────────────────
+#
+# Stores keep, per user, {category: {"correct": n, "total": n}} over positions
+# on resolved claims. resolve_claim adds each claim's outcomes once, so a
+# profile can be summarized in O(categories) instead of rescanning history.
+
+def tally_outcomes(
+    tally: dict[str, dict[str, dict]], claim: Claim, positions: list[PositionRecord]
+) -> None:
+    """Add one resolved claim's outcomes to a per-user tally, in place."""
+    for pos in positions:
+        cats = tally.setdefault(pos.username, {})
+        counts = cats.setdefault(claim.category, {"correct": 0, "total": 0})
+        counts["total"] += 1
+        if _is_correct(pos, claim):
+            counts["correct"] += 1
+
+
+def tally_all(positions: list[PositionRecord], claims: list[Claim]) -> dict[str, dict[str, dict]]:
+    """Rebuild every user's counters from history (backfill and consistency checks)."""
+    claim_map = {c.id: c for c in claims}
+    tally: dict[str, dict[str, dict]] = {}
+    for pos in positions:
+        claim = claim_map.get(pos.claim_id)
+        if claim is None or claim.status == "active":
+            continue
+        tally_outcomes(tally, claim, [pos])
+    return tally
+
+
+def summarize(counters: dict[str, dict]) -> tuple[float | None, dict[str, dict]]:
+    """Turn one user's counters into (accuracy, category_stats)."""
+    correct = sum(c["correct"] for c in counters.values())
+    total = sum(c["total"] for c in counters.values())
+    category_stats = {
+        cat: {**c, "accuracy": round(c["correct"] / c["total"] * 100, 1) if c["total"] > 0 else 0}
+        for cat, c in counters.items()
+    }
+    return (round(correct / total * 100, 1) if total > 0 else None), category_stats
@@ -1,17 +1,25 @@
+import time
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from app.models.schemas import Claim, Position
-from app.services import database
+from app.models.records import PositionRecord
+from app.models.schemas import Claim
+from app.services import database, metrics, odds_stream
 
 
-def resolve_claim(claim_id: str, resolution: str) -> Claim:
-    """Resolve a claim and redistribute points to winners."""
-    claim = database.get_claim(claim_id)
-    if claim is None:
-        raise ValueError(f"Claim {claim_id} not found")
+@dataclass
+class Settlement:
+    """Everything a claim resolution writes, computed before anything is written."""
+
+    claim: Claim
+    # (username, stake returned, share of the loser pool) per winning position.
+    payouts: list[tuple[str, float, float]] = field(default_factory=list)
+
+
+def plan_settlement(claim: Claim, positions: list[PositionRecord], resolution: str) -> Settlement:
+    """Work out the new claim status and every winner's payout, in memory."""
     if claim.status != "active":
-        raise ValueError(f"Claim {claim_id} is already resolved")
+        raise ValueError(f"Claim {claim.id} is already resolved")
 
-    positions = database.get_positions_for_claim(claim_id)
     resolved_yes = resolution == "yes"
 
     # Separate winners and losers
@@ -22,19 +30,34 @@ def resolve_claim(claim_id: str, resolution: str) -> Claim:
     loser_pool = sum(p.stake for p in losers)
     winner_total_stake = sum(p.stake for p in winners)
 
+    payouts = []
     for w in winners:
-        user = database.get_user(w.username)
-        if user is None:
-            continue
         share = (w.stake / winner_total_stake) * loser_pool if winner_total_stake > 0 else 0
         # Return original stake + share of loser pool
-        updated = user.model_copy(update={"points": user.points + w.stake + share})
-        database.update_user(updated)
+        payouts.append((w.username, w.stake, share))
 
-    # Update claim status
     new_status = "resolved_yes" if resolved_yes else "resolved_no"
     updated_claim = claim.model_copy(
         update={"status": new_status, "resolved_at": datetime.now(timezone.utc)}
     )
-    database.update_claim(updated_claim)
-    return updated_claim
+    return Settlement(claim=updated_claim, payouts=payouts)
+
+
+def resolve_claim(claim_id: str, resolution: str) -> Claim:
+    """Resolve a claim and redistribute points to winners.
+
+    The claim status, every winner's balance and the reputation counters are
+    committed in a single write, so a crash never leaves a claim half-settled.
+    """
+    def plan(claim: Claim | None, positions: list[PositionRecord]) -> Settlement:
+        if claim is None:
+            raise ValueError(f"Claim {claim_id} not found")
+        return plan_settlement(claim, positions, resolution)
+
+    start = time.perf_counter()
+    settlement = database.settle_claim(claim_id, plan)
+    metrics.observe("settlement.duration_seconds", time.perf_counter() - start)
+    metrics.incr("settlement.claims")
+    metrics.incr("settlement.payouts", len(settlement.payouts))
+    odds_stream.publish(claim_id)
+    return settlement.claim
@@ -0,0 +1,115 @@
+"""ETags and a per-data-version cache of rendered bodies for read-heavy GET
+endpoints."""
+import threading
+from collections import OrderedDict
+from hashlib import blake2b
+from typing import Any, Callable, NamedTuple
+
+from fastapi import Request, Response
+from pydantic import BaseModel, TypeAdapter
+
+from app.services import async_db, codec, database, metrics
+
+MAX_ENTRIES = 256
+ETAG_HEADER = "ETag"
+
+
+class _Entry(NamedTuple):
+    version: str
+    etag: str
+    body: bytes
+    headers: dict[str, str]
+
+
+_lock = threading.Lock()
+_entries: "OrderedDict[str, _Entry]" = OrderedDict()
+_adapters: dict[Any, TypeAdapter] = {}
+
+
+def _key(request: Request) -> str:
+    query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    return f"{request.url.path}?{query}"
+
+
+def _etag(version: str, key: str) -> str:
+    return f'"{version}-{blake2b(key.encode(), digest_size=8).hexdigest()}"'
+
+
+def _matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison, as RFC 9110 prescribes for If-None-Match.
+    return any(t.strip().removeprefix("W/") == etag for t in if_none_match.split(","))
+
+
+def _render(content: Any, model: Any) -> bytes:
+    """Render the way FastAPI renders a ``response_model`` route."""
+    if model is not None:
+        adapter = _adapters.get(model)
+        if adapter is None:
+            adapter = _adapters[model] = TypeAdapter(model)
+        if isinstance(content, list):
+            content = [c.model_dump() if isinstance(c, BaseModel) else c for c in content]
+        elif isinstance(content, BaseModel):
+            content = content.model_dump()
+        content = adapter.dump_python(adapter.validate_python(content), mode="json")
+    return codec.ORJSONResponse(content).body
+
+
+def _response(entry: _Entry) -> Response:
+    headers = {**entry.headers, ETAG_HEADER: entry.etag, "Cache-Control": "no-cache"}
+    return Response(entry.body, media_type="application/json", headers=headers)
+
+
+async def respond(
+    request: Request,
+    compute: Callable[[], tuple[Any, dict[str, str]]],
+    model: Any = None,
+) -> Response:
+    """Serve ``compute()`` (content and extra headers) through the cache.
+
+    ``model`` is the route's response model, used to render the content.
+    Exceptions from ``compute`` propagate and nothing is cached.
+    """
+    key = _key(request)
+    version = await async_db.lookup(database.data_version)
+    etag = _etag(version, key)
+    with _lock:
+        entry = _entries.get(key)
+        if entry is not None and entry.version == version:
+            _entries.move_to_end(key)
+        else:
+            entry = None
+
+    if _matches(request.headers.get("if-none-match"), etag):
+        metrics.incr("http_cache.not_modified")
+        headers = entry.headers if entry is not None else {}
+        return Response(status_code=304, headers={**headers, ETAG_HEADER: etag, "Cache-Control": "no-cache"})
+    if entry is not None:
+        metrics.incr("http_cache.hits")
+        return _response(entry)
+
+    metrics.incr("http_cache.misses")
+    return _response(await async_db.read(_fill, key, version, etag, compute, model))
+
+
+def _fill(key: str, version: str, etag: str, compute: Callable[[], tuple[Any, dict[str, str]]],
+          model: Any) -> _Entry:
+    content, headers = compute()
+    entry = _Entry(version, etag, _render(content, model), headers)
+    # A write that landed while computing may or may not be reflected in the
+    # body; keep it only if the version is still the one it is tagged with.
+    if database.data_version() == version:
+        with _lock:
+            _entries[key] = entry
+            _entries.move_to_end(key)
+            while len(_entries) > MAX_ENTRIES:
+                _entries.popitem(last=False)
+    return entry
+
+
+def clear() -> None:
+    with _lock:
+        _entries.clear()
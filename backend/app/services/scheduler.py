@@ -0,0 +1,210 @@
+"""Background resolution of oracle claims once their resolution date passes,
+run by the worker holding the ``oracle-scheduler`` lease."""
+import asyncio
+import heapq
+import logging
+import os
+import socket
+import time
+from datetime import datetime, timezone
+
+from app.models.schemas import Claim
+from app.services import async_db, database, metrics, oracle, shared_state
+from app.services.resolution import resolve_claim
+
+logger = logging.getLogger(__name__)
+
+SCHEDULER_ENABLED = os.getenv("ORACLE_SCHEDULER", "1") not in ("0", "false", "no")
+# Re-read the store this often to pick up claims created by other workers.
+RESCAN_INTERVAL = float(os.getenv("ORACLE_RESCAN_INTERVAL", "60"))
+# Wait this long before retrying claims whose price fetch failed.
+RETRY_DELAY = float(os.getenv("ORACLE_RETRY_DELAY", "30"))
+# Shared lease held by the worker that settles due claims.
+LEADER_LOCK = "oracle-scheduler"
+LEADER_TTL = 60.0
+
+
+def due_timestamp(claim: Claim) -> float | None:
+    """When an oracle claim comes due (epoch seconds); naive dates are UTC."""
+    if claim.resolution_date is None:
+        return None
+    when = claim.resolution_date
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return when.timestamp()
+
+
+def _is_pending(claim: Claim) -> bool:
+    return (
+        claim.status == "active"
+        and claim.resolution_type == "oracle"
+        and bool(claim.oracle_config)
+        and claim.resolution_date is not None
+    )
+
+
+class OracleScheduler:
+    def __init__(self, rescan_interval: float = RESCAN_INTERVAL, retry_delay: float = RETRY_DELAY):
+        self.rescan_interval = rescan_interval
+        self.retry_delay = retry_delay
+        self._heap: list[tuple[float, str]] = []
+        # claim id -> due time of its live heap entry; older entries are skipped.
+        self._due: dict[str, float] = {}
+        # Claims waiting out ``retry_delay``; rescans leave their due time alone.
+        self._retrying: set[str] = set()
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._owner = f"{socket.gethostname()}:{os.getpid()}:{id(self):x}"
+
+    def schedule(self, claim: Claim) -> None:
+        """Track ``claim`` if it is an active, dated oracle claim."""
+        due = due_timestamp(claim)
+        if (
+            not _is_pending(claim) or due is None
+            or self._due.get(claim.id) == due or claim.id in self._retrying
+        ):
+            return
+        self._due[claim.id] = due
+        heapq.heappush(self._heap, (due, claim.id))
+        self._wakeup.set()
+
+    def schedule_threadsafe(self, claim: Claim) -> None:
+        """``schedule`` from any thread (sync route handlers run in a threadpool)."""
+        loop = self._loop
+        if loop is not None and loop.is_running():
+            loop.call_soon_threadsafe(self.schedule, claim)
+        else:
+            self.schedule(claim)
+
+    def rescan(self, claims: list[Claim]) -> None:
+        for claim in claims:
+            self.schedule(claim)
+
+    def status(self) -> dict:
+        next_due = self._next_due()
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "pending": len(self._due),
+            "next_due": datetime.fromtimestamp(next_due, timezone.utc).isoformat() if next_due else None,
+        }
+
+    def _next_due(self) -> float | None:
+        while self._heap and self._due.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)  # superseded or already handled
+        return self._heap[0][0] if self._heap else None
+
+    def _pop_due(self, now: float) -> list[str]:
+        due = []
+        while (next_due := self._next_due()) is not None and next_due <= now:
+            _, claim_id = heapq.heappop(self._heap)
+            del self._due[claim_id]
+            self._retrying.discard(claim_id)
+            due.append(claim_id)
+        return due
+
+    async def run_due(self, now: float | None = None) -> int:
+        """Settle every claim due by ``now``. Returns how many were settled here."""
+        now = time.time() if now is None else now
+        claim_ids = self._pop_due(now)
+        if not claim_ids:
+            return 0
+        try:
+            return await self._settle(claim_ids, now)
+        except BaseException:
+            # Settled claims are dropped again when they are next loaded.
+            for claim_id in claim_ids:
+                self._retry(claim_id, now + self.retry_delay)
+            raise
+
+    async def _settle(self, claim_ids: list[str], now: float) -> int:
+        state = shared_state.get_state()
+        if not await shared_state.call(state.acquire, LEADER_LOCK, self._owner, LEADER_TTL):
+            metrics.incr("scheduler.not_leader")
+            for claim_id in claim_ids:
+                self._retry(claim_id, now + self.retry_delay)
+            return 0
+        claims = [c for c in await async_db.read(self._load, claim_ids) if _is_pending(c)]
+        feeds = sorted({c.oracle_config.get("feed") for c in claims} & oracle.CHAINLINK_FEEDS.keys())
+        try:
+            # Fresh prices for settlement: never serve these from the cache.
+            snapshot = await oracle.get_price_snapshot(feeds, max_age=0) if feeds else {}
+        except (ConnectionError, ValueError):
+            logger.exception("Oracle fetch failed; retrying %d claims later", len(claims))
+            metrics.incr("scheduler.fetch_errors")
+            for claim in claims:
+                self._retry(claim.id, now + self.retry_delay)
+            return 0
+
+        by_id = {c.id: c for c in claims}
+        settled = 0
+        for claim_id, would_resolve in oracle.evaluate_claims(claims, snapshot).items():
+            try:
+                await async_db.write(resolve_claim, claim_id, "yes" if would_resolve else "no")
+            except ValueError:
+                # Another worker or a manual check got there first.
+                metrics.incr("scheduler.already_resolved")
+                continue
+            settled += 1
+            metrics.incr("scheduler.resolved")
+            metrics.observe("scheduler.lag_seconds", time.time() - due_timestamp(by_id[claim_id]))
+        return settled
+
+    def _retry(self, claim_id: str, when: float) -> None:
+        self._retrying.add(claim_id)
+        self._due[claim_id] = when
+        heapq.heappush(self._heap, (when, claim_id))
+
+    @staticmethod
+    def _load(claim_ids: list[str]) -> list[Claim]:
+        claims = (database.get_claim(claim_id) for claim_id in dict.fromkeys(claim_ids))
+        return [c for c in claims if c is not None]
+
+    async def _run(self) -> None:
+        next_rescan = 0.0
+        while True:
+            now = time.time()
+            if now >= next_rescan:
+                self.rescan(await async_db.read(database.get_all_claims))
+                next_rescan = now + self.rescan_interval
+            try:
+                await self.run_due(now)
+            except Exception:
+                logger.exception("Oracle scheduler pass failed")
+            next_due = self._next_due()
+            wake_at = next_rescan if next_due is None else min(next_due, next_rescan)
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=max(0.0, wake_at - time.time()))
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._loop = asyncio.get_running_loop()
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run(), name="oracle-scheduler")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self._loop = None
+            state = shared_state.get_state()
+            await shared_state.call(state.release, LEADER_LOCK, self._owner)
+
+
+_scheduler = OracleScheduler()
+
+
+def get_scheduler() -> OracleScheduler:
+    return _scheduler
+
+
+def schedule_claim(claim: Claim) -> None:
+    """Hand a newly created claim to this worker's scheduler."""
+    _scheduler.schedule_threadsafe(claim)
@@ -0,0 +1,282 @@
+"""Key/value state, TTLs and lease locks shared by every worker, in memory or
+in a SQLite file per ``SHARED_STATE``."""
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator, TypeVar
+
+from app.services import codec
+
+T = TypeVar("T")
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent.parent
+# sqlite by default: with memory state every uvicorn worker has its own nonces
+# and scheduler lease, which breaks wallet logins under --workers N.
+SHARED_STATE = os.getenv("SHARED_STATE", "sqlite")
+SHARED_STATE_PATH = Path(os.getenv("SHARED_STATE_PATH", BACKEND_DIR / "state.db"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    expires_at REAL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE INDEX IF NOT EXISTS idx_entries_expires ON entries (expires_at);
+
+CREATE TABLE IF NOT EXISTS locks (
+    name TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+"""
+
+
+class LockTimeout(Exception):
+    """``lock`` gave up waiting for another owner to release the lock."""
+
+
+def _expiry(ttl: float | None) -> float | None:
+    return time.time() + ttl if ttl is not None else None
+
+
+class SharedState(ABC):
+    """Interface of the shared state; see the module docstring."""
+
+    # True when calls never block (no I/O), so async code may call them inline.
+    in_memory = False
+
+    @abstractmethod
+    def get(self, namespace: str, key: str) -> Any:
+        """The live value of ``key``, or None."""
+
+    @abstractmethod
+    def set(self, namespace: str, key: str, value: Any, ttl: float | None = None) -> None:
+        """Store ``value`` under ``key``, expiring after ``ttl`` seconds if given."""
+
+    @abstractmethod
+    def take(self, namespace: str, key: str) -> Any:
+        """Remove ``key`` and return its live value (None if there was none).
+
+        Atomic across workers: of several concurrent takes, one gets the value.
+        """
+
+    @abstractmethod
+    def delete(self, namespace: str, key: str) -> None:
+        """Remove ``key`` if present."""
+
+    @abstractmethod
+    def purge(self) -> int:
+        """Drop expired entries and locks. Returns how many entries went."""
+
+    @abstractmethod
+    def acquire(self, name: str, owner: str, ttl: float) -> bool:
+        """Take or extend the lease ``name`` for ``owner``; False if someone else holds it."""
+
+    @abstractmethod
+    def release(self, name: str, owner: str) -> None:
+        """Give up ``name`` if ``owner`` holds it."""
+
+    @contextmanager
+    def lock(self, name: str, ttl: float = 30.0, timeout: float = 10.0) -> Iterator[None]:
+        """Hold ``name`` for the block, waiting up to ``timeout`` seconds for it.
+
+        ``ttl`` bounds how long a crashed holder can keep others out; keep the
+        block shorter than that.
+        """
+        owner = uuid.uuid4().hex
+        deadline = time.monotonic() + timeout
+        delay = 0.005
+        while not self.acquire(name, owner, ttl):
+            if time.monotonic() >= deadline:
+                raise LockTimeout(f"Timed out waiting for lock {name!r}")
+            time.sleep(delay)
+            delay = min(delay * 2, 0.1)
+        try:
+            yield
+        finally:
+            self.release(name, owner)
+
+
+class MemoryState(SharedState):
+    """Process-local state: a dict and a thread lock."""
+
+    in_memory = True
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (namespace, key) -> (value, expires_at)
+        self._entries: dict[tuple[str, str], tuple[Any, float | None]] = {}
+        # name -> (owner, expires_at)
+        self._locks: dict[str, tuple[str, float]] = {}
+
+    def _live(self, item: tuple[str, str]) -> Any:
+        entry = self._entries.get(item)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.time():
+            del self._entries[item]
+            return None
+        return value
+
+    def get(self, namespace: str, key: str) -> Any:
+        with self._lock:
+            return self._live((namespace, key))
+
+    def set(self, namespace: str, key: str, value: Any, ttl: float | None = None) -> None:
+        with self._lock:
+            self._entries[(namespace, key)] = (value, _expiry(ttl))
+
+    def take(self, namespace: str, key: str) -> Any:
+        with self._lock:
+            value = self._live((namespace, key))
+            self._entries.pop((namespace, key), None)
+            return value
+
+    def delete(self, namespace: str, key: str) -> None:
+        with self._lock:
+            self._entries.pop((namespace, key), None)
+
+    def purge(self) -> int:
+        now = time.time()
+        with self._lock:
+            expired = [k for k, (_, at) in self._entries.items() if at is not None and at <= now]
+            for k in expired:
+                del self._entries[k]
+            for name in [n for n, (_, at) in self._locks.items() if at <= now]:
+                del self._locks[name]
+            return len(expired)
+
+    def acquire(self, name: str, owner: str, ttl: float) -> bool:
+        now = time.time()
+        with self._lock:
+            held = self._locks.get(name)
+            if held is not None and held[0] != owner and held[1] > now:
+                return False
+            self._locks[name] = (owner, now + ttl)
+            return True
+
+    def release(self, name: str, owner: str) -> None:
+        with self._lock:
+            if self._locks.get(name, ("",))[0] == owner:
+                del self._locks[name]
+
+
+class SqliteState(SharedState):
+    """State in a SQLite file, shared by every process that opens it."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._local = threading.local()
+        self.connection().executescript(SCHEMA)
+
+    def connection(self) -> sqlite3.Connection:
+        """This thread's connection to the state file (one per thread, as in SqliteStore)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """An immediate (write-locked) transaction on this thread's connection."""
+        conn = self.connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def get(self, namespace: str, key: str) -> Any:
+        row = self.connection().execute(
+            "SELECT value FROM entries WHERE namespace = ? AND key = ?"
+            " AND (expires_at IS NULL OR expires_at > ?)",
+            (namespace, key, time.time()),
+        ).fetchone()
+        return codec.loads(row[0]) if row else None
+
+    def set(self, namespace: str, key: str, value: Any, ttl: float | None = None) -> None:
+        self.connection().execute(
+            "INSERT OR REPLACE INTO entries (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+            (namespace, key, codec.dumps(value).decode(), _expiry(ttl)),
+        )
+
+    def take(self, namespace: str, key: str) -> Any:
+        with self.transaction() as conn:
+            row = conn.execute(
+                "SELECT value, expires_at FROM entries WHERE namespace = ? AND key = ?",
+                (namespace, key),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute("DELETE FROM entries WHERE namespace = ? AND key = ?", (namespace, key))
+        value, expires_at = row
+        if expires_at is not None and expires_at <= time.time():
+            return None
+        return codec.loads(value)
+
+    def delete(self, namespace: str, key: str) -> None:
+        self.connection().execute("DELETE FROM entries WHERE namespace = ? AND key = ?", (namespace, key))
+
+    def purge(self) -> int:
+        now = time.time()
+        with self.transaction() as conn:
+            purged = conn.execute("DELETE FROM entries WHERE expires_at <= ?", (now,)).rowcount
+            conn.execute("DELETE FROM locks WHERE expires_at <= ?", (now,))
+        return purged
+
+    def acquire(self, name: str, owner: str, ttl: float) -> bool:
+        now = time.time()
+        # One statement: insert, or take over when expired or already ours.
+        cursor = self.connection().execute(
+            "INSERT INTO locks (name, owner, expires_at) VALUES (?, ?, ?)"
+            " ON CONFLICT (name) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at"
+            " WHERE locks.owner = excluded.owner OR locks.expires_at <= ?",
+            (name, owner, now + ttl, now),
+        )
+        return cursor.rowcount == 1
+
+    def release(self, name: str, owner: str) -> None:
+        self.connection().execute("DELETE FROM locks WHERE name = ? AND owner = ?", (name, owner))
+
+
+_state: SharedState | None = None
+_state_lock = threading.Lock()
+
+
+def _create_state() -> SharedState:
+    if SHARED_STATE == "memory":
+        return MemoryState()
+    if SHARED_STATE == "sqlite":
+        return SqliteState(SHARED_STATE_PATH)
+    raise ValueError(f"Unknown shared state backend: {SHARED_STATE}")
+
+
+def get_state() -> SharedState:
+    """Return the configured shared state, creating it on first use."""
+    global _state
+    if _state is None:
+        with _state_lock:
+            if _state is None:
+                _state = _create_state()
+    return _state
+
+
+async def call(fn: Callable[..., T], *args: Any) -> T:
+    """Call a method of the shared state from async code without blocking the loop."""
+    if get_state().in_memory:
+        return fn(*args)
+    return await asyncio.to_thread(fn, *args)
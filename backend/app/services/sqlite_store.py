@@ -0,0 +1,675 @@
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterator
+from app.models.records import PositionRecord
+from app.models.schemas import User, Claim, Position
+from app.services import analytics, codec, columnar, paging
+from app.services.odds import OddsTotals, accumulate_totals
+from app.services.reputation import tally_all, tally_outcomes
+from app.services.staking import check_stake, check_stakes
+
+if TYPE_CHECKING:
+    from app.services.resolution import Settlement
+
+SCHEMA = """
+-- data_version goes up by one with every committed transaction that changed rows.
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO meta VALUES ('data_version', 0);
+
+CREATE TABLE IF NOT EXISTS users (
+    username TEXT PRIMARY KEY,
+    display_name TEXT NOT NULL,
+    wallet_address TEXT,
+    points REAL NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_users_username_lower ON users (lower(username));
+CREATE INDEX IF NOT EXISTS idx_users_wallet_lower ON users (lower(wallet_address));
+
+CREATE TABLE IF NOT EXISTS claims (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL,
+    category TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    resolved_at TEXT,
+    created_by TEXT,
+    resolution_type TEXT NOT NULL,
+    resolution_date TEXT,
+    oracle_config TEXT
+);
+
+CREATE TABLE IF NOT EXISTS positions (
+    id TEXT PRIMARY KEY,
+    claim_id TEXT NOT NULL,
+    username TEXT NOT NULL,
+    side TEXT NOT NULL,
+    stake REAL NOT NULL,
+    confidence REAL NOT NULL,
+    created_at TEXT NOT NULL,
+    reasoning TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_claims_status ON claims (status);
+CREATE INDEX IF NOT EXISTS idx_claims_category ON claims (category);
+CREATE INDEX IF NOT EXISTS idx_claims_created_by ON claims (created_by);
+CREATE INDEX IF NOT EXISTS idx_positions_claim ON positions (claim_id);
+CREATE INDEX IF NOT EXISTS idx_positions_username ON positions (username);
+
+CREATE TABLE IF NOT EXISTS claim_stats (
+    claim_id TEXT PRIMARY KEY,
+    yes_weight REAL NOT NULL,
+    no_weight REAL NOT NULL,
+    total_staked REAL NOT NULL,
+    position_count INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS daily_stats (
+    day TEXT PRIMARY KEY,
+    count INTEGER NOT NULL,
+    value REAL NOT NULL,
+    yes_value REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS daily_claims (
+    day TEXT NOT NULL,
+    category TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (day, category)
+);
+
+CREATE TABLE IF NOT EXISTS category_totals (
+    category TEXT PRIMARY KEY,
+    count INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS user_category_stats (
+    username TEXT NOT NULL,
+    category TEXT NOT NULL,
+    correct INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    PRIMARY KEY (username, category)
+);
+"""
+
+USER_COLUMNS = ("username", "display_name", "wallet_address", "points", "created_at")
+CLAIM_COLUMNS = (
+    "id", "title", "description", "category", "status", "created_at", "resolved_at",
+    "created_by", "resolution_type", "resolution_date", "oracle_config",
+)
+POSITION_COLUMNS = (
+    "id", "claim_id", "username", "side", "stake", "confidence", "created_at", "reasoning",
+)
+
+
+def _iso(value) -> str | None:
+    return value.isoformat() if value is not None else None
+
+
+def _user_row(user: User) -> tuple:
+    return (user.username, user.display_name, user.wallet_address, user.points, _iso(user.created_at))
+
+
+def _claim_row(claim: Claim) -> tuple:
+    return (
+        claim.id, claim.title, claim.description, claim.category, claim.status,
+        _iso(claim.created_at), _iso(claim.resolved_at), claim.created_by,
+        claim.resolution_type, _iso(claim.resolution_date),
+        json.dumps(claim.oracle_config) if claim.oracle_config is not None else None,
+    )
+
+
+def _position_row(position: PositionRecord) -> tuple:
+    return (
+        position.id, position.claim_id, position.username, position.side, position.stake,
+        position.confidence, _iso(position.created_at), position.reasoning,
+    )
+
+
+def _to_claim(row: sqlite3.Row) -> Claim:
+    data = dict(row)
+    if data["oracle_config"] is not None:
+        data["oracle_config"] = json.loads(data["oracle_config"])
+    return Claim(**data)
+
+
+# Matches JsonStore.get_user: exact username, or for 0x input a case-insensitive
+# wallet/username match; the earliest inserted user wins. Written as one lookup
+# per index rather than an OR, which SQLite would answer with a table scan.
+USER_MATCH = (
+    "WHERE rowid = (SELECT min(r) FROM ("
+    "SELECT rowid AS r FROM users WHERE username = ?"
+    " UNION ALL SELECT min(rowid) FROM users WHERE ? AND lower(wallet_address) = ?"
+    " UNION ALL SELECT min(rowid) FROM users WHERE ? AND lower(username) = ?))"
+)
+
+
+def _user_lookup_args(username: str) -> tuple:
+    lowered = username.lower()
+    is_wallet = username.startswith("0x")
+    return (username, is_wallet, lowered, is_wallet, lowered)
+
+
+def _insert_sql(table: str, columns: tuple) -> str:
+    return f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})"
+
+
+class SqliteStore:
+    """SQLite backend (WAL mode) with indexed lookups instead of whole-file scans."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._local = threading.local()
+        self._conn().executescript(SCHEMA)
+        conn = self._conn()
+        if (
+            conn.execute("SELECT 1 FROM claim_stats LIMIT 1").fetchone() is None
+            and conn.execute("SELECT 1 FROM positions LIMIT 1").fetchone() is not None
+        ):
+            # Database created before aggregates existed: derive them once.
+            self.rebuild_claim_stats()
+        if (
+            conn.execute("SELECT 1 FROM user_category_stats LIMIT 1").fetchone() is None
+            and conn.execute(
+                "SELECT 1 FROM positions p JOIN claims c ON c.id = p.claim_id"
+                " WHERE c.status != 'active' LIMIT 1"
+            ).fetchone() is not None
+        ):
+            self.rebuild_reputation()
+        if (
+            conn.execute("SELECT 1 FROM daily_stats LIMIT 1").fetchone() is None
+            and conn.execute("SELECT 1 FROM daily_claims LIMIT 1").fetchone() is None
+            and not self.is_empty()
+        ):
+            self.rebuild_analytics()
+
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite3 connections are not shareable across threads, and store
+        # calls run on several (async_db's pools), so keep one per thread.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        changes = conn.total_changes
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        # Only a transaction that changed rows invalidates cached responses.
+        if conn.total_changes != changes:
+            conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'data_version'")
+        conn.execute("COMMIT")
+
+    def data_version(self) -> str:
+        row = self._conn().execute("SELECT value FROM meta WHERE key = 'data_version'").fetchone()
+        return str(row[0])
+
+    # ── Users ──────────────────────────────────────────────
+
+    def get_all_users(self) -> list[User]:
+        rows = self._conn().execute("SELECT * FROM users ORDER BY rowid")
+        return [User(**dict(r)) for r in rows]
+
+    def get_user(self, username: str) -> User | None:
+        row = self._conn().execute(
+            f"SELECT * FROM users {USER_MATCH}", _user_lookup_args(username)
+        ).fetchone()
+        return User(**dict(row)) if row else None
+
+    def get_user_by_wallet(self, wallet_address: str) -> User | None:
+        row = self._conn().execute(
+            "SELECT * FROM users WHERE lower(wallet_address) = ? ORDER BY rowid LIMIT 1",
+            (wallet_address.lower(),),
+        ).fetchone()
+        return User(**dict(row)) if row else None
+
+    def add_user(self, user: User) -> None:
+        try:
+            with self._transaction() as conn:
+                conn.execute(_insert_sql("users", USER_COLUMNS), _user_row(user))
+        except sqlite3.IntegrityError:
+            raise ValueError(f"User {user.username} already exists")
+
+    def update_user(self, user: User) -> None:
+        with self._transaction() as conn:
+            cur = conn.execute(
+                "UPDATE users SET display_name = ?, wallet_address = ?, points = ?, created_at = ?"
+                " WHERE username = ?",
+                _user_row(user)[1:] + (user.username,),
+            )
+            if cur.rowcount == 0:
+                raise ValueError(f"User {user.username} not found")
+
+    # ── Claims ─────────────────────────────────────────────
+
+    def get_all_claims(self) -> list[Claim]:
+        rows = self._conn().execute("SELECT * FROM claims ORDER BY rowid")
+        return [_to_claim(r) for r in rows]
+
+    def get_claim(self, claim_id: str) -> Claim | None:
+        row = self._conn().execute("SELECT * FROM claims WHERE id = ?", (claim_id,)).fetchone()
+        return _to_claim(row) if row else None
+
+    def add_claim(self, claim: Claim) -> None:
+        try:
+            with self._transaction() as conn:
+                conn.execute(_insert_sql("claims", CLAIM_COLUMNS), _claim_row(claim))
+                self._count_claim(conn, claim, 1)
+        except sqlite3.IntegrityError:
+            raise ValueError(f"Claim {claim.id} already exists")
+
+    def add_claims(self, claims: list[Claim], atomic: bool = False, dry_run: bool = False) -> dict[int, str]:
+        with self._transaction() as conn:
+            errors, seen = {}, set()
+            for i, claim in enumerate(claims):
+                if claim.id in seen or conn.execute(
+                    "SELECT 1 FROM claims WHERE id = ?", (claim.id,)
+                ).fetchone() is not None:
+                    errors[i] = f"Claim {claim.id} already exists"
+                seen.add(claim.id)
+            if len(errors) < len(claims) and not (atomic and errors) and not dry_run:
+                accepted = [c for i, c in enumerate(claims) if i not in errors]
+                conn.executemany(_insert_sql("claims", CLAIM_COLUMNS), map(_claim_row, accepted))
+                for claim in accepted:
+                    self._count_claim(conn, claim, 1)
+            return errors
+
+    def update_claim(self, claim: Claim) -> None:
+        with self._transaction() as conn:
+            old = conn.execute("SELECT * FROM claims WHERE id = ?", (claim.id,)).fetchone()
+            if old is not None and (old["category"], old["created_at"]) != (claim.category, _iso(claim.created_at)):
+                self._count_claim(conn, _to_claim(old), -1)
+                self._count_claim(conn, claim, 1)
+            cur = conn.execute(
+                f"UPDATE claims SET {', '.join(f'{c} = ?' for c in CLAIM_COLUMNS[1:])} WHERE id = ?",
+                _claim_row(claim)[1:] + (claim.id,),
+            )
+            if cur.rowcount == 0:
+                raise ValueError(f"Claim {claim.id} not found")
+
+    def delete_claim(self, claim_id: str) -> None:
+        with self._transaction() as conn:
+            row = conn.execute("SELECT * FROM claims WHERE id = ?", (claim_id,)).fetchone()
+            if row is None:
+                raise ValueError(f"Claim {claim_id} not found")
+            conn.execute("DELETE FROM claims WHERE id = ?", (claim_id,))
+            conn.execute("DELETE FROM claim_stats WHERE claim_id = ?", (claim_id,))
+            self._count_claim(conn, _to_claim(row), -1)
+
+    @staticmethod
+    def _count_claim(conn: sqlite3.Connection, claim: Claim, delta: int) -> None:
+        day = claim.created_at.date().isoformat()
+        conn.execute(
+            "INSERT INTO daily_claims VALUES (?, ?, ?)"
+            " ON CONFLICT (day, category) DO UPDATE SET count = count + excluded.count",
+            (day, claim.category, delta),
+        )
+        conn.execute("DELETE FROM daily_claims WHERE day = ? AND category = ? AND count <= 0",
+                     (day, claim.category))
+        conn.execute(
+            "INSERT INTO category_totals VALUES (?, ?)"
+            " ON CONFLICT (category) DO UPDATE SET count = count + excluded.count",
+            (claim.category, delta),
+        )
+        conn.execute("DELETE FROM category_totals WHERE category = ? AND count <= 0", (claim.category,))
+
+    # ── Positions ──────────────────────────────────────────
+
+    def get_all_positions(self) -> list[PositionRecord]:
+        rows = self._conn().execute("SELECT * FROM positions ORDER BY rowid")
+        return [PositionRecord.from_dict(dict(r)) for r in rows]
+
+    def get_positions_for_claim(self, claim_id: str) -> list[PositionRecord]:
+        rows = self._conn().execute(
+            "SELECT * FROM positions WHERE claim_id = ? ORDER BY rowid", (claim_id,)
+        )
+        return [PositionRecord.from_dict(dict(r)) for r in rows]
+
+    def get_positions_for_user(self, username: str) -> list[PositionRecord]:
+        rows = self._conn().execute(
+            "SELECT * FROM positions WHERE username = ? ORDER BY rowid", (username,)
+        )
+        return [PositionRecord.from_dict(dict(r)) for r in rows]
+
+    def add_position(self, position: PositionRecord) -> None:
+        with self._transaction() as conn:
+            self._insert_positions(conn, [position])
+
+    def place_position(self, position: PositionRecord) -> None:
+        with self._transaction() as conn:
+            user_row = conn.execute(
+                f"SELECT rowid, * FROM users {USER_MATCH}", _user_lookup_args(position.username)
+            ).fetchone()
+            claim_row = conn.execute(
+                "SELECT * FROM claims WHERE id = ?", (position.claim_id,)
+            ).fetchone()
+            user = User(**{k: user_row[k] for k in USER_COLUMNS}) if user_row else None
+            check_stake(user, _to_claim(claim_row) if claim_row else None, position.stake)
+            conn.execute(
+                "UPDATE users SET points = ? WHERE rowid = ?",
+                (user.points - position.stake, user_row["rowid"]),
+            )
+            self._insert_positions(conn, [position])
+
+    def place_positions(
+        self, positions: list[PositionRecord], atomic: bool = False, dry_run: bool = False
+    ) -> dict[int, str]:
+        with self._transaction() as conn:
+
+            def find_user(username: str) -> User | None:
+                row = conn.execute(f"SELECT * FROM users {USER_MATCH}", _user_lookup_args(username)).fetchone()
+                return User(**dict(row)) if row else None
+
+            def find_claim(claim_id: str) -> Claim | None:
+                row = conn.execute("SELECT * FROM claims WHERE id = ?", (claim_id,)).fetchone()
+                return _to_claim(row) if row else None
+
+            def position_exists(position_id: str) -> bool:
+                return conn.execute("SELECT 1 FROM positions WHERE id = ?", (position_id,)).fetchone() is not None
+
+            debits, errors = check_stakes(positions, find_user, find_claim, position_exists)
+            if debits and not (atomic and errors) and not dry_run:
+                conn.executemany(
+                    "UPDATE users SET points = points - ? WHERE username = ?",
+                    [(total, username) for username, total in debits.items()],
+                )
+                self._insert_positions(conn, [p for i, p in enumerate(positions) if i not in errors])
+            return errors
+
+    @staticmethod
+    def _insert_positions(conn: sqlite3.Connection, positions: list[PositionRecord]) -> None:
+        """Insert ``positions`` and add them to the claim and daily aggregates,
+        one upsert per claim and per day."""
+        conn.executemany(_insert_sql("positions", POSITION_COLUMNS), map(_position_row, positions))
+        conn.executemany(
+            "INSERT INTO claim_stats VALUES (?, ?, ?, ?, ?)"
+            " ON CONFLICT (claim_id) DO UPDATE SET"
+            " yes_weight = yes_weight + excluded.yes_weight,"
+            " no_weight = no_weight + excluded.no_weight,"
+            " total_staked = total_staked + excluded.total_staked,"
+            " position_count = position_count + excluded.position_count",
+            [(claim_id, t.yes_weight, t.no_weight, t.total_staked, t.position_count)
+             for claim_id, t in accumulate_totals(positions).items()],
+        )
+        days: dict[str, list] = {}
+        for p in positions:
+            day = days.setdefault(p.created_at.date().isoformat(), [0, 0.0, 0.0])
+            day[0] += 1
+            day[1] += p.stake
+            day[2] += p.stake if p.side == "yes" else 0
+        conn.executemany(
+            "INSERT INTO daily_stats VALUES (?, ?, ?, ?)"
+            " ON CONFLICT (day) DO UPDATE SET"
+            " count = count + excluded.count,"
+            " value = value + excluded.value,"
+            " yes_value = yes_value + excluded.yes_value",
+            [(day, *totals) for day, totals in days.items()],
+        )
+
+    # ── Listings ───────────────────────────────────────────
+
+    def _page(self, table: str, key: str, filters: dict[str, str], cursor: str | None,
+              limit: int | None, convert: Callable[[sqlite3.Row], object]) -> paging.Page:
+        """Keyset page in rowid order; ``filters`` names come from code, not input."""
+        conn = self._conn()
+        where = [f"{name} = ?" for name in filters]
+        params: list = list(filters.values())
+        if cursor is not None:
+            row = conn.execute(f"SELECT rowid FROM {table} WHERE {key} = ?", (cursor,)).fetchone()
+            if row is None:
+                raise ValueError(f"Unknown cursor {cursor!r}")
+            where.append("rowid > ?")
+            params.append(row[0])
+        sql = f"SELECT * FROM {table}"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY rowid"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit + 1)
+        rows = conn.execute(sql, params).fetchall()
+        if limit is not None and len(rows) > limit:
+            return paging.Page([convert(r) for r in rows[:limit]], rows[limit - 1][key])
+        return paging.Page([convert(r) for r in rows], None)
+
+    def page_users(self, cursor: str | None, limit: int | None) -> paging.Page[User]:
+        return self._page("users", "username", {}, cursor, limit, lambda r: User(**dict(r)))
+
+    def page_claims(
+        self, filters: dict[str, str], cursor: str | None, limit: int | None
+    ) -> paging.Page[Claim]:
+        return self._page("claims", "id", filters, cursor, limit, _to_claim)
+
+    def page_positions(
+        self, filters: dict[str, str], cursor: str | None, limit: int | None
+    ) -> paging.Page[PositionRecord]:
+        return self._page("positions", "id", filters, cursor, limit,
+                          lambda r: PositionRecord.from_dict(dict(r)))
+
+    # ── Aggregates ─────────────────────────────────────────
+
+    def get_claim_stats(self, claim_id: str) -> OddsTotals:
+        row = self._conn().execute(
+            "SELECT yes_weight, no_weight, total_staked, position_count"
+            " FROM claim_stats WHERE claim_id = ?",
+            (claim_id,),
+        ).fetchone()
+        return OddsTotals(*row) if row else OddsTotals()
+
+    def get_all_claim_stats(self) -> dict[str, OddsTotals]:
+        rows = self._conn().execute("SELECT * FROM claim_stats")
+        return {r[0]: OddsTotals(*r[1:]) for r in rows}
+
+    def _rebuild_claim_stats(self, conn: sqlite3.Connection) -> int:
+        # Summed in Python, in insertion order, so the result matches
+        # odds.calculate_odds bit for bit.
+        rows = conn.execute("SELECT * FROM positions ORDER BY rowid")
+        return self._write_claim_stats(conn, accumulate_totals([PositionRecord.from_dict(dict(r)) for r in rows]))
+
+    @staticmethod
+    def _write_claim_stats(conn: sqlite3.Connection, totals: dict[str, OddsTotals]) -> int:
+        conn.execute("DELETE FROM claim_stats")
+        conn.executemany(
+            "INSERT INTO claim_stats VALUES (?, ?, ?, ?, ?)",
+            (
+                (cid, t.yes_weight, t.no_weight, t.total_staked, t.position_count)
+                for cid, t in totals.items()
+            ),
+        )
+        return len(totals)
+
+    def rebuild_claim_stats(self) -> int:
+        with self._transaction() as conn:
+            return self._rebuild_claim_stats(conn)
+
+    def get_reputation(self, username: str) -> dict[str, dict]:
+        rows = self._conn().execute(
+            "SELECT category, correct, total FROM user_category_stats"
+            " WHERE username = ? ORDER BY rowid",
+            (username,),
+        )
+        return {r["category"]: {"correct": r["correct"], "total": r["total"]} for r in rows}
+
+    def get_all_reputation(self) -> dict[str, dict[str, dict]]:
+        result: dict[str, dict[str, dict]] = {}
+        for r in self._conn().execute("SELECT * FROM user_category_stats ORDER BY rowid"):
+            result.setdefault(r["username"], {})[r["category"]] = {
+                "correct": r["correct"], "total": r["total"],
+            }
+        return result
+
+    @staticmethod
+    def _add_reputation(conn: sqlite3.Connection, tally: dict[str, dict[str, dict]]) -> None:
+        conn.executemany(
+            "INSERT INTO user_category_stats VALUES (?, ?, ?, ?)"
+            " ON CONFLICT (username, category) DO UPDATE SET"
+            " correct = correct + excluded.correct, total = total + excluded.total",
+            (
+                (username, cat, c["correct"], c["total"])
+                for username, cats in tally.items()
+                for cat, c in cats.items()
+            ),
+        )
+
+    # ── Settlement ─────────────────────────────────────────
+
+    def settle_claim(
+        self,
+        claim_id: str,
+        plan: Callable[[Claim | None, list[PositionRecord]], "Settlement"],
+    ) -> "Settlement":
+        with self._transaction() as conn:
+            row = conn.execute("SELECT * FROM claims WHERE id = ?", (claim_id,)).fetchone()
+            positions = [
+                PositionRecord.from_dict(dict(r))
+                for r in conn.execute(
+                    "SELECT * FROM positions WHERE claim_id = ? ORDER BY rowid", (claim_id,)
+                )
+            ]
+            settlement = plan(_to_claim(row) if row else None, positions)
+
+            user_rowids: dict[str, int | None] = {}
+            credits = []
+            for username, stake, share in settlement.payouts:
+                if username not in user_rowids:
+                    found = conn.execute(
+                        f"SELECT rowid FROM users {USER_MATCH}", _user_lookup_args(username)
+                    ).fetchone()
+                    user_rowids[username] = found[0] if found else None
+                if user_rowids[username] is not None:
+                    credits.append((stake, share, user_rowids[username]))
+            conn.executemany("UPDATE users SET points = points + ? + ? WHERE rowid = ?", credits)
+
+            conn.execute(
+                f"UPDATE claims SET {', '.join(f'{c} = ?' for c in CLAIM_COLUMNS[1:])} WHERE id = ?",
+                _claim_row(settlement.claim)[1:] + (claim_id,),
+            )
+            tally: dict[str, dict[str, dict]] = {}
+            tally_outcomes(tally, settlement.claim, positions)
+            self._add_reputation(conn, tally)
+            return settlement
+
+    def _rebuild_reputation(self, conn: sqlite3.Connection) -> int:
+        claims = [_to_claim(r) for r in conn.execute("SELECT * FROM claims ORDER BY rowid")]
+        positions = [
+            PositionRecord.from_dict(dict(r)) for r in conn.execute("SELECT * FROM positions ORDER BY rowid")
+        ]
+        return self._write_reputation(conn, tally_all(positions, claims))
+
+    def _write_reputation(self, conn: sqlite3.Connection, tally: dict[str, dict[str, dict]]) -> int:
+        conn.execute("DELETE FROM user_category_stats")
+        self._add_reputation(conn, tally)
+        return len(tally)
+
+    def rebuild_reputation(self) -> int:
+        with self._transaction() as conn:
+            return self._rebuild_reputation(conn)
+
+    def get_analytics(self) -> dict:
+        conn = self._conn()
+        rollup = analytics.empty_rollup()
+        total = rollup["total"]
+        for row in conn.execute("SELECT * FROM daily_stats ORDER BY day"):
+            rollup["days"][row["day"]] = {
+                "count": row["count"], "value": row["value"], "yes_value": row["yes_value"],
+            }
+            total["count"] += row["count"]
+            total["value"] += row["value"]
+            total["yes_value"] += row["yes_value"]
+        for row in conn.execute("SELECT * FROM daily_claims ORDER BY day, rowid"):
+            rollup["categories"].setdefault(row["day"], {})[row["category"]] = row["count"]
+        for row in conn.execute("SELECT * FROM category_totals ORDER BY rowid"):
+            rollup["category_totals"][row["category"]] = row["count"]
+        return rollup
+
+    def _rebuild_analytics(self, conn: sqlite3.Connection) -> int:
+        positions = [PositionRecord.from_dict(dict(r)) for r in conn.execute("SELECT * FROM positions ORDER BY rowid")]
+        claims = [_to_claim(r) for r in conn.execute("SELECT * FROM claims ORDER BY rowid")]
+        return self._write_analytics(conn, analytics.build_rollup(positions, claims))
+
+    @staticmethod
+    def _write_analytics(conn: sqlite3.Connection, rollup: dict) -> int:
+        conn.execute("DELETE FROM daily_stats")
+        conn.execute("DELETE FROM daily_claims")
+        conn.execute("DELETE FROM category_totals")
+        conn.executemany(
+            "INSERT INTO category_totals VALUES (?, ?)", list(rollup["category_totals"].items())
+        )
+        conn.executemany(
+            "INSERT INTO daily_stats VALUES (?, ?, ?, ?)",
+            [(d, b["count"], b["value"], b["yes_value"]) for d, b in rollup["days"].items()],
+        )
+        conn.executemany(
+            "INSERT INTO daily_claims VALUES (?, ?, ?)",
+            [(d, cat, n) for d, cats in rollup["categories"].items() for cat, n in cats.items()],
+        )
+        return len(rollup["days"])
+
+    def rebuild_analytics(self) -> int:
+        with self._transaction() as conn:
+            return self._rebuild_analytics(conn)
+
+    # ── Maintenance ────────────────────────────────────────
+
+    def compact(self, force: bool = False) -> bool:
+        """Checkpoint the WAL into the main database file and truncate it."""
+        busy, _, _ = self._conn().execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+        return not busy
+
+    def export_data(self) -> dict:
+        """The whole database as a data.json-shaped document."""
+        return codec.loads(codec.dumps({
+            "users": [u.model_dump() for u in self.get_all_users()],
+            "claims": [c.model_dump() for c in self.get_all_claims()],
+            "positions": [p._asdict() for p in self.get_all_positions()],
+        }))
+
+    # ── Migration ──────────────────────────────────────────
+
+    def is_empty(self) -> bool:
+        conn = self._conn()
+        return all(
+            conn.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone() is None
+            for table in ("users", "claims", "positions")
+        )
+
+    def import_data(self, data: dict, replace: bool = False) -> dict[str, int]:
+        """Load a data.json-shaped document in a single transaction."""
+        users = [User(**u) for u in data.get("users", [])]
+        claims = [Claim(**c) for c in data.get("claims", [])]
+        positions = [PositionRecord.from_model(Position(**p)) for p in data.get("positions", [])]
+        with self._transaction() as conn:
+            if replace:
+                conn.execute("DELETE FROM user_category_stats")
+                conn.execute("DELETE FROM claim_stats")
+                conn.execute("DELETE FROM positions")
+                conn.execute("DELETE FROM claims")
+                conn.execute("DELETE FROM users")
+            conn.executemany(_insert_sql("users", USER_COLUMNS), map(_user_row, users))
+            conn.executemany(_insert_sql("claims", CLAIM_COLUMNS), map(_claim_row, claims))
+            conn.executemany(_insert_sql("positions", POSITION_COLUMNS), map(_position_row, positions))
+            # Derived from the tables, which may have held rows before this import.
+            totals, tally, rollup = columnar.aggregate(
+                [PositionRecord.from_dict(dict(r)) for r in conn.execute("SELECT * FROM positions ORDER BY rowid")],
+                [_to_claim(r) for r in conn.execute("SELECT * FROM claims ORDER BY rowid")],
+            )
+            self._write_claim_stats(conn, totals)
+            self._write_reputation(conn, tally)
+            self._write_analytics(conn, rollup)
+        return {"users": len(users), "claims": len(claims), "positions": len(positions)}
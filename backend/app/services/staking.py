@@ -0,0 +1,61 @@
+from typing import Callable
+
+from app.models.records import PositionRecord
+from app.models.schemas import User, Claim
+
+
+def check_stake(user: User | None, claim: Claim | None, stake: float, balance: float | None = None) -> None:
+    """Raise ValueError unless ``user`` can stake ``stake`` points on ``claim``.
+
+    Stores call this inside their write lock/transaction, so the balance it
+    sees is the one the debit is applied to. ``balance`` overrides
+    ``user.points`` when earlier stakes of the same write are not applied yet.
+    """
+    if user is None:
+        raise ValueError("User not found")
+    if claim is None:
+        raise ValueError("Claim not found")
+    if claim.status != "active":
+        raise ValueError("Claim is already resolved")
+    points = user.points if balance is None else balance
+    if points < stake:
+        raise ValueError(f"Insufficient points: have {points}, need {stake}")
+
+
+def check_stakes(
+    positions: list[PositionRecord],
+    find_user: Callable[[str], User | None],
+    find_claim: Callable[[str], Claim | None],
+    position_exists: Callable[[str], bool],
+) -> tuple[dict[str, float], dict[int, str]]:
+    """Check a batch of stakes in order, as if each were placed on its own.
+
+    Each user's balance is the stored one less the stakes accepted earlier in
+    the batch. Users and claims are looked up once per distinct name or id.
+    Returns the total debit per (resolved) username and {index: error} for
+    the rejected rows.
+    """
+    users: dict[str, User | None] = {}
+    claims: dict[str, Claim | None] = {}
+    debits: dict[str, float] = {}
+    seen: set[str] = set()
+    errors: dict[int, str] = {}
+    for i, position in enumerate(positions):
+        if position.id in seen or position_exists(position.id):
+            errors[i] = f"Position {position.id} already exists"
+            continue
+        if position.username not in users:
+            users[position.username] = find_user(position.username)
+        if position.claim_id not in claims:
+            claims[position.claim_id] = find_claim(position.claim_id)
+        user = users[position.username]
+        spent = debits.get(user.username, 0.0) if user is not None else 0.0
+        try:
+            check_stake(user, claims[position.claim_id], position.stake,
+                        user.points - spent if user is not None else None)
+        except ValueError as e:
+            errors[i] = str(e)
+            continue
+        debits[user.username] = spent + position.stake
+        seen.add(position.id)
+    return debits, errors
@@ -0,0 +1,64 @@
+"""/api/analytics: a full scan of every position and claim versus the rollup.
+
+The full scan is the route as it was before rollups: export the whole store
+and aggregate it on each request. The rollup path reads the per-day counters
+the store maintains on write, so its cost follows the number of days rather
+than the number of positions.
+
+Run from the backend directory:
+    python -m benchmarks.bench_analytics --positions 200000 --requests 20
+"""
+import argparse
+import math
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from tests.helpers import make_dataset, scan_analytics, write_dataset
+
+
+def _per_request(fn, requests: int) -> tuple[float, object]:
+    start = time.perf_counter()
+    for _ in range(requests):
+        result = fn()
+    return (time.perf_counter() - start) / requests, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--claims", type=int, default=1000)
+    parser.add_argument("--positions", type=int, default=200_000)
+    parser.add_argument("--requests", type=int, default=20)
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    path = Path(tmp.name) / "data.json"
+    data = make_dataset(args.users, args.claims, args.positions)
+    write_dataset(path, data)
+    os.environ["DATA_PATH"] = str(path)
+    os.environ["SQLITE_PATH"] = str(Path(tmp.name) / "oracle.db")
+
+    from app.services import database
+
+    if database.STORAGE_BACKEND == "sqlite":
+        database.get_store().import_data(data)
+    database.get_all_claims()  # warm the cache
+    scan_t, old = _per_request(lambda: scan_analytics(database.export_data()), args.requests)
+    rollup_t, new = _per_request(database.get_analytics, args.requests)
+    # Stake sums are added in a different order, so compare them up to rounding.
+    assert [(h["date"], h["count"]) for h in old["history"]] == [(h["date"], h["count"]) for h in new["history"]]
+    assert all(math.isclose(a["value"], b["value"]) for a, b in zip(old["history"], new["history"]))
+    assert math.isclose(old["tvl"], new["tvl"]) and old["sentiment"] == new["sentiment"]
+    assert old["top_categories"] == new["top_categories"]
+
+    print(f"{args.positions} positions, {args.claims} claims, {len(new['history'])} days "
+          f"({database.STORAGE_BACKEND} store)")
+    print(f"  full scan per request   {scan_t * 1000:10.2f} ms")
+    print(f"  rollup per request      {rollup_t * 1000:10.2f} ms")
+    print(f"  speedup                 {scan_t / rollup_t:10.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""data.json read/write: the old stdlib path versus the codec module.
+
+"stdlib indent=2" is how the store used to persist (json.dump with indent=2
+and default=str, json.load to read). "codec" is the current path, with orjson
+when it is installed, writing compact output; "codec, no orjson" forces the
+stdlib fallback. Each case round-trips the same synthetic dataset through a
+file and reports the best of a few runs.
+
+Run from the backend directory:
+    python -m benchmarks.bench_codec --sizes 10000 100000 500000
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from tests.helpers import make_dataset
+
+
+def _best(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 500_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    from app.services import codec
+
+    def stdlib_write(path, data):
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2, default=str)
+
+    def stdlib_read(path):
+        with open(path) as f:
+            return json.load(f)
+
+    def codec_write(path, data):
+        with open(path, "wb") as f:
+            f.write(codec.dumps(data))
+
+    def codec_read(path):
+        with open(path, "rb") as f:
+            return codec.loads(f.read())
+
+    orjson = codec.orjson
+    cases = [("stdlib indent=2", None, stdlib_write, stdlib_read)]
+    if orjson is not None:
+        cases.append(("codec (orjson)", orjson, codec_write, codec_read))
+    cases.append(("codec, no orjson", None, codec_write, codec_read))
+
+    tmp = tempfile.TemporaryDirectory()
+    path = Path(tmp.name) / "data.json"
+    print(f"{'positions':>10s}  {'path':18s} {'write':>9s} {'read':>9s} {'size':>9s}")
+    for size in args.sizes:
+        data = make_dataset(max(10, size // 200), max(10, size // 100), size)
+        expected = None
+        for name, backend, write, read in cases:
+            codec.orjson = backend
+            write_t = _best(lambda: write(path, data), args.repeat)
+            read_t = _best(lambda: read(path), args.repeat)
+            loaded = read(path)
+            expected = expected or loaded
+            assert loaded == expected, f"{name} round-trip differs"
+            print(f"{size:10d}  {name:18s} {write_t * 1000:7.0f}ms {read_t * 1000:7.0f}ms "
+                  f"{os.path.getsize(path) / 2**20:7.1f}MB")
+        codec.orjson = orjson
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Bulk odds, analytics rollup and reputation: pure Python versus NumPy columns.
+
+Both sides start from the same list of ``Position`` objects. Converting them to
+columns is timed separately, since the engine pays for it once and then
+answers every query from the arrays. Results are asserted to be identical.
+
+Run from the backend directory (needs numpy):
+    python -m benchmarks.bench_columnar --positions 1000000
+"""
+import argparse
+import time
+
+from tests.helpers import make_dataset
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--claims", type=int, default=10_000)
+    parser.add_argument("--positions", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    from app.models.records import PositionRecord
+    from app.models.schemas import Claim
+    from app.services import analytics, columnar, odds, reputation
+
+    if not columnar.available():
+        raise SystemExit("numpy is not installed")
+
+    data = make_dataset(args.users, args.claims, args.positions)
+    claims = [Claim(**c) for c in data["claims"]]
+    positions = [PositionRecord.from_dict(p) for p in data.pop("positions")]
+
+    build_t, cols = _timed(lambda: columnar.PositionColumns.from_positions(positions))
+    rows = [
+        ("odds (calculate_odds_bulk)",
+         lambda: odds.calculate_odds_bulk(positions), cols.calculate_odds_bulk),
+        ("TVL/sentiment/daily rollup",
+         lambda: analytics.build_rollup(positions, claims), lambda: cols.build_rollup(claims)),
+        ("reputation (tally_all)",
+         lambda: reputation.tally_all(positions, claims), lambda: cols.tally_all(claims)),
+    ]
+
+    print(f"{args.positions} positions, {args.claims} claims, {args.users} users")
+    print(f"  build columns{'':24s}{build_t * 1000:10.1f} ms (once)")
+    print(f"  {'':36s}{'python':>10s} {'numpy':>10s} {'speedup':>8s}")
+    for name, python_fn, numpy_fn in rows:
+        py_t, expected = _timed(python_fn)
+        np_t, result = _timed(numpy_fn)
+        assert result == expected, f"{name}: columnar result differs"
+        print(f"  {name:36s}{py_t * 1000:8.1f}ms {np_t * 1000:8.1f}ms {py_t / np_t:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
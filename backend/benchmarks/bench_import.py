@@ -0,0 +1,112 @@
+"""Throughput of bulk JSONL imports versus placing the same stakes one by one.
+
+Builds a store with ``--users`` users and ``--claims`` active claims, then:
+
+1. places ``--single`` stakes the way ``POST /api/positions`` does (read the
+   user, read the claim, ``place_position``) and reports the rate;
+2. imports ``--rows`` positions from JSON Lines with ``bulk_import`` (parse,
+   validate, one write), then ``--rows`` claims;
+
+and checks that odds totals match the positions and points are conserved.
+Uses ``STORAGE_BACKEND`` like the app. Run from the backend directory:
+    python -m benchmarks.bench_import --rows 100000
+    STORAGE_BACKEND=sqlite python -m benchmarks.bench_import --rows 100000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from tests.helpers import make_dataset, write_dataset
+
+START_POINTS = 1_000_000.0
+
+
+def _position_lines(n: int, users: int, claims: int, seed: int = 0) -> list[bytes]:
+    rng = random.Random(seed)
+    return [
+        json.dumps({
+            "claim_id": f"claim-{rng.randrange(claims)}", "username": f"user{rng.randrange(users)}",
+            "side": rng.choice(("yes", "no")), "stake": float(rng.randint(1, 50)),
+            "confidence": round(rng.uniform(0.5, 0.99), 2),
+        }).encode()
+        for _ in range(n)
+    ]
+
+
+def _claim_lines(n: int, users: int) -> list[bytes]:
+    return [
+        json.dumps({
+            "title": f"Imported claim {i}", "description": "Seeded by bench_import",
+            "category": "ai", "created_by": f"user{i % users}",
+        }).encode()
+        for i in range(n)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--single", type=int, default=1_000, help="stakes placed one by one for comparison")
+    parser.add_argument("--users", type=int, default=1_000)
+    parser.add_argument("--claims", type=int, default=100)
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    data = make_dataset(args.users, args.claims, 0)
+    for claim in data["claims"]:
+        claim["status"] = "active"
+    for user in data["users"]:
+        user["points"] = START_POINTS
+    write_dataset(Path(tmp.name) / "data.json", data)
+    os.environ.update(
+        DATA_PATH=str(Path(tmp.name) / "data.json"), SQLITE_PATH=str(Path(tmp.name) / "data.db"),
+        ORACLE_SCHEDULER="0", COMPACT_INTERVAL="0",
+    )
+    from app.models.records import PositionRecord, new_id
+    from app.services import bulk_import, database
+
+    if database.STORAGE_BACKEND == "sqlite":
+        database.get_store().import_data(data)
+    print(f"backend={database.STORAGE_BACKEND} users={args.users} claims={args.claims}")
+
+    rng = random.Random(1)
+    start = time.perf_counter()
+    for _ in range(args.single):
+        username, claim_id = f"user{rng.randrange(args.users)}", f"claim-{rng.randrange(args.claims)}"
+        database.get_user(username)
+        database.get_claim(claim_id)
+        database.place_position(PositionRecord(
+            new_id("pos"), claim_id, username, "yes", 1.0, 0.75, datetime.now(timezone.utc),
+        ))
+    elapsed = time.perf_counter() - start
+    print(f"  one by one   {args.single:>7} positions {elapsed:7.2f}s  {args.single / elapsed:>9.0f} rows/s")
+
+    for kind, lines, run in (
+        ("positions", _position_lines(args.rows, args.users, args.claims), bulk_import.import_positions),
+        ("claims", _claim_lines(args.rows, args.users), bulk_import.import_claims),
+    ):
+        start = time.perf_counter()
+        result = run(lines)
+        elapsed = time.perf_counter() - start
+        print(f"  bulk import  {result.accepted:>7} {kind:<9} {elapsed:7.2f}s  {args.rows / elapsed:>9.0f} rows/s"
+              f"  ({result.rejected} rejected)")
+
+    positions = database.get_all_positions()
+    balances = sum(u.points for u in database.get_all_users())
+    staked = sum(p.stake for p in positions)
+    mismatched = database.check_claim_stats()
+    print(f"  positions={len(positions)} balances+staked={balances + staked:.0f} "
+          f"expected={args.users * START_POINTS:.0f} odds mismatches={len(mismatched)}")
+    if mismatched or abs(balances + staked - args.users * START_POINTS) > 1e-6 * args.users * START_POINTS:
+        print("FAIL")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Per-claim odds lookups (the old N+1 list_claims) versus one bulk pass.
+
+Run from the backend directory:
+    python -m benchmarks.bench_list_claims --claims 1000 --positions 100000
+"""
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from tests.helpers import make_dataset, write_dataset
+
+
+def _timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--claims", type=int, default=1000)
+    parser.add_argument("--positions", type=int, default=100_000)
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    path = Path(tmp.name) / "data.json"
+    write_dataset(path, make_dataset(args.users, args.claims, args.positions))
+    os.environ["DATA_PATH"] = str(path)
+
+    from app.services import database, odds
+
+    claims = database.get_all_claims()  # warm the cache
+
+    old, new = [], []
+
+    def per_claim():
+        for claim in claims:
+            positions = database.get_positions_for_claim(claim.id)
+            yes_pct, no_pct = odds.calculate_odds(positions)
+            old.append(odds.ClaimOdds(yes_pct, no_pct, sum(p.stake for p in positions), len(positions)))
+
+    def bulk():
+        summary = odds.calculate_odds_bulk(database.get_all_positions())
+        for claim in claims:
+            new.append(summary.get(claim.id) or odds.ClaimOdds())
+
+    def full_parse():
+        database.get_store()._snapshot = None
+        database.get_all_positions()
+
+    parse = _timed(full_parse)
+    n_plus_1 = _timed(per_claim)
+    one_pass = _timed(bulk)
+    assert old == new, "bulk odds disagree with per-claim odds"
+
+    print(f"{args.claims} claims, {args.positions} positions")
+    print(f"  full parse of data.json            {parse * 1000:10.1f} ms")
+    print(f"  N+1, uncached (C parses, estimate) {parse * args.claims * 1000:10.1f} ms")
+    print(f"  N+1, cached dataset                {n_plus_1 * 1000:10.1f} ms")
+    print(f"  calculate_odds_bulk                {one_pass * 1000:10.1f} ms")
+    print(f"  speedup (cached N+1 / bulk)        {n_plus_1 / one_pass:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Cost of issuing and consuming login nonces with 1M already outstanding.
+
+Compares the store used before (a shared-state entry per address and a purge
+that scans every entry on each GET /api/auth/nonce) with ``nonces``: the
+in-memory ordered store and, with ``--sqlite``, the SQLite one. Also checks
+the bounds: issuing past ``max_total`` keeps the store at its cap, and
+expired nonces drain a batch per issue without a full scan.
+
+Run from the backend directory:
+    python -m benchmarks.bench_nonces --outstanding 1000000
+    python -m benchmarks.bench_nonces --sqlite
+"""
+import argparse
+import secrets
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from app.services import metrics
+from app.services.nonces import MemoryNonces, SqliteNonces
+from app.services.shared_state import MemoryState, SqliteState
+
+
+def _address(i: int) -> str:
+    return f"0x{i:040x}"
+
+
+def _rate(label: str, n: int, fn) -> None:
+    start = time.perf_counter()
+    for i in range(n):
+        fn(i)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<30} {n / elapsed:>10.0f}/s  {elapsed / n * 1e6:>9.1f}us each")
+
+
+def bench_before(outstanding: int, requests: int) -> None:
+    state = MemoryState()
+    for i in range(outstanding):
+        state.set("siwe_nonces", _address(i), secrets.token_hex(8), 300)
+    print(f"before: shared-state dict + purge per request, {outstanding} outstanding")
+
+    def issue(i: int) -> None:
+        state.purge()
+        state.set("siwe_nonces", _address(outstanding + i), secrets.token_hex(8), 300)
+
+    _rate("issue", requests, issue)
+
+
+def bench_memory(outstanding: int, requests: int) -> None:
+    store = MemoryNonces(ttl=300, max_total=outstanding * 2)
+    tracemalloc.start()
+    for i in range(outstanding):
+        store.issue(_address(i))
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"memory store: {outstanding} outstanding, {size / outstanding:.0f} bytes each")
+    issued = [store.issue(_address(outstanding + i)) for i in range(requests)]
+    _rate("issue", requests, lambda i: store.issue(_address(2 * outstanding + i)))
+    _rate("pending", requests, lambda i: store.pending(_address(outstanding + i)))
+    _rate("consume", requests, lambda i: store.consume(_address(outstanding + i), issued[i]))
+
+
+def bench_bounds(outstanding: int) -> None:
+    cap = outstanding // 10
+    store = MemoryNonces(ttl=300, per_address=5, max_total=cap)
+    for i in range(outstanding):
+        store.issue(_address(i))
+    for _ in range(20):
+        store.issue(_address(0))
+    print(f"bounds: {outstanding} issued with max_total={cap}: {store.outstanding()} outstanding, "
+          f"{len(store.pending(_address(0)))} pending for an address asked 20 times")
+
+    ttl = 10.0
+    store = MemoryNonces(ttl=ttl, max_total=outstanding * 2)
+    for i in range(outstanding):
+        store.issue(_address(i))
+    time.sleep(ttl + 0.1)  # until the last one has expired
+    left = store.outstanding()
+    start = time.perf_counter()
+    issues = 0
+    while store.outstanding() > issues:
+        store.issue(_address(outstanding + issues))
+        issues += 1
+    elapsed = time.perf_counter() - start
+    print(f"expiry: {left} expired nonces drained by {issues} issues ({elapsed / issues * 1e6:.1f}us each)")
+
+
+def bench_sqlite(outstanding: int, requests: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SqliteNonces(SqliteState(Path(tmp) / "state.db"), ttl=300, max_total=outstanding * 2)
+        expires_at = time.time() + 300
+        with store.state.transaction() as conn:
+            conn.executemany(
+                "INSERT INTO nonces VALUES (?, ?, ?)",
+                ((_address(i), secrets.token_hex(8), expires_at) for i in range(outstanding)),
+            )
+            conn.execute("UPDATE nonce_count SET n = ? WHERE id = 0", (outstanding,))
+        print(f"sqlite store: {outstanding} outstanding")
+        issued = [store.issue(_address(outstanding + i)) for i in range(requests)]
+        _rate("issue", requests, lambda i: store.issue(_address(2 * outstanding + i)))
+        _rate("pending", requests, lambda i: store.pending(_address(outstanding + i)))
+        _rate("consume", requests, lambda i: store.consume(_address(outstanding + i), issued[i]))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--outstanding", type=int, default=1_000_000)
+    parser.add_argument("--requests", type=int, default=10_000)
+    parser.add_argument("--before-requests", type=int, default=20, help="the old store scans everything; keep small")
+    parser.add_argument("--sqlite", action="store_true")
+    args = parser.parse_args()
+
+    bench_before(args.outstanding, args.before_requests)
+    bench_memory(args.outstanding, args.requests)
+    bench_bounds(args.outstanding)
+    if args.sqlite:
+        bench_sqlite(args.outstanding, args.requests)
+    print({k: v for k, v in metrics.snapshot()["counters"].items() if k.startswith("nonces.")})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""RPC round trips and latency of oracle reads: uncached versus cached + coalesced.
+
+Many threads (standing in for concurrent oracle-status / check-oracle
+requests) read the same feeds against a local stub RPC with injected latency.
+The stub counts the eth_calls it receives.
+
+Run from the backend directory:
+    python -m benchmarks.bench_oracle --threads 32 --reads 20 --delay 0.05
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from tests.stub_rpc import StubRpc
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--reads", type=int, default=20, help="reads per thread")
+    parser.add_argument("--delay", type=float, default=0.05, help="stub RPC latency in seconds")
+    args = parser.parse_args()
+
+    with StubRpc(delay=args.delay) as rpc:
+        os.environ["WEB3_PROVIDER_URL"] = rpc.url
+        from app.services import oracle
+
+        # Only the stub: a failed read must not fall through to the public mainnet RPCs.
+        fallbacks, oracle.FALLBACK_RPCS = oracle.FALLBACK_RPCS, []
+        feeds = list(oracle.CHAINLINK_FEEDS)
+        expected = {feed: oracle._fetch_chainlink_price(feed) for feed in feeds}
+
+        def run(read) -> tuple[float, int]:
+            rpc.calls.clear()
+
+            def worker(i: int) -> None:
+                for j in range(args.reads):
+                    feed = feeds[(i + j) % len(feeds)]
+                    assert read(feed) == expected[feed]
+
+            start = time.perf_counter()
+            with ThreadPoolExecutor(args.threads) as pool:
+                list(pool.map(worker, range(args.threads)))
+            return time.perf_counter() - start, rpc.calls["eth_call"]
+
+        oracle.clear_cache()
+        uncached, uncached_calls = run(oracle._fetch_chainlink_price)
+        oracle.clear_cache()
+        cached, cached_calls = run(oracle.get_chainlink_price)
+        oracle.FALLBACK_RPCS = fallbacks
+
+    total = args.threads * args.reads
+    print(f"{total} reads of {len(feeds)} feeds from {args.threads} threads, {args.delay * 1000:.0f} ms RPC latency")
+    print(f"  per-read fetch     {uncached:8.2f} s  {uncached_calls:6d} eth_calls")
+    print(f"  cached, coalesced  {cached:8.2f} s  {cached_calls:6d} eth_calls")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Evaluating many oracle claims: one fetch per claim versus one batched snapshot.
+
+Claims are spread over the feeds in CHAINLINK_FEEDS (most on ETH/USD, as in
+practice). The per-claim path reads each claim's feed on its own, as
+check-oracle does without a cache. The snapshot path reads every feed in a
+single JSON-RPC batch and evaluates all claims against it. A local stub RPC
+with injected latency counts the HTTP round trips.
+
+Run from the backend directory:
+    python -m benchmarks.bench_oracle_batch --claims 300 --delay 0.02
+"""
+import argparse
+import asyncio
+import os
+import random
+import time
+
+from tests.stub_rpc import StubRpc
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--claims", type=int, default=300)
+    parser.add_argument("--delay", type=float, default=0.02, help="stub RPC latency in seconds")
+    args = parser.parse_args()
+
+    from app.models.schemas import Claim
+    from app.services import oracle
+
+    rng = random.Random(0)
+    feeds = list(oracle.CHAINLINK_FEEDS)
+    claims = [
+        Claim(
+            id=f"claim-{i}",
+            title=f"Claim {i}",
+            description="Synthetic benchmark claim",
+            category="crypto",
+            created_by="bench",
+            resolution_type="oracle",
+            oracle_config={
+                "type": "chainlink_price",
+                "feed": "ETH/USD" if rng.random() < 0.8 else rng.choice(feeds),
+                "comparator": rng.choice((">", ">=", "<", "<=")),
+                "target": float(rng.randrange(10, 80_000)),
+            },
+        )
+        for i in range(args.claims)
+    ]
+
+    with StubRpc(delay=args.delay) as rpc:
+        os.environ["WEB3_PROVIDER_URL"] = rpc.url
+        oracle.FALLBACK_RPCS = []
+        client = oracle.get_client()
+
+        async def per_claim() -> dict[str, bool]:
+            outcomes = {}
+            for claim in claims:
+                config = claim.oracle_config
+                value, _ = await client.read_feed(rpc.url, oracle.CHAINLINK_FEEDS[config["feed"]])
+                outcomes[claim.id] = oracle.evaluate_condition(value, config["comparator"], config["target"])
+            return outcomes
+
+        async def snapshot() -> dict[str, bool]:
+            oracle.clear_cache()
+            prices = await oracle.get_price_snapshot()
+            return oracle.evaluate_claims(claims, prices)
+
+        async def run():
+            await client.read_feeds(rpc.url, list(oracle.CHAINLINK_FEEDS.values()))  # warm decimals
+            results = []
+            for fn in (per_claim, snapshot):
+                rpc.calls.clear()
+                start = time.perf_counter()
+                outcome = await fn()
+                results.append((outcome, time.perf_counter() - start, rpc.calls["http"], rpc.calls["eth_call"]))
+            await client.close()
+            return results
+
+        (old, old_t, old_http, old_calls), (new, new_t, new_http, new_calls) = asyncio.run(run())
+
+    assert old == new, "snapshot evaluation disagrees with per-claim reads"
+    print(f"{args.claims} oracle claims over {len(feeds)} feeds, {args.delay * 1000:.0f} ms RPC latency")
+    print(f"  per-claim reads   {old_t * 1000:9.1f} ms  {old_http:5d} round trips  {old_calls:5d} eth_calls")
+    print(f"  batched snapshot  {new_t * 1000:9.1f} ms  {new_http:5d} round trips  {new_calls:5d} eth_calls")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Oracle read latency: sequential fallback versus the hedged async client.
+
+Three local stub RPCs stand in for FALLBACK_RPCS: the first configured one is
+slow, the second fails every request, and the third is fast. Sequential
+fallback pays the slow provider's latency on every read. The hedged client
+races the next provider after ORACLE_HEDGE_DELAY, then learns from its
+health scores to go straight to the fast one.
+
+Run from the backend directory:
+    python -m benchmarks.bench_oracle_hedging --reads 50 --slow 1.0 --hedge 0.1
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from tests.stub_rpc import StubRpc
+
+
+def _summary(samples: list[float]) -> str:
+    samples = sorted(samples)
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    return f"p50 {statistics.median(samples) * 1000:7.1f} ms   p99 {p99 * 1000:7.1f} ms"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--reads", type=int, default=50)
+    parser.add_argument("--slow", type=float, default=1.0, help="slow provider latency (s)")
+    parser.add_argument("--fast", type=float, default=0.02, help="fast provider latency (s)")
+    parser.add_argument("--hedge", type=float, default=0.1, help="hedge delay (s)")
+    args = parser.parse_args()
+
+    from app.services import oracle
+    from app.services.oracle_client import AsyncOracleClient
+
+    feed = "ETH/USD"
+    address = oracle.CHAINLINK_FEEDS[feed]
+
+    with StubRpc(delay=args.slow) as slow, StubRpc(fail=True) as broken, StubRpc(delay=args.fast) as fast:
+        urls = [slow.url, broken.url, fast.url]
+
+        oracle.FALLBACK_RPCS = urls
+        sequential = []
+        for _ in range(args.reads):
+            start = time.perf_counter()
+            oracle._fetch_chainlink_price(feed)
+            sequential.append(time.perf_counter() - start)
+
+        async def hedged_reads() -> tuple[list[float], AsyncOracleClient]:
+            client = AsyncOracleClient(urls, hedge_delay=args.hedge, timeout=10)
+            samples = []
+            try:
+                for _ in range(args.reads):
+                    start = time.perf_counter()
+                    await client.hedged(client.read_feed, address)
+                    samples.append(time.perf_counter() - start)
+            finally:
+                await client.close()
+            return samples, client
+
+        hedged, client = asyncio.run(hedged_reads())
+
+    names = {slow.url: "slow", broken.url: "failing", fast.url: "fast"}
+    print(f"{args.reads} reads; providers: slow {args.slow * 1000:.0f} ms, failing, fast {args.fast * 1000:.0f} ms")
+    print(f"  sequential fallback   {_summary(sequential)}")
+    print(f"  hedged async client   {_summary(hedged)}")
+    print("  health (best first):")
+    for url in client.ranked():
+        h = client.health[url]
+        print(f"    {names[url]:8s} latency {h.latency * 1000:7.1f} ms  error rate {h.error_rate:.2f}"
+              f"  ({h.requests} requests, {h.errors} errors)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Loading positions as pydantic models versus PositionRecord NamedTuples.
+
+Both sides build the same positions from data.json-shaped dicts, as the JSON
+store does on load. Reports CPU time and the memory retained by the built
+list (tracemalloc), then times one pass of the odds aggregation over each.
+
+Run from the backend directory:
+    python -m benchmarks.bench_records --positions 100000
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+
+from tests.helpers import make_dataset
+
+
+def _load(build, rows: list[dict]) -> tuple[float, int, list]:
+    gc.collect()
+    tracemalloc.start()
+    start = time.process_time()
+    objects = [build(r) for r in rows]
+    elapsed = time.process_time() - start
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, retained, objects
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--positions", type=int, default=100_000)
+    args = parser.parse_args()
+
+    from app.models.records import PositionRecord
+    from app.models.schemas import Position
+    from app.services import odds
+
+    rows = make_dataset(500, 1000, args.positions)["positions"]
+
+    print(f"{args.positions} positions loaded from dicts")
+    print(f"  {'':22s}{'CPU':>10s} {'memory':>10s} {'per row':>9s} {'odds pass':>10s}")
+    results = []
+    for name, build in (("pydantic Position", lambda r: Position(**r)),
+                        ("PositionRecord", PositionRecord.from_dict)):
+        cpu, retained, objects = _load(build, rows)
+        start = time.process_time()
+        results.append(odds.accumulate_totals(objects))
+        scan = time.process_time() - start
+        print(f"  {name:22s}{cpu * 1000:8.0f}ms {retained / 2**20:8.1f}MB "
+              f"{retained / len(objects):7.0f} B {scan * 1000:8.0f}ms")
+        del objects
+    assert results[0] == results[1], "aggregates differ between representations"
+
+
+if __name__ == "__main__":
+    main()
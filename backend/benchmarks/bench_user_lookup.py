@@ -0,0 +1,129 @@
+"""User lookups through the stores' indexes versus the old linear scan.
+
+Builds a store of ``--users`` users plus awkward cases (0x usernames in mixed
+case, a username equal to another user's wallet, wallets shared between users
+or changed by an update), checks that ``get_user`` and ``get_user_by_wallet``
+return exactly what the scan returns for every case and a sample of ordinary
+ones, then times both. The JSON store is checked live and again after
+reloading, so log replay is covered too. Exits non-zero on a mismatch.
+
+Run from the backend directory:
+    python -m benchmarks.bench_user_lookup --users 100000
+"""
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from app.models.schemas import User
+from app.services.json_store import JsonStore
+from app.services.sqlite_store import SqliteStore
+from tests.helpers import make_dataset, scan_user, scan_wallet, write_dataset
+
+
+def _user(username: str, wallet: str | None) -> dict:
+    return {
+        "username": username, "display_name": username, "wallet_address": wallet,
+        "points": 1000.0, "created_at": "2025-01-01T00:00:00+00:00",
+    }
+
+
+def _dataset(n: int) -> dict:
+    data = make_dataset(n, 1, 0)
+    data["users"] += [
+        _user("0xAbCdEf0000000000000000000000000000000001", None),
+        _user("0xabcdef0000000000000000000000000000000001", "0xFEED000000000000000000000000000000000001"),
+        _user("mixed", "0xfeed000000000000000000000000000000000001"),   # same wallet, other case
+        _user(f"0x{5:040X}", None),                                     # username = user5's wallet
+        _user("walletless", None),
+        _user("mover", "0xBEEF000000000000000000000000000000000001"),
+    ]
+    return data
+
+
+def _changes(store) -> None:
+    """Writes that move index entries: a new user, and wallets changed and taken over."""
+    store.add_user(User(**_user("late", "0xbeef000000000000000000000000000000000001")))
+    mover = store.get_user("mover")
+    store.update_user(mover.model_copy(update={"wallet_address": "0xC0FFEE0000000000000000000000000000000001"}))
+    user3 = store.get_user("user3")
+    store.update_user(user3.model_copy(update={"wallet_address": f"0x{7:040X}"}))
+
+
+def _queries(users: list[User], rng: random.Random) -> list[str]:
+    names = [u.username for u in users]
+    wallets = [u.wallet_address for u in users if u.wallet_address]
+    queries = names[-10:] + wallets[-10:] + [
+        "user3", f"0x{3:040x}", f"0x{7:040x}", f"0x{5:040x}", f"0x{5:040X}",
+        "0xabcdef0000000000000000000000000000000001", "0xABCDEF0000000000000000000000000000000001",
+        "0xfeed000000000000000000000000000000000001", "0xBEEF000000000000000000000000000000000001",
+        "0xc0ffee0000000000000000000000000000000001", "MIXED", "nobody", "0xnobody", "0x",
+    ]
+    for _ in range(200):
+        queries.append(rng.choice(names))
+        wallet = rng.choice(wallets)
+        queries.append(wallet.upper().replace("0X", "0x") if rng.random() < 0.5 else wallet)
+    return queries
+
+
+def _check(label: str, store, queries: list[str]) -> bool:
+    users = store.get_all_users()
+    bad = 0
+    for q in queries:
+        for name, indexed, scanned in (
+            ("get_user", store.get_user(q), scan_user(users, q)),
+            ("get_user_by_wallet", store.get_user_by_wallet(q), scan_wallet(users, q)),
+        ):
+            if indexed != scanned:
+                bad += 1
+                print(f"  MISMATCH {label} {name}({q!r}): {indexed and indexed.username} "
+                      f"!= {scanned and scanned.username}")
+    print(f"{label}: {len(queries)} queries, {'all match the scan' if not bad else f'{bad} mismatches'}")
+    return not bad
+
+
+def _time(label: str, fn, queries: list[str]) -> None:
+    start = time.perf_counter()
+    for q in queries:
+        fn(q)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<28} {elapsed / len(queries) * 1e6:>10.1f}us per lookup")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=100_000)
+    args = parser.parse_args()
+    rng = random.Random(0)
+    ok = True
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data = _dataset(args.users)
+        write_dataset(Path(tmp) / "data.json", data)
+        json_store = JsonStore(Path(tmp) / "data.json")
+        sqlite_store = SqliteStore(Path(tmp) / "data.db")
+        sqlite_store.import_data(data)
+        for store in (json_store, sqlite_store):
+            _changes(store)
+        queries = _queries(json_store.get_all_users(), rng)
+
+        ok &= _check("json", json_store, queries)
+        ok &= _check("json (reloaded from log)", JsonStore(Path(tmp) / "data.json"), queries)
+        ok &= _check("sqlite", sqlite_store, queries)
+
+        users = json_store.get_all_users()
+        sample = [rng.choice(users).wallet_address.upper().replace("0X", "0x") for _ in range(200)]
+        print(f"{len(users)} users, 0x lookups that match a wallet:")
+        _time("linear scan", lambda q: scan_user(users, q), sample[:20])
+        _time("json index", json_store.get_user, sample)
+        _time("sqlite indexes", sqlite_store.get_user, sample)
+        _time("json get_user_by_wallet", json_store.get_user_by_wallet, sample)
+
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""Latency under many concurrent keep-alive clients, for before/after comparisons.
+
+Starts one uvicorn worker on a synthetic store and runs ``--clients``
+connections that each loop: send a request, wait for the reply, think for
+about ``--think`` seconds. Requests are a mix of single-claim and single-user
+reads and stakes (``--write-share``). With ``--contend`` a second process
+holds the JSON store's write lock for ``--hold-ms`` out of every
+``--every-ms``, standing in for another worker's slow write or compaction;
+writes in this worker then queue on the lock, and the question is whether
+reads queue behind them.
+
+``--app-dir`` points the server at another checkout, so the same load can be
+run against an older tree:
+    git worktree add /tmp/before <commit>
+    python -m benchmarks.load_http --contend --app-dir /tmp/before/backend
+    python -m benchmarks.load_http --contend
+
+Run from the backend directory. Client and server share the machine, so on a
+small box absolute numbers are pessimistic; compare runs with each other.
+"""
+import argparse
+import asyncio
+import fcntl
+import json
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from tests.helpers import make_dataset, write_dataset
+
+HOST = "127.0.0.1"
+USERS = 200
+CLAIMS = 50
+POSITIONS = 5_000
+
+
+async def _connect(port: int) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    return await asyncio.open_connection(HOST, port)
+
+
+async def _request(reader, writer, method: str, path: str, body: dict | None = None) -> int:
+    payload = json.dumps(body).encode() if body is not None else b""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: {HOST}\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {len(payload)}\r\n\r\n".encode() + payload
+    )
+    head = await reader.readuntil(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1])
+    length = 0
+    for line in head.split(b"\r\n"):
+        if line.lower().startswith(b"content-length:"):
+            length = int(line.split(b":", 1)[1])
+    await reader.readexactly(length)
+    return status
+
+
+async def _client(port: int, seed: int, args, deadline: float, samples: dict[str, list[float]],
+                  errors: list[int]) -> None:
+    rng = random.Random(seed)
+    reader, writer = await _connect(port)
+    # Spread the first requests over one think period.
+    await asyncio.sleep(rng.uniform(0, args.think))
+    while time.perf_counter() < deadline:
+        if rng.random() < args.write_share:
+            kind, method, path = "write", "POST", "/api/positions/"
+            body = {
+                "claim_id": f"claim-{rng.randrange(CLAIMS)}", "username": f"user{rng.randrange(USERS)}",
+                "side": rng.choice(("yes", "no")), "stake": 1, "confidence": 0.75,
+            }
+        elif rng.random() < 0.5:
+            kind, method, path, body = "claim", "GET", f"/api/claims/claim-{rng.randrange(CLAIMS)}", None
+        else:
+            kind, method, path, body = "user", "GET", f"/api/users/user{rng.randrange(USERS)}", None
+        start = time.perf_counter()
+        try:
+            status = await _request(reader, writer, method, path, body)
+        except (OSError, asyncio.IncompleteReadError):
+            errors.append(0)
+            writer.close()
+            reader, writer = await _connect(port)
+            continue
+        samples[kind].append(time.perf_counter() - start)
+        if status >= 500 or (kind != "write" and status != 200):
+            errors.append(status)
+        await asyncio.sleep(rng.uniform(0.5, 1.5) * args.think)
+    writer.close()
+
+
+def _hold_lock(lock_path: str, hold: float, every: float) -> None:
+    with open(lock_path, "a") as f:
+        while True:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            time.sleep(hold)
+            fcntl.flock(f, fcntl.LOCK_UN)
+            time.sleep(max(0.0, every - hold))
+
+
+def _percentile(values: list[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] if values else float("nan")
+
+
+async def _run(port: int, args) -> None:
+    samples: dict[str, list[float]] = {"claim": [], "user": [], "write": []}
+    errors: list[int] = []
+    start = time.perf_counter()
+    deadline = start + args.duration
+    clients = [_client(port, i, args, deadline, samples, errors) for i in range(args.clients)]
+    await asyncio.gather(*clients)
+    elapsed = time.perf_counter() - start
+    total = sum(len(v) for v in samples.values())
+    print(f"clients={args.clients} requests={total} ({total / elapsed:.0f}/s) errors={len(errors)}")
+    for kind, values in samples.items():
+        print(f"  {kind:<5} n={len(values):>6} p50={_percentile(values, 0.5) * 1000:8.1f}ms "
+              f"p99={_percentile(values, 0.99) * 1000:8.1f}ms max={max(values, default=0) * 1000:8.1f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--think", type=float, default=2.0, help="mean seconds between a client's requests")
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--write-share", type=float, default=0.1)
+    parser.add_argument("--contend", action="store_true", help="hold the JSON write lock from another process")
+    parser.add_argument("--hold-ms", type=float, default=200)
+    parser.add_argument("--every-ms", type=float, default=400)
+    parser.add_argument("--app-dir", default=str(Path(__file__).resolve().parent.parent))
+    parser.add_argument("--port", type=int, default=8798)
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    data_path = Path(tmp.name) / "data.json"
+    data = make_dataset(USERS, CLAIMS, POSITIONS)
+    for claim in data["claims"]:
+        claim["status"] = "active"
+    for user in data["users"]:
+        user["points"] = 1_000_000.0
+    write_dataset(data_path, data)
+    env = dict(os.environ, DATA_PATH=str(data_path), SQLITE_PATH=str(Path(tmp.name) / "data.db"),
+               ORACLE_SCHEDULER="0", COMPACT_INTERVAL="0")
+    if env.get("STORAGE_BACKEND") == "sqlite":
+        subprocess.run([sys.executable, "-m", "app.cli", "migrate"], cwd=args.app_dir, env=env,
+                       check=True, capture_output=True)
+
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", HOST, "--port", str(args.port),
+         "--log-level", "warning", "--backlog", "8192", "--app-dir", args.app_dir],
+        cwd=args.app_dir,
+        env=env,
+    )
+    holder = None
+    try:
+        for _ in range(100):
+            try:
+                async def health() -> int:
+                    reader, writer = await _connect(args.port)
+                    status = await _request(reader, writer, "GET", "/api/health")
+                    writer.close()
+                    return status
+                if asyncio.run(health()) == 200:
+                    break
+            except OSError:
+                time.sleep(0.1)
+        if args.contend:
+            holder = multiprocessing.Process(
+                target=_hold_lock,
+                args=(str(data_path) + ".lock", args.hold_ms / 1000, args.every_ms / 1000),
+                daemon=True,
+            )
+            holder.start()
+        print(f"app={args.app_dir} backend={env.get('STORAGE_BACKEND', 'json')} think={args.think}s "
+              f"writes={args.write_share:.0%} contend={'%g/%gms' % (args.hold_ms, args.every_ms) if args.contend else 'no'}")
+        asyncio.run(_run(args.port, args))
+    finally:
+        if holder is not None:
+            holder.terminate()
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""How many odds-stream subscribers one worker can serve.
+
+Starts one uvicorn worker on a synthetic store, opens N subscribers to
+``GET /api/claims/stream`` (every claim) over raw sockets, then stakes on one
+claim at a steady rate and measures, per delivered frame, the time from the
+stake being sent to the frame reaching a subscriber. Coalescing means a
+subscriber sees roughly one frame per ``STREAM_COALESCE_MS`` rather than one
+per stake, so latency includes up to one coalescing window by design.
+
+The client runs in this process on the same machine, so on a small box it
+competes with the server for CPU; treat the numbers as a lower bound.
+
+Run from the backend directory:
+    python -m benchmarks.load_stream --subscribers 100 1000 5000
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from tests.helpers import make_dataset, write_dataset
+
+HOST = "127.0.0.1"
+USERS = 50
+CLAIMS = 20
+HOT_CLAIM = "claim-0"
+
+
+async def _http(port: int, method: str, path: str, body: dict | None = None) -> tuple[int, bytes]:
+    reader, writer = await asyncio.open_connection(HOST, port)
+    payload = json.dumps(body).encode() if body is not None else b""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: {HOST}\r\nConnection: close\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {len(payload)}\r\n\r\n".encode() + payload
+    )
+    data = await reader.read()
+    writer.close()
+    status = int(data.split(b" ", 2)[1])
+    return status, data.split(b"\r\n\r\n", 1)[1]
+
+
+class _Subscriber:
+    def __init__(self):
+        self.latencies: list[float] = []
+
+    async def connect(self, port: int) -> None:
+        self.reader, self.writer = await asyncio.open_connection(HOST, port, limit=1 << 20)
+        self.writer.write(f"GET /api/claims/stream HTTP/1.1\r\nHost: {HOST}\r\n\r\n".encode())
+        await self.reader.readuntil(b"\r\n\r\n")
+        await self.reader.readuntil(b"\n\n")  # the ": connected" comment
+
+    async def listen(self, sent_at: dict[int, float]) -> None:
+        # Chunked transfer framing lines are skipped; only "data:" lines matter.
+        while True:
+            line = await self.reader.readline()
+            if not line:
+                return
+            if line.startswith(b"data: "):
+                event = json.loads(line[6:])
+                if event["claim_id"] == HOT_CLAIM and event["position_count"] in sent_at:
+                    self.latencies.append(time.perf_counter() - sent_at[event["position_count"]])
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+def _rss_mb(pid: int) -> float:
+    for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+        if line.startswith("VmRSS:"):
+            return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+def _percentile(values: list[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] if values else float("nan")
+
+
+async def _run(port: int, pid: int, subscribers: int, rate: float, duration: float, staked: int) -> int:
+    subs = [_Subscriber() for _ in range(subscribers)]
+    start = time.perf_counter()
+    for i in range(0, subscribers, 200):
+        await asyncio.gather(*(s.connect(port) for s in subs[i:i + 200]))
+    connect_s = time.perf_counter() - start
+
+    sent_at: dict[int, float] = {}
+    listeners = [asyncio.create_task(s.listen(sent_at)) for s in subs]
+    stakes = int(rate * duration)
+    for i in range(stakes):
+        staked += 1
+        sent_at[staked] = time.perf_counter()
+        status, body = await _http(port, "POST", "/api/positions/", {
+            "claim_id": HOT_CLAIM, "username": f"user{i % USERS}",
+            "side": "yes" if i % 3 else "no", "stake": 1, "confidence": 0.75,
+        })
+        assert status == 201, body
+        await asyncio.sleep(1 / rate)
+    await asyncio.sleep(2)  # let the last window flush and drain
+
+    rss = _rss_mb(pid)
+    for t in listeners:
+        t.cancel()
+    for s in subs:
+        s.close()
+    latencies = [x for s in subs for x in s.latencies]
+    starved = sum(not s.latencies for s in subs)
+    print(f"subscribers={subscribers:>6} connect={connect_s:6.2f}s stakes={stakes} "
+          f"frames={len(latencies):>7} ({len(latencies) / max(subscribers, 1):.1f}/sub, starved={starved}) "
+          f"latency p50={_percentile(latencies, 0.5) * 1000:6.0f}ms "
+          f"p99={_percentile(latencies, 0.99) * 1000:6.0f}ms max={max(latencies, default=0) * 1000:6.0f}ms "
+          f"server_rss={rss:.0f}MB")
+    return staked
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--subscribers", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--rate", type=float, default=20.0, help="stakes per second")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds of stakes per run")
+    parser.add_argument("--port", type=int, default=8799)
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    data_path = Path(tmp.name) / "data.json"
+    data = make_dataset(USERS, CLAIMS, 0)
+    for claim in data["claims"]:
+        claim["status"] = "active"
+    for user in data["users"]:
+        user["points"] = 1_000_000.0
+    write_dataset(data_path, data)
+    env = dict(os.environ, DATA_PATH=str(data_path), SQLITE_PATH=str(Path(tmp.name) / "data.db"),
+               ORACLE_SCHEDULER="0")
+    if env.get("STORAGE_BACKEND") == "sqlite":
+        subprocess.run([sys.executable, "-m", "app.cli", "migrate"], env=env, check=True, capture_output=True)
+
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", HOST, "--port", str(args.port),
+         "--log-level", "warning", "--backlog", "8192"],
+        env=env,
+    )
+    try:
+        for _ in range(100):
+            try:
+                if asyncio.run(_http(args.port, "GET", "/api/health"))[0] == 200:
+                    break
+            except OSError:
+                time.sleep(0.1)
+        print(f"backend={env.get('STORAGE_BACKEND', 'json')} rate={args.rate}/s "
+              f"duration={args.duration}s coalesce={env.get('STREAM_COALESCE_MS', '250')}ms")
+        staked = 0
+        for n in args.subscribers:
+            staked = asyncio.run(_run(args.port, server.pid, n, args.rate, args.duration, staked))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
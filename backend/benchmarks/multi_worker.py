@@ -0,0 +1,163 @@
+"""Run the API with several uvicorn workers and check that they agree.
+
+Starts ``uvicorn --workers N`` on a synthetic store and, over fresh
+connections (so requests spread across workers):
+
+1. signs in with new wallets: nonce from one request, SIWE signature checked
+   by another. Needs ``SHARED_STATE=sqlite``; with ``memory`` most logins fail
+   whenever the two requests reach different workers. Replaying a used
+   message must fail either way.
+2. places stakes concurrently and checks that points are conserved.
+3. reads a claim repeatedly and checks every worker reports the same odds.
+
+Exits non-zero if a check fails. Run from the backend directory:
+    python -m benchmarks.multi_worker --workers 4
+    SHARED_STATE=memory python -m benchmarks.multi_worker   # logins break
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+from eth_account import Account
+from eth_account.messages import encode_defunct
+from siwe import SiweMessage
+
+from tests.helpers import make_dataset, write_dataset
+
+HOST = "127.0.0.1"
+USERS = 20
+CLAIMS = 5
+START_POINTS = 1000.0
+
+
+def _call(base: str, method: str, path: str, body: dict | None = None) -> tuple[int, dict | list | None]:
+    data = json.dumps(body).encode() if body is not None else None
+    request = urllib.request.Request(base + path, data, {"Content-Type": "application/json"}, method=method)
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            return response.status, json.loads(response.read() or "null")
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read() or "null")
+
+
+def _login(base: str) -> tuple[bool, bool]:
+    """(signed in, replay rejected) for a new wallet."""
+    account = Account.create()
+    _, body = _call(base, "GET", f"/api/auth/nonce?address={account.address}")
+    message = SiweMessage(
+        domain="localhost",
+        address=account.address,
+        uri="http://localhost",
+        version="1",
+        chain_id=1,
+        nonce=body["nonce"],
+        issued_at=datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+    ).prepare_message()
+    signature = Account.sign_message(encode_defunct(text=message), account.key).signature.hex()
+    payload = {"message": message, "signature": signature if signature.startswith("0x") else "0x" + signature}
+    status, _ = _call(base, "POST", "/api/auth/connect-wallet", payload)
+    replay, _ = _call(base, "POST", "/api/auth/connect-wallet", payload)
+    return status == 200, replay == 400
+
+
+def _stake(base: str, i: int) -> bool:
+    status, _ = _call(base, "POST", "/api/positions/", {
+        "claim_id": f"claim-{i % CLAIMS}", "username": f"user{i % USERS}",
+        "side": "yes" if i % 3 else "no", "stake": float(1 + i % 7), "confidence": 0.75,
+    })
+    return status == 201
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--stakes", type=int, default=400)
+    parser.add_argument("--port", type=int, default=8797)
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    data_path = Path(tmp.name) / "data.json"
+    data = make_dataset(USERS, CLAIMS, 0)
+    for claim in data["claims"]:
+        claim["status"] = "active"
+    write_dataset(data_path, data)
+    env = dict(
+        os.environ,
+        DATA_PATH=str(data_path),
+        SQLITE_PATH=str(Path(tmp.name) / "data.db"),
+        SHARED_STATE_PATH=str(Path(tmp.name) / "state.db"),
+        ORACLE_SCHEDULER="0",
+    )
+    env.setdefault("SHARED_STATE", "sqlite")
+    if env.get("STORAGE_BACKEND") == "sqlite":
+        subprocess.run([sys.executable, "-m", "app.cli", "migrate"], env=env, check=True, capture_output=True)
+
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", HOST, "--port", str(args.port),
+         "--workers", str(args.workers), "--log-level", "warning"],
+        env=env,
+    )
+    base = f"http://{HOST}:{args.port}"
+    failures = []
+    try:
+        for _ in range(200):
+            try:
+                if _call(base, "GET", "/api/health")[0] == 200:
+                    break
+            except OSError:
+                time.sleep(0.1)
+        time.sleep(1)  # let every worker finish starting
+        print(f"workers={args.workers} backend={env.get('STORAGE_BACKEND', 'json')} "
+              f"shared_state={env['SHARED_STATE']}")
+
+        with ThreadPoolExecutor(8) as pool:
+            logins = list(pool.map(lambda _: _login(base), range(args.logins)))
+        signed_in = sum(ok for ok, _ in logins)
+        replays_rejected = sum(rejected for _, rejected in logins)
+        print(f"logins: {signed_in}/{args.logins} succeeded, {replays_rejected}/{args.logins} replays rejected")
+        if signed_in != args.logins:
+            failures.append("wallet logins failed across workers")
+        if replays_rejected != args.logins:
+            failures.append("a signed message was accepted twice")
+
+        with ThreadPoolExecutor(16) as pool:
+            placed = sum(pool.map(lambda i: _stake(base, i), range(args.stakes)))
+        _, users = _call(base, "GET", "/api/users/")
+        _, positions = _call(base, "GET", "/api/positions/")
+        balances = sum(u["points"] for u in users if u["username"].startswith("user"))
+        staked = sum(p["stake"] for p in positions)
+        print(f"stakes: {placed}/{args.stakes} accepted, {len(positions)} stored, "
+              f"balances+staked={balances + staked} expected={USERS * START_POINTS}")
+        if len(positions) != placed or balances + staked != USERS * START_POINTS:
+            failures.append("points or positions were lost across workers")
+
+        expected = sum(1 for p in positions if p["claim_id"] == "claim-0")
+        with ThreadPoolExecutor(8) as pool:
+            counts = set(pool.map(
+                lambda _: _call(base, "GET", "/api/claims/claim-0")[1]["position_count"], range(50)
+            ))
+        print(f"claim-0 position_count seen by 50 reads: {sorted(counts)} (expected {expected})")
+        if counts != {expected}:
+            failures.append("workers disagree about a claim's odds")
+    finally:
+        server.terminate()
+        server.wait()
+
+    if failures:
+        print("FAIL: " + "; ".join(failures))
+        sys.exit(1)
+    print("OK: workers share logins, points and odds")
+
+
+if __name__ == "__main__":
+    main()
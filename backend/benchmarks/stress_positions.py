@@ -0,0 +1,107 @@
+"""Fire thousands of concurrent stakes and check that points are conserved.
+
+Several processes (standing in for uvicorn workers) each run a thread pool
+of event loops that call the create_position route directly against one
+shared store. Afterwards every point must be accounted for:
+sum(balances) + sum(stakes) == starting points, no balance is negative, the
+number of stored positions equals the number of successful requests, and the
+per-claim odds totals match a recount.
+
+Run from the backend directory:
+    python -m benchmarks.stress_positions --processes 4 --threads 8 --stakes 50
+    STORAGE_BACKEND=sqlite python -m benchmarks.stress_positions
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from tests.helpers import make_dataset, write_dataset
+
+USERS = 20
+CLAIMS = 5
+START_POINTS = 1000.0
+
+
+def _worker(seed: int, threads: int, stakes: int) -> tuple[int, int]:
+    from fastapi import HTTPException
+    from app.models.schemas import CreatePositionRequest
+    from app.routers.positions import create_position
+
+    async def fire(thread_seed: int) -> tuple[int, int]:
+        rng = random.Random(thread_seed)
+        ok = rejected = 0
+        for _ in range(stakes):
+            req = CreatePositionRequest(
+                claim_id=f"claim-{rng.randrange(CLAIMS)}",
+                username=f"user{rng.randrange(USERS)}",
+                side=rng.choice(("yes", "no")),
+                stake=float(rng.randint(1, 10)),
+                confidence=0.75,
+            )
+            try:
+                await create_position(req)
+                ok += 1
+            except HTTPException:
+                rejected += 1
+        return ok, rejected
+
+    with ThreadPoolExecutor(threads) as pool:
+        results = list(pool.map(lambda s: asyncio.run(fire(s)), range(seed * 1000, seed * 1000 + threads)))
+    return sum(r[0] for r in results), sum(r[1] for r in results)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--stakes", type=int, default=50, help="stakes per thread")
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    data_path = Path(tmp.name) / "data.json"
+    data = make_dataset(USERS, CLAIMS, 0)
+    for claim in data["claims"]:
+        claim["status"] = "active"
+    write_dataset(data_path, data)
+    os.environ["DATA_PATH"] = str(data_path)
+    os.environ["SQLITE_PATH"] = str(Path(tmp.name) / "data.db")
+
+    from app.services import database
+
+    if database.STORAGE_BACKEND == "sqlite":
+        database.get_store().import_data(data)
+
+    ctx = multiprocessing.get_context("spawn")
+    start = time.perf_counter()
+    with ctx.Pool(args.processes) as pool:
+        results = pool.starmap(
+            _worker, [(i, args.threads, args.stakes) for i in range(args.processes)]
+        )
+    elapsed = time.perf_counter() - start
+
+    ok = sum(r[0] for r in results)
+    rejected = sum(r[1] for r in results)
+    users = database.get_all_users()
+    positions = database.get_all_positions()
+    balances = sum(u.points for u in users)
+    staked = sum(p.stake for p in positions)
+
+    print(f"backend={database.STORAGE_BACKEND} requests={ok + rejected} "
+          f"accepted={ok} rejected={rejected} in {elapsed:.1f}s ({(ok + rejected) / elapsed:.0f}/s)")
+    print(f"balances={balances} staked={staked} total={balances + staked} "
+          f"expected={USERS * START_POINTS}")
+    assert balances + staked == USERS * START_POINTS, "points were created or destroyed"
+    assert all(u.points >= 0 for u in users), "a balance went negative"
+    assert len(positions) == ok, f"{ok} accepted stakes but {len(positions)} positions stored"
+    assert not database.check_claim_stats(), "odds totals drifted from positions"
+    print("OK: points and positions conserved")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import os
+import tempfile
+
+import pytest
+
+from tests.helpers import make_dataset, write_dataset
+
+# Settings are read at import time: keep the app's stores and background tasks
+# away from the checkout before any test imports it.
+_tmp = tempfile.mkdtemp(prefix="predict-tests-")
+os.environ.setdefault("DATA_PATH", os.path.join(_tmp, "data.json"))
+os.environ.setdefault("SQLITE_PATH", os.path.join(_tmp, "data.db"))
+os.environ.setdefault("SHARED_STATE_PATH", os.path.join(_tmp, "state.db"))
+os.environ.setdefault("ORACLE_SCHEDULER", "0")
+os.environ.setdefault("COMPACT_INTERVAL", "0")
+
+USERS = 10
+CLAIMS = 3
+START_POINTS = 100.0
+
+
+@pytest.fixture
+def dataset() -> dict:
+    data = make_dataset(USERS, CLAIMS, 0)
+    for claim in data["claims"]:
+        claim["status"] = "active"
+    for user in data["users"]:
+        user["points"] = START_POINTS
+    return data
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def open_store(request, tmp_path, dataset):
+    """Open a store of each backend seeded with ``dataset``; every call is a new
+    handle on the same files, as another worker process would hold."""
+    from app.services.json_store import JsonStore
+    from app.services.sqlite_store import SqliteStore
+
+    if request.param == "json":
+        write_dataset(tmp_path / "data.json", dataset)
+        return lambda: JsonStore(tmp_path / "data.json")
+    SqliteStore(tmp_path / "data.db").import_data(dataset)
+    return lambda: SqliteStore(tmp_path / "data.db")
+
+
+@pytest.fixture
+def store(open_store):
+    return open_store()
+
+
+@pytest.fixture
+def app_store(monkeypatch, store):
+    """``store`` as the app's store, for tests going through the routes."""
+    from app.services import database, response_cache
+
+    monkeypatch.setattr(database, "_store", store)
+    response_cache.clear()
+    yield store
+    response_cache.clear()
@@ -0,0 +1,128 @@
+"""A local Ethereum JSON-RPC stand-in serving Chainlink aggregator reads.
+
+Answers ``eth_call`` for ``decimals()`` and ``latestRoundData()`` on every feed
+in ``oracle.CHAINLINK_FEEDS`` (single requests and JSON-RPC batches), counts the
+calls it receives, and can inject latency or failures so benchmarks can
+exercise caching, hedging and fallback without touching mainnet:
+
+    with StubRpc(delay=0.05) as rpc:
+        os.environ["WEB3_PROVIDER_URL"] = rpc.url
+        ...
+        print(rpc.calls)
+"""
+import json
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DECIMALS_SELECTOR = "0x313ce567"
+LATEST_ROUND_SELECTOR = "0xfeaf968c"
+
+# feed -> (answer, decimals); answers are scaled integers as on chain.
+DEFAULT_PRICES = {
+    "ETH/USD": (3_000_00000000, 8),
+    "BTC/USD": (60_000_00000000, 8),
+    "LINK/USD": (15_00000000, 8),
+}
+
+
+def _word(value: int) -> str:
+    return (value % (1 << 256)).to_bytes(32, "big").hex()
+
+
+class _Server(ThreadingHTTPServer):
+    # The default listen backlog of 5 resets connections under a few dozen concurrent clients.
+    request_queue_size = 1024
+    daemon_threads = True
+
+
+class StubRpc:
+    def __init__(self, prices: dict[str, tuple[int, int]] | None = None,
+                 delay: float = 0.0, fail: bool = False, updated_at: int = 1_700_000_000):
+        from app.services.oracle import CHAINLINK_FEEDS
+
+        prices = prices or DEFAULT_PRICES
+        self.feeds = {CHAINLINK_FEEDS[feed].lower(): value for feed, value in prices.items()}
+        self.delay = delay
+        self.fail = fail
+        self.updated_at = updated_at
+        # Counts per JSON-RPC method, plus "http" for HTTP requests received.
+        self.calls: Counter[str] = Counter()
+        self._lock = threading.Lock()
+        self._server = _Server(("127.0.0.1", 0), self._handler())
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "StubRpc":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _answer(self, request: dict) -> dict:
+        method = request.get("method")
+        with self._lock:
+            self.calls[method] += 1
+        reply = {"jsonrpc": "2.0", "id": request.get("id")}
+        if method == "eth_chainId":
+            reply["result"] = "0x1"
+        elif method == "eth_blockNumber":
+            reply["result"] = hex(20_000_000)
+        elif method == "eth_call":
+            call = request["params"][0]
+            feed = self.feeds.get(call.get("to", "").lower())
+            selector = (call.get("data") or call.get("input") or "")[:10]
+            if feed is None:
+                reply["result"] = "0x"
+            elif selector == DECIMALS_SELECTOR:
+                reply["result"] = "0x" + _word(feed[1])
+            elif selector == LATEST_ROUND_SELECTOR:
+                round_id = 1 << 64
+                reply["result"] = "0x" + "".join(
+                    _word(v) for v in (round_id, feed[0], self.updated_at, self.updated_at, round_id)
+                )
+            else:
+                reply["error"] = {"code": -32000, "message": "execution reverted"}
+        else:
+            reply["error"] = {"code": -32601, "message": f"method {method} not supported"}
+        return reply
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                with stub._lock:
+                    stub.calls["http"] += 1
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                if stub.delay:
+                    time.sleep(stub.delay)
+                if stub.fail:
+                    self.send_error(503)
+                    return
+                if isinstance(body, list):
+                    payload = [stub._answer(r) for r in body]
+                else:
+                    payload = stub._answer(body)
+                data = json.dumps(payload).encode()
+                try:
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # the client gave up, e.g. a hedged request that lost
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
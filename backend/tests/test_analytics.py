@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models.records import PositionRecord, new_id
+from tests.helpers import EPOCH, make_dataset, scan_analytics
+
+
+@pytest.fixture
+def dataset() -> dict:
+    data = make_dataset(10, 40, 300, seed=4)
+    for i, claim in enumerate(data["claims"]):
+        claim["created_at"] = (EPOCH + timedelta(days=i // 3)).isoformat()
+    for i, position in enumerate(data["positions"]):
+        position["created_at"] = (EPOCH + timedelta(hours=5 * i)).isoformat()
+        if i % 7 == 0:
+            position["stake"] += 0.25
+    return data
+
+
+def _in_range(record: dict, start: str | None, end: str | None) -> bool:
+    day = record["created_at"][:10]
+    return (start is None or day >= start) and (end is None or day <= end)
+
+
+def _expected(store, start: str | None = None, end: str | None = None) -> dict:
+    """The old full scan over the records created in [start, end]."""
+    data = store.export_data()
+    return scan_analytics({
+        "positions": [p for p in data["positions"] if _in_range(p, start, end)],
+        "claims": [c for c in data["claims"] if _in_range(c, start, end)],
+    })
+
+
+def _assert_same(report: dict, expected: dict) -> None:
+    assert report["history"] == expected["history"]
+    # Whole sums are ints again, as the old scan gave them for data.json's integer stakes.
+    assert all(isinstance(h["value"], int) == float(h["value"]).is_integer() for h in report["history"])
+    assert report["tvl"] == pytest.approx(expected["tvl"])
+    assert report["sentiment"] == expected["sentiment"]
+    assert report["top_categories"] == expected["top_categories"]
+
+
+@pytest.mark.parametrize("start, end", [
+    (None, None), ("2025-01-10", "2025-01-20"), ("2025-01-20", None), (None, "2025-01-03"),
+    ("2025-02-01", "2025-02-01"), ("2030-01-01", None),
+])
+def test_rollup_matches_full_scan(app_store, start, end):
+    client = TestClient(app)
+    params = {k: v for k, v in (("from", start), ("to", end)) if v}
+    _assert_same(client.get("/api/analytics", params=params).json(), _expected(app_store, start, end))
+
+    now = datetime.now(timezone.utc)
+    claim_id = next(c.id for c in app_store.get_all_claims() if c.status == "active")
+    for username, side, stake in (("user0", "yes", 12.0), ("user1", "no", 2.5)):
+        app_store.place_position(PositionRecord(new_id("pos"), claim_id, username, side, stake, 0.7, now))
+    _assert_same(client.get("/api/analytics", params=params).json(), _expected(app_store, start, end))
@@ -0,0 +1,42 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.services import async_db, database
+from app.services.json_store import JsonStore
+from tests.helpers import write_dataset
+
+
+@pytest.fixture
+def json_store(monkeypatch, tmp_path, dataset):
+    write_dataset(tmp_path / "data.json", dataset)
+    store = JsonStore(tmp_path / "data.json")
+    monkeypatch.setattr(database, "_store", store)
+    return store
+
+
+def _thread(*_) -> str:
+    return threading.current_thread().name
+
+
+def test_read_runs_on_a_reader_thread(json_store):
+    json_store.get_user("user0")  # snapshot cached
+    assert asyncio.run(async_db.read(_thread)).startswith("storage-read")
+
+
+def test_lookup_runs_inline_when_snapshot_is_current(json_store):
+    json_store.get_user("user0")
+    assert asyncio.run(async_db.lookup(_thread)) == threading.current_thread().name
+
+
+def test_lookup_leaves_log_replay_to_a_thread(json_store, tmp_path):
+    json_store.get_user("user0")
+    other = JsonStore(tmp_path / "data.json")
+    other.update_user(other.get_user("user0").model_copy(update={"display_name": "Renamed"}))
+    with json_store.memory_reads() as in_memory:
+        assert not in_memory
+    assert asyncio.run(async_db.lookup(_thread)).startswith("storage-read")
+    assert asyncio.run(async_db.lookup(database.get_user, "user0")).display_name == "Renamed"
+    with json_store.memory_reads() as in_memory:
+        assert in_memory
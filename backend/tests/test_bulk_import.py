@@ -0,0 +1,69 @@
+import asyncio
+import json
+
+import pytest
+
+from app.services import bulk_import
+from app.models.schemas import ImportPositionRow
+
+ROWS = [
+    {"claim_id": "claim-0", "username": "user0", "side": "yes", "stake": 60, "confidence": 0.7, "id": "p1"},
+    {"claim_id": "claim-0", "username": "user0", "side": "no", "stake": 50, "confidence": 0.7},
+    {"claim_id": "claim-1", "username": "user1", "side": "no", "stake": 10, "confidence": 0.6},
+    {"claim_id": "nope", "username": "user2", "side": "yes", "stake": 1, "confidence": 0.7},
+    {"claim_id": "claim-0", "username": "user2", "side": "yes", "stake": 5, "confidence": 0.7, "id": "p1"},
+]
+BODY = ("\n".join(json.dumps(r) for r in ROWS) + "\n\nnot json\r\n" + json.dumps({"claim_id": "claim-0"})).encode()
+
+
+def _errors(result) -> list[tuple[int, str]]:
+    return [(e.line, e.error.split(":")[0]) for e in result.errors]
+
+
+async def _chunks(body: bytes, size: int):
+    for i in range(0, len(body), size):
+        yield body[i:i + size]
+
+
+@pytest.mark.parametrize("size", [1, 7, 64, len(BODY)])
+def test_streamed_body_parses_like_whole_body(monkeypatch, size):
+    monkeypatch.setattr(bulk_import, "PARSE_BATCH", 2)
+    streamed = asyncio.run(bulk_import.parse_stream(_chunks(BODY, size), ImportPositionRow))
+    assert streamed == bulk_import.parse_lines(BODY.splitlines(), ImportPositionRow)
+
+
+def test_import_reports_rows_by_line(app_store):
+    result = bulk_import.import_positions(BODY.splitlines())
+    assert result.accepted == 2
+    assert result.ids[0] == "p1"
+    assert _errors(result) == [
+        (2, "Insufficient points"), (4, "Claim not found"), (5, "Position p1 already exists"),
+        (7, "Invalid JSON"), (8, "username"),
+    ]
+    assert app_store.get_user("user0").points == 40.0
+
+
+def test_atomic_import_reports_every_bad_row(app_store):
+    result = bulk_import.import_positions(BODY.splitlines(), atomic=True)
+    assert (result.accepted, result.ids) == (0, [])
+    assert _errors(result) == [
+        (2, "Insufficient points"), (4, "Claim not found"), (5, "Position p1 already exists"),
+        (7, "Invalid JSON"), (8, "username"),
+    ]
+    assert app_store.get_user("user0").points == 100.0
+    assert app_store.get_all_positions() == []
+
+
+def test_import_route_streams_the_body(app_store):
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    response = TestClient(app).post("/api/positions/import", content=_sync_chunks(BODY, 16))
+    assert response.status_code == 200
+    assert response.json()["accepted"] == 2
+    assert [e["line"] for e in response.json()["errors"]] == [2, 4, 5, 7, 8]
+
+
+def _sync_chunks(body: bytes, size: int):
+    for i in range(0, len(body), size):
+        yield body[i:i + size]
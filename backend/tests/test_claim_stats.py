@@ -0,0 +1,46 @@
+from datetime import datetime, timezone
+
+from app.models.records import PositionRecord, new_id
+from app.models.schemas import Claim
+from app.services import bulk_import, database
+from app.services.resolution import resolve_claim
+
+
+def _position(claim_id: str, username: str, side: str, stake: float) -> PositionRecord:
+    return PositionRecord(new_id("pos"), claim_id, username, side, stake, 0.8, datetime.now(timezone.utc))
+
+
+def _check(open_store) -> None:
+    assert database.check_claim_stats() == []
+    # A fresh handle (another worker, or the JSON store replaying its log) agrees.
+    assert open_store().get_all_claim_stats() == database.get_all_claim_stats()
+
+
+def test_claim_stats_follow_every_mutation(app_store, open_store):
+    _check(open_store)
+    database.add_claim(Claim(id="claim-new", title="New", description="", category="ai"))
+    database.add_claim(Claim(id="claim-empty", title="Empty", description="", category="ai"))
+    _check(open_store)
+
+    database.place_position(_position("claim-new", "user0", "yes", 12.5))
+    database.place_position(_position("claim-0", "user1", "no", 7))
+    _check(open_store)
+    rejected = database.place_positions([
+        _position("claim-new", "user2", "no", 3), _position("claim-1", "user3", "yes", 1e9),
+        _position("claim-1", "user4", "yes", 9),
+    ])
+    assert list(rejected) == [1]
+    _check(open_store)
+    bulk_import.import_positions([
+        b'{"claim_id": "claim-2", "username": "user5", "side": "yes", "stake": 4, "confidence": 0.6}',
+        b'{"claim_id": "claim-new", "username": "user6", "side": "no", "stake": 2, "confidence": 0.9}',
+    ])
+    _check(open_store)
+
+    database.delete_claim("claim-empty")
+    _check(open_store)
+
+    resolve_claim("claim-new", "yes")
+    _check(open_store)
+    stats = database.get_claim_stats("claim-new")
+    assert (stats.position_count, stats.total_staked) == (3, 17.5)
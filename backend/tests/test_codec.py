@@ -0,0 +1,60 @@
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from app.services import codec
+from tests.helpers import make_dataset
+
+pytest.importorskip("orjson")
+
+EDGES = {
+    "text": ["héllo ✓", 'tab\t"quoted"\n', "😀", "\x00"],
+    "numbers": [0, -5, 2**63, 0.1, 1.5, -0.0, 123456789.123, 3000.0],
+    "datetimes": [
+        datetime(2025, 1, 1, tzinfo=timezone.utc), datetime(2025, 1, 1, 12, 30, 5, 123456),
+        datetime(2025, 1, 1, tzinfo=timezone(timedelta(hours=5, minutes=30))), date(2025, 3, 4),
+    ],
+    "other": [None, True, False, {"nested": {"list": [1, {}]}}, str(uuid.UUID(int=5))],
+}
+# Written with an exponent by both, but as 1e-07 / 1e+16 by the stdlib.
+EXPONENTS = [1e-7, 1e16, 1e300]
+
+
+@pytest.fixture
+def stdlib(monkeypatch):
+    def dumps(obj, indent: bool = False) -> bytes:
+        with monkeypatch.context() as m:
+            m.setattr(codec, "orjson", None)
+            return codec.dumps(obj, indent)
+
+    return dumps
+
+
+def _loads_stdlib(monkeypatch, data: bytes):
+    with monkeypatch.context() as m:
+        m.setattr(codec, "orjson", None)
+        return codec.loads(data)
+
+
+@pytest.mark.parametrize("indent", [False, True])
+def test_fallback_writes_the_same_bytes(stdlib, indent):
+    for sample in (make_dataset(20, 10, 200), EDGES):
+        assert stdlib(sample, indent) == codec.dumps(sample, indent)
+
+
+def test_fallback_round_trips_the_same(monkeypatch, stdlib):
+    sample = {**EDGES, "exponents": EXPONENTS}
+    fast, slow = codec.dumps(sample), stdlib(sample)
+    assert codec.loads(slow) == codec.loads(fast) == _loads_stdlib(monkeypatch, fast)
+    decoded = codec.loads(fast)
+    assert decoded["exponents"] == EXPONENTS
+    assert decoded["datetimes"][0] == "2025-01-01T00:00:00+00:00"
+    assert decoded["datetimes"][1] == "2025-01-01T12:30:05.123456"
+
+
+def test_response_renders_the_same(monkeypatch):
+    content = {**make_dataset(5, 5, 20), "text": EDGES["text"]}
+    fast = codec.ORJSONResponse(content).body
+    monkeypatch.setattr(codec, "orjson", None)
+    assert codec.ORJSONResponse(content).body == fast
@@ -0,0 +1,44 @@
+import pytest
+
+from app.models.records import PositionRecord
+from app.models.schemas import Claim
+from app.services import analytics, columnar, odds, reputation
+from app.services.sqlite_store import SqliteStore
+from tests.helpers import make_dataset
+
+pytest.importorskip("numpy")
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    monkeypatch.setattr(columnar, "ENABLED", True)
+    monkeypatch.setattr(columnar, "MIN_POSITIONS", 0)
+
+
+def test_aggregate_matches_pure_python(engine):
+    data = make_dataset(50, 40, 5000)
+    claims = [Claim(**c) for c in data["claims"]]
+    positions = [PositionRecord.from_dict(p) for p in data["positions"]]
+    assert columnar.aggregate(positions, claims) == (
+        odds.accumulate_totals(positions),
+        reputation.tally_all(positions, claims),
+        analytics.build_rollup(positions, claims),
+    )
+
+
+def test_empty_aggregate_matches_pure_python(engine):
+    claims = [Claim(**c) for c in make_dataset(1, 3, 0)["claims"]]
+    assert columnar.aggregate([], claims) == ({}, {}, analytics.build_rollup([], claims))
+
+
+def test_sqlite_import_with_engine(engine, tmp_path):
+    data = make_dataset(50, 40, 5000)
+    store = SqliteStore(tmp_path / "data.db")
+    store.import_data(data)
+    stats, tally, rollup = store.get_all_claim_stats(), store.get_all_reputation(), store.get_analytics()
+    store.rebuild_claim_stats()
+    store.rebuild_reputation()
+    store.rebuild_analytics()
+    assert store.get_all_claim_stats() == stats
+    assert store.get_all_reputation() == tally
+    assert store.get_analytics() == rollup
@@ -0,0 +1,56 @@
+import pytest
+
+from app.models.schemas import User
+from app.services.json_store import JsonStore
+from tests.helpers import write_dataset
+
+
+@pytest.fixture
+def store(tmp_path, dataset) -> JsonStore:
+    write_dataset(tmp_path / "data.json", dataset)
+    return JsonStore(tmp_path / "data.json")
+
+
+def _user(username: str) -> User:
+    return User(username=username, display_name=username, points=100.0, created_at="2025-01-01T00:00:00+00:00")
+
+
+def test_event_that_fails_to_apply_is_not_logged(store, monkeypatch):
+    store.add_user(_user("before"))
+    log = store.log_path.read_bytes()
+    apply = JsonStore._apply
+
+    def failing_apply(self, snap, event):
+        if event["type"] == "user_added" and event["user"]["username"] == "broken":
+            snap.users.append(None)  # half-applied
+            raise RuntimeError("apply failed")
+        apply(self, snap, event)
+
+    monkeypatch.setattr(JsonStore, "_apply", failing_apply)
+    with pytest.raises(RuntimeError):
+        store.add_user(_user("broken"))
+    assert store.log_path.read_bytes() == log
+    assert store.get_user("broken") is None
+    assert len(store.get_all_users()) == 11
+
+    store.add_user(_user("after"))
+    replayed = JsonStore(store.path)
+    assert [u.username for u in replayed.get_all_users()][-2:] == ["before", "after"]
+
+
+def test_failed_append_leaves_no_torn_line(store, monkeypatch):
+    store.add_user(_user("before"))
+    log = store.log_path.read_bytes()
+
+    def failing_fsync(fd):
+        raise OSError("disk full")
+
+    monkeypatch.setattr("app.services.json_store.os.fsync", failing_fsync)
+    with pytest.raises(OSError):
+        store.add_user(_user("lost"))
+    monkeypatch.undo()
+    assert store.log_path.read_bytes() == log
+    assert store.get_user("lost") is None
+
+    store.add_user(_user("after"))
+    assert [u.username for u in JsonStore(store.path).get_all_users()][-2:] == ["before", "after"]
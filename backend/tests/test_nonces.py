@@ -0,0 +1,79 @@
+import time
+
+import pytest
+
+from app.services import metrics
+from app.services.nonces import EXPIRE_BATCH, MemoryNonces, SqliteNonces
+from app.services.shared_state import SqliteState
+
+ADDRESS = "0x" + "ab" * 20
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_nonces(request, tmp_path):
+    if request.param == "memory":
+        return MemoryNonces
+    return lambda **kwargs: SqliteNonces(SqliteState(tmp_path / "state.db"), **kwargs)
+
+
+def _counter(name: str) -> int:
+    return metrics.snapshot()["counters"].get(name, 0)
+
+
+def test_nonce_is_consumed_once(make_nonces):
+    nonces = make_nonces(ttl=60)
+    nonce = nonces.issue(ADDRESS.upper().replace("0X", "0x"))
+    assert nonces.pending(ADDRESS) == [nonce]
+    assert not nonces.consume(ADDRESS, "0" * 16)
+    assert nonces.consume(ADDRESS, nonce)
+    assert not nonces.consume(ADDRESS, nonce)
+    assert nonces.outstanding() == 0
+
+
+def test_expired_nonce_is_refused(make_nonces):
+    nonces = make_nonces(ttl=0.05)
+    nonce = nonces.issue(ADDRESS)
+    time.sleep(0.1)
+    assert nonces.pending(ADDRESS) == []
+    assert not nonces.consume(ADDRESS, nonce)
+    assert nonces.outstanding() == 0
+
+
+def test_issue_expires_a_bounded_batch(make_nonces):
+    nonces = make_nonces(ttl=0.05)
+    for i in range(EXPIRE_BATCH + 10):
+        nonces.issue(f"0x{i:040x}")
+    time.sleep(0.1)
+    expired = _counter("nonces.expired")
+    nonces.issue(ADDRESS)
+    assert _counter("nonces.expired") - expired == EXPIRE_BATCH
+    assert nonces.outstanding() == 11
+    nonces.issue(ADDRESS)
+    assert nonces.outstanding() == 2
+
+
+def test_per_address_cap_evicts_oldest(make_nonces):
+    nonces = make_nonces(ttl=60, per_address=3)
+    issued = [nonces.issue(ADDRESS) for _ in range(5)]
+    assert nonces.pending(ADDRESS) == issued[2:]
+    assert nonces.outstanding() == 3
+    assert not nonces.consume(ADDRESS, issued[0])
+    assert nonces.consume(ADDRESS, issued[-1])
+
+
+def test_total_cap_evicts_oldest_of_any_address(make_nonces):
+    nonces = make_nonces(ttl=60, max_total=4)
+    evicted = _counter("nonces.evicted")
+    issued = [nonces.issue(f"0x{i:040x}") for i in range(10)]
+    assert nonces.outstanding() == 4
+    assert _counter("nonces.evicted") - evicted == 6
+    assert not nonces.consume(f"0x{0:040x}", issued[0])
+    assert nonces.consume(f"0x{9:040x}", issued[9])
+
+
+def test_sqlite_nonce_is_shared_between_handles(tmp_path):
+    issuer = SqliteNonces(SqliteState(tmp_path / "state.db"), ttl=60)
+    checker = SqliteNonces(SqliteState(tmp_path / "state.db"), ttl=60)
+    nonce = issuer.issue(ADDRESS)
+    assert checker.consume(ADDRESS, nonce)
+    assert not issuer.consume(ADDRESS, nonce)
@@ -0,0 +1,21 @@
+import pytest
+
+from app.services.odds import ClaimOdds, calculate_odds, calculate_odds_bulk
+from tests.helpers import make_dataset
+
+
+@pytest.fixture
+def dataset() -> dict:
+    # More claims than positions reach, so some claims have none.
+    return make_dataset(20, 100, 150, seed=1)
+
+
+def test_bulk_odds_match_per_claim_odds(store):
+    positions, claims = store.get_all_positions(), store.get_all_claims()
+    bulk = calculate_odds_bulk(positions)
+    assert any(c.id not in bulk for c in claims)
+    for claim in claims:
+        mine = [p for p in positions if p.claim_id == claim.id]
+        yes, no = calculate_odds(mine)
+        expected = ClaimOdds(yes, no, sum(p.stake for p in mine), len(mine)) if mine else ClaimOdds()
+        assert bulk.get(claim.id, ClaimOdds()) == expected
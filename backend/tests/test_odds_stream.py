@@ -0,0 +1,112 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from app.models.records import PositionRecord, new_id
+from app.routers.claims import stream_odds
+from app.services import codec, odds_stream
+
+
+@pytest.fixture
+def broadcaster(monkeypatch, app_store) -> odds_stream.OddsBroadcaster:
+    broadcaster = odds_stream.OddsBroadcaster(window=0.05, poll_interval=60)
+    monkeypatch.setattr(odds_stream, "_broadcaster", broadcaster)
+    return broadcaster
+
+
+def _events(chunk: bytes) -> list[tuple[str, dict]]:
+    events = []
+    for message in chunk.decode().split("\n\n"):
+        if message.startswith("event: "):
+            kind, data = message.split("\n")
+            events.append((kind.removeprefix("event: "), codec.loads(data.removeprefix("data: "))))
+    return events
+
+
+def _stake(store, claim_id: str, stake: float) -> None:
+    store.place_position(PositionRecord(
+        new_id("pos"), claim_id, "user0", "yes", stake, 0.7, datetime.now(timezone.utc),
+    ))
+    odds_stream.publish(claim_id)
+
+
+def _run(broadcaster, coro):
+    async def main():
+        try:
+            return await coro()
+        finally:
+            await broadcaster.stop()
+
+    return asyncio.run(main())
+
+
+def test_first_frame_carries_current_odds(broadcaster, app_store):
+    _stake(app_store, "claim-0", 10)
+
+    async def first():
+        response = await stream_odds(["claim-0", "claim-1", "claim-0"])
+        try:
+            return await response.body_iterator.__anext__()
+        finally:
+            await response.body_iterator.aclose()
+
+    events = _run(broadcaster, first)
+    assert [(kind, e["claim_id"]) for kind, e in _events(events)] == [("odds", "claim-0"), ("odds", "claim-1")]
+    claim_0 = _events(events)[0][1]
+    assert (claim_0["position_count"], claim_0["total_staked"], claim_0["yes_percentage"]) == (1, 10.0, 100.0)
+
+
+def test_burst_of_writes_is_one_frame_per_claim(broadcaster, app_store):
+    async def burst():
+        sub = broadcaster.subscribe(["claim-0"])
+        await asyncio.sleep(0.05)  # let the broadcaster take its baseline
+        for stake in (1, 2, 3):
+            await asyncio.to_thread(_stake, app_store, "claim-0", stake)
+        await asyncio.to_thread(_stake, app_store, "claim-1", 4)  # not watched
+        frames = sub.frames()
+        try:
+            return await asyncio.wait_for(frames.__anext__(), timeout=5)
+        finally:
+            broadcaster.unsubscribe(sub)
+
+    events = _events(_run(broadcaster, burst))
+    assert len(events) == 1
+    kind, event = events[0]
+    assert (kind, event["claim_id"], event["position_count"], event["total_staked"]) == ("odds", "claim-0", 3, 6.0)
+
+
+def test_subscriber_keeps_only_the_newest_frame():
+    async def offer():
+        sub = odds_stream.Subscriber(None)
+        for data in (b"a", b"b", b"c"):
+            sub.offer("claim-0", data)
+        sub.offer("claim-1", b"d")
+        return await sub.frames().__anext__()
+
+    assert asyncio.run(offer()) == b"cd"
+
+
+@pytest.mark.parametrize("claim_ids", [["missing"], ["claim-0", "missing"], ["claim-0", "claim-0", "missing"]])
+def test_unknown_claim_is_404(broadcaster, claim_ids):
+    async def open_stream():
+        with pytest.raises(HTTPException) as raised:
+            await stream_odds(claim_ids)
+        return raised.value.status_code
+
+    assert _run(broadcaster, open_stream) == 404
+    assert broadcaster.status()["subscribers"] == 0
+
+
+def test_disconnect_unsubscribes(broadcaster):
+    async def connect():
+        response = await stream_odds(["claim-0"])
+        await response.body_iterator.__anext__()
+        connected = broadcaster.status()
+        await response.body_iterator.aclose()
+        return connected, broadcaster.status()
+
+    connected, closed = _run(broadcaster, connect)
+    assert (connected["subscribers"], connected["claims_watched"]) == (1, 1)
+    assert (closed["subscribers"], closed["claims_watched"]) == (0, 0)
@@ -0,0 +1,158 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.services import oracle
+from app.services.oracle_client import AsyncOracleClient
+from tests.stub_rpc import StubRpc
+
+ETH_USD = oracle.CHAINLINK_FEEDS["ETH/USD"]
+
+
+@pytest.fixture
+def stub_only(monkeypatch):
+    """Point the oracle at nothing but the stub RPC passed to the returned function."""
+    monkeypatch.setattr(oracle, "FALLBACK_RPCS", [])
+
+    def use(rpc: StubRpc) -> None:
+        monkeypatch.setenv("WEB3_PROVIDER_URL", rpc.url)
+        oracle.clear_cache()
+
+    yield use
+    oracle.clear_cache()
+
+
+def _hedged_reads(client: AsyncOracleClient, reads: int) -> list[tuple[float, float]]:
+    """(seconds, value) of each of ``reads`` sequential hedged reads of ETH/USD."""
+    async def run():
+        samples = []
+        try:
+            for _ in range(reads):
+                start = time.perf_counter()
+                value, _ = await client.hedged(client.read_feed, ETH_USD)
+                samples.append((time.perf_counter() - start, value))
+        finally:
+            await client.close()
+        return samples
+
+    return asyncio.run(run())
+
+
+def test_concurrent_reads_share_one_fetch(stub_only):
+    with StubRpc(delay=0.05) as rpc:
+        stub_only(rpc)
+        with ThreadPoolExecutor(32) as pool:
+            results = list(pool.map(lambda _: oracle.get_chainlink_price("ETH/USD"), range(64)))
+        # decimals() once plus one latestRoundData() for every caller
+        assert rpc.calls["eth_call"] == 2
+        assert {r.value for r in results} == {3000.0}
+        oracle.get_chainlink_price("ETH/USD")
+        assert rpc.calls["eth_call"] == 2
+
+
+def test_cached_price_expires_after_ttl(monkeypatch, stub_only):
+    monkeypatch.setattr(oracle, "PRICE_CACHE_TTL", 0.2)
+    with StubRpc() as rpc:
+        stub_only(rpc)
+        first = oracle.get_chainlink_price("ETH/USD")
+        fetched = rpc.calls["eth_call"]
+        assert oracle.get_chainlink_price("ETH/USD") == first
+        assert rpc.calls["eth_call"] == fetched
+        time.sleep(0.25)
+        assert oracle.get_chainlink_price("ETH/USD").value == 3000.0
+        # Decimals are kept; only latestRoundData() is read again.
+        assert rpc.calls["eth_call"] == fetched + 1
+        assert oracle.get_chainlink_price("ETH/USD", max_age=0).value == 3000.0
+        assert rpc.calls["eth_call"] == fetched + 2
+
+
+def test_concurrent_async_reads_share_one_fetch(stub_only):
+    async def run():
+        try:
+            return await asyncio.gather(*(oracle.get_chainlink_price_async("ETH/USD") for _ in range(32)))
+        finally:
+            await oracle.close_client()
+
+    with StubRpc(delay=0.05) as rpc:
+        stub_only(rpc)
+        results = asyncio.run(run())
+    assert rpc.calls["http"] == 1
+    assert {r.value for r in results} == {3000.0}
+
+
+def test_failed_read_stays_on_configured_providers(stub_only):
+    with StubRpc(fail=True) as rpc:
+        stub_only(rpc)
+        with pytest.raises(ConnectionError):
+            oracle._fetch_chainlink_price("ETH/USD")
+        assert rpc.calls["http"] >= 1
+
+
+def test_hedge_races_slow_provider():
+    with StubRpc(delay=1.0) as slow, StubRpc() as fast:
+        client = AsyncOracleClient([slow.url, fast.url], hedge_delay=0.05, timeout=5)
+        samples = _hedged_reads(client, 5)
+    assert all(value == 3000.0 for _, value in samples)
+    assert max(seconds for seconds, _ in samples) < 0.5
+    assert client.ranked() == [fast.url, slow.url]
+    # After the first hedge the fast provider is tried first and the slow one left alone.
+    assert slow.calls["http"] == 1
+
+
+def test_health_demotes_failing_provider():
+    with StubRpc(fail=True) as broken, StubRpc() as fast:
+        client = AsyncOracleClient([broken.url, fast.url], hedge_delay=1.0, timeout=5)
+        samples = _hedged_reads(client, 5)
+    assert all(value == 3000.0 for _, value in samples)
+    health = client.health[broken.url]
+    assert (health.requests, health.errors, health.error_rate) == (1, 1, 1.0)
+    assert client.health[fast.url].error_rate == 0.0
+    assert client.ranked() == [fast.url, broken.url]
+    assert broken.calls["http"] == 1
+
+
+def test_health_is_an_ewma():
+    client = AsyncOracleClient(["a"], timeout=10, alpha=0.5)
+    client._record("a", 0.2)
+    assert (client.health["a"].latency, client.health["a"].error_rate) == (0.2, 0.0)
+    client._record("a", None)
+    assert client.health["a"].latency == pytest.approx(0.2 + 0.5 * (10 - 0.2))
+    assert client.health["a"].error_rate == pytest.approx(0.5)
+    client._record("a", 0.2)
+    assert client.health["a"].error_rate == pytest.approx(0.25)
+    assert (client.health["a"].requests, client.health["a"].errors) == (3, 1)
+
+
+def test_snapshot_reads_every_feed_in_one_round_trip(stub_only):
+    from app.models.schemas import Claim
+
+    claims = [
+        Claim(id=f"claim-{feed}-{comparator}", title=feed, description="", category="crypto",
+              resolution_type="oracle",
+              oracle_config={"type": "chainlink_price", "feed": feed, "comparator": comparator, "target": 1000.0})
+        for feed in oracle.CHAINLINK_FEEDS for comparator in (">", "<")
+    ]
+
+    async def run():
+        try:
+            snapshot = await oracle.get_price_snapshot()
+            again = await oracle.get_price_snapshot()
+        finally:
+            await oracle.close_client()
+        return snapshot, again
+
+    with StubRpc(delay=0.01) as rpc:
+        stub_only(rpc)
+        snapshot, again = asyncio.run(run())
+    assert rpc.calls["http"] == 1
+    assert rpc.calls["eth_call"] == 2 * len(oracle.CHAINLINK_FEEDS)
+    assert again == snapshot
+    assert {feed: r.value for feed, r in snapshot.items()} == {"ETH/USD": 3000.0, "BTC/USD": 60000.0, "LINK/USD": 15.0}
+    outcomes = oracle.evaluate_claims(claims, snapshot)
+    assert outcomes == {
+        c.id: oracle.evaluate_condition(snapshot[c.oracle_config["feed"]].value, c.oracle_config["comparator"], 1000.0)
+        for c in claims
+    }
+    assert sum(outcomes.values()) == len(oracle.CHAINLINK_FEEDS)
@@ -0,0 +1,120 @@
+from typing import Callable
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models.schemas import Claim
+from app.services import database, paging
+from app.services.json_store import JsonStore
+from app.services.sqlite_store import SqliteStore
+from tests.helpers import make_dataset, write_dataset
+
+CLAIM_FILTERS = [{}, {"status": "active"}, {"category": "ai"}, {"created_by": "user3"},
+                 {"status": "resolved_yes", "category": "crypto"}, {"category": "none"}]
+POSITION_FILTERS = [{}, {"claim_id": "claim-4"}, {"username": "user2"},
+                    {"claim_id": "claim-1", "username": "user5"}, {"claim_id": "missing"}]
+
+
+@pytest.fixture
+def dataset() -> dict:
+    return make_dataset(12, 20, 150, seed=3)
+
+
+def _walk(fetch: Callable[[str | None, int | None], paging.Page], limit: int) -> list:
+    items, cursor = [], None
+    while True:
+        page = fetch(cursor, limit)
+        assert len(page.items) <= limit
+        items += page.items
+        if page.next_cursor is None:
+            return items
+        assert page.items and len(page.items) == limit
+        cursor = page.next_cursor
+
+
+def _matches(item, filters: dict) -> bool:
+    return all(getattr(item, k) == v for k, v in filters.items())
+
+
+@pytest.mark.parametrize("limit", [1, 3, 7, paging.MAX_LIMIT])
+def test_pages_concatenate_to_the_full_listing(app_store, limit):
+    users = app_store.get_all_users()
+    assert _walk(database.page_users, limit) == database.page_users().items == users
+    for filters in CLAIM_FILTERS:
+        listing = [c for c in app_store.get_all_claims() if _matches(c, filters)]
+        walked = _walk(lambda cursor, n: database.page_claims(**filters, cursor=cursor, limit=n), limit)
+        assert walked == database.page_claims(**filters).items == listing
+    for filters in POSITION_FILTERS:
+        listing = [p for p in app_store.get_all_positions() if _matches(p, filters)]
+        walked = _walk(lambda cursor, n: database.page_positions(**filters, cursor=cursor, limit=n), limit)
+        assert walked == database.page_positions(**filters).items == listing
+
+
+def test_cursor_survives_writes(app_store):
+    first = database.page_claims(limit=5)
+    app_store.add_claim(Claim(id="claim-new", title="New", description="", category="ai"))
+    app_store.delete_claim("claim-2")
+    rest = database.page_claims(cursor=first.next_cursor).items
+    assert [c.id for c in rest] == [f"claim-{i}" for i in range(5, 20)] + ["claim-new"]
+
+
+def test_unknown_cursor_is_rejected(app_store):
+    for fetch in (database.page_users, database.page_claims, database.page_positions):
+        with pytest.raises(ValueError):
+            fetch(cursor="nope", limit=5)
+
+
+def test_backends_page_identically(tmp_path, dataset):
+    write_dataset(tmp_path / "data.json", dataset)
+    json_store = JsonStore(tmp_path / "data.json")
+    sqlite_store = SqliteStore(tmp_path / "data.db")
+    sqlite_store.import_data(dataset)
+
+    def pages(store) -> list:
+        found = []
+        for filters in CLAIM_FILTERS:
+            page, cursor = None, None
+            while page is None or page.next_cursor:
+                page = store.page_claims(filters, cursor, 4)
+                found.append(([c.id for c in page.items], page.next_cursor))
+                cursor = page.next_cursor
+        for filters in POSITION_FILTERS:
+            page, cursor = None, None
+            while page is None or page.next_cursor:
+                page = store.page_positions(filters, cursor, 9)
+                found.append((page.items, page.next_cursor))
+                cursor = page.next_cursor
+        page, cursor = None, None
+        while page is None or page.next_cursor:
+            page = store.page_users(cursor, 5)
+            found.append(([u.username for u in page.items], page.next_cursor))
+            cursor = page.next_cursor
+        return found
+
+    assert pages(json_store) == pages(sqlite_store)
+
+
+@pytest.mark.parametrize("path, params", [
+    ("/api/users", {}), ("/api/claims", {}), ("/api/claims", {"status": "active"}),
+    ("/api/positions", {}), ("/api/positions", {"username": "user2"}),
+])
+def test_routes_follow_next_cursor(app_store, path, params):
+    client = TestClient(app)
+    everything = client.get(path, params=params).json()
+    assert paging.NEXT_CURSOR_HEADER not in client.get(path, params=params).headers
+    walked, cursor = [], None
+    while True:
+        response = client.get(path, params={**params, "limit": 4, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200
+        walked += response.json()
+        cursor = response.headers.get(paging.NEXT_CURSOR_HEADER)
+        if cursor is None:
+            break
+    assert walked == everything
+
+
+@pytest.mark.parametrize("path", ["/api/users", "/api/claims", "/api/positions"])
+def test_route_rejects_a_bad_cursor(app_store, path):
+    response = TestClient(app).get(path, params={"cursor": "nope", "limit": 4})
+    assert response.status_code == 400
@@ -0,0 +1,56 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from app.models.records import PositionRecord, new_id
+from app.services import database
+from app.services.reputation import (
+    UserStats, calculate_accuracy, calculate_category_stats, calculate_user_stats_bulk,
+)
+from app.services.resolution import resolve_claim
+from tests.helpers import make_dataset
+
+
+@pytest.fixture
+def dataset() -> dict:
+    return make_dataset(15, 30, 300, seed=2)
+
+
+def test_bulk_user_stats_match_per_user_functions(store):
+    positions = store.get_all_positions()
+    # Leave one claim out, as if it had been deleted after positions were placed on it.
+    claims = [c for c in store.get_all_claims() if c.id != "claim-0"]
+    assert any(p.claim_id == "claim-0" for p in positions)
+    by_id = {c.id: c for c in claims}
+    bulk = calculate_user_stats_bulk(positions, claims)
+    for user in store.get_all_users():
+        mine = [p for p in positions if p.username == user.username]
+        stats = bulk.get(user.username, UserStats())
+        assert stats.accuracy == calculate_accuracy(mine, claims)
+        assert stats.category_stats == calculate_category_stats(mine, claims)
+        assert stats.active_positions == [
+            p for p in mine if p.claim_id in by_id and by_id[p.claim_id].status == "active"
+        ]
+        assert stats.resolved_positions == [
+            p for p in mine if p.claim_id not in by_id or by_id[p.claim_id].status != "active"
+        ]
+
+
+def test_reputation_counters_follow_settlement(app_store, open_store):
+    assert database.check_reputation() == []
+    active = [c.id for c in app_store.get_all_claims() if c.status == "active"]
+    for i, claim_id in enumerate(active[:2]):
+        for username, side in (("user0", "yes"), ("user1", "no"), (f"user{5 + i}", "yes")):
+            database.place_position(PositionRecord(
+                new_id("pos"), claim_id, username, side, 5.0, 0.7, datetime.now(timezone.utc),
+            ))
+    assert database.check_reputation() == []
+    before = database.get_reputation("user0")
+
+    resolve_claim(active[0], "yes")
+    resolve_claim(active[1], "no")
+    assert database.check_reputation() == []
+    assert open_store().get_all_reputation() == database.get_all_reputation()
+    after = database.get_reputation("user0")
+    assert sum(c["total"] for c in after.values()) == sum(c["total"] for c in before.values()) + 2
+    assert sum(c["correct"] for c in after.values()) == sum(c["correct"] for c in before.values()) + 1
@@ -0,0 +1,75 @@
+from datetime import datetime, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models.records import PositionRecord
+from app.services import metrics, response_cache
+
+URL = "/api/claims/claim-0"
+
+
+@pytest.fixture
+def client(app_store) -> TestClient:
+    return TestClient(app)
+
+
+def _counter(name: str) -> int:
+    return metrics.snapshot()["counters"].get(name, 0)
+
+
+def _stake(store, stake: float = 10.0) -> None:
+    store.place_position(PositionRecord(
+        f"pos-{stake:g}", "claim-0", "user0", "yes", stake, 0.7, datetime.now(timezone.utc),
+    ))
+
+
+def test_etag_is_version_and_request_hash(client, app_store):
+    response = client.get(URL)
+    assert response.status_code == 200
+    assert response.headers["ETag"] == response_cache._etag(app_store.data_version(), URL + "?")
+    assert response.headers["Cache-Control"] == "no-cache"
+    other = client.get("/api/claims", params={"limit": 1})
+    assert other.headers["ETag"] != response.headers["ETag"]
+
+
+def test_if_none_match_returns_304_without_body(client):
+    etag = client.get(URL).headers["ETag"]
+    for header in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+        response = client.get(URL, headers={"If-None-Match": header})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["ETag"] == etag
+    assert client.get(URL, headers={"If-None-Match": '"stale"'}).status_code == 200
+
+
+def test_repeated_request_is_served_from_cache(client):
+    first = client.get(URL)
+    hits, misses = _counter("http_cache.hits"), _counter("http_cache.misses")
+    second = client.get(URL)
+    assert second.content == first.content
+    assert second.headers["ETag"] == first.headers["ETag"]
+    assert (_counter("http_cache.hits"), _counter("http_cache.misses")) == (hits + 1, misses)
+
+
+def test_write_from_another_handle_invalidates(client, app_store, open_store):
+    first = client.get(URL)
+    _stake(open_store())
+    second = client.get(URL, headers={"If-None-Match": first.headers["ETag"]})
+    assert second.status_code == 200
+    assert second.headers["ETag"] != first.headers["ETag"]
+    assert second.json()["position_count"] == first.json()["position_count"] + 1
+    assert second.json()["total_staked"] == first.json()["total_staked"] + 10.0
+
+
+def test_rejected_and_dry_run_writes_keep_the_version(app_store):
+    version = app_store.data_version()
+    now = datetime.now(timezone.utc)
+    too_big = PositionRecord("pos-big", "claim-0", "user0", "yes", 1e9, 0.7, now)
+    assert list(app_store.place_positions([too_big])) == [0]
+    fits = PositionRecord("pos-fits", "claim-0", "user0", "yes", 1.0, 0.7, now)
+    assert app_store.place_positions([fits], dry_run=True) == {}
+    assert app_store.data_version() == version
+    app_store.place_positions([fits])
+    assert app_store.data_version() != version
@@ -0,0 +1,126 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+from app.models.schemas import Claim
+from app.services import database, oracle, shared_state
+from app.services.scheduler import LEADER_LOCK, OracleScheduler
+from tests.stub_rpc import StubRpc
+
+
+def test_load_reads_only_due_claims(monkeypatch, store):
+    def full_scan():
+        raise AssertionError("the scheduler scanned every claim")
+
+    monkeypatch.setattr(database, "_store", store)
+    monkeypatch.setattr(database, "get_all_claims", full_scan)
+    claims = OracleScheduler._load(["claim-2", "missing", "claim-0", "claim-2"])
+    assert [c.id for c in claims] == ["claim-2", "claim-0"]
+
+
+DUE = datetime(2025, 6, 1, tzinfo=timezone.utc)
+NOW = DUE.timestamp() + 1
+
+
+@pytest.fixture
+def oracle_claim(app_store) -> Claim:
+    claim = Claim(
+        id="claim-eth", title="ETH above 1000", description="", category="crypto",
+        resolution_type="oracle", resolution_date=DUE,
+        oracle_config={"type": "chainlink_price", "feed": "ETH/USD", "comparator": ">", "target": 1000.0},
+    )
+    app_store.add_claim(claim)
+    return claim
+
+
+@pytest.fixture
+def scheduler(monkeypatch, oracle_claim):
+    monkeypatch.setattr(oracle, "FALLBACK_RPCS", [])
+    scheduler = OracleScheduler(retry_delay=30)
+    scheduler.schedule(oracle_claim)
+    yield scheduler
+    shared_state.get_state().release(LEADER_LOCK, scheduler._owner)
+    oracle.clear_cache()
+
+
+@pytest.fixture
+def run_due(monkeypatch):
+    """Run one ``run_due`` pass of a scheduler against a stub RPC."""
+    def run_due(scheduler: OracleScheduler, rpc: StubRpc, now: float = NOW) -> int:
+        async def run():
+            try:
+                return await scheduler.run_due(now)
+            finally:
+                await oracle.close_client()
+
+        monkeypatch.setenv("WEB3_PROVIDER_URL", rpc.url)
+        oracle.clear_cache()
+        return asyncio.run(run())
+
+    return run_due
+
+
+def test_due_claim_is_settled(scheduler, app_store, run_due):
+    with StubRpc() as rpc:
+        assert run_due(scheduler, rpc, now=DUE.timestamp() - 1) == 0
+        assert rpc.calls["http"] == 0
+        assert run_due(scheduler, rpc) == 1
+    assert app_store.get_claim("claim-eth").status == "resolved_yes"
+    assert scheduler.status()["pending"] == 0
+
+
+def test_claim_is_settled_once(scheduler, app_store, oracle_claim, run_due):
+    with StubRpc() as rpc:
+        assert run_due(scheduler, rpc) == 1
+        resolved_at = app_store.get_claim("claim-eth").resolved_at
+        scheduler.schedule(oracle_claim)  # a stale copy, as a rescan racing the settlement would see
+        assert run_due(scheduler, rpc) == 0
+        # Another worker's scheduler holding the claim when it came due.
+        other = OracleScheduler()
+        other.schedule(oracle_claim)
+        shared_state.get_state().release(LEADER_LOCK, scheduler._owner)
+        try:
+            assert run_due(other, rpc) == 0
+        finally:
+            shared_state.get_state().release(LEADER_LOCK, other._owner)
+    assert app_store.get_claim("claim-eth").resolved_at == resolved_at
+
+
+def test_not_leader_retries_after_delay(scheduler, app_store, oracle_claim, run_due):
+    state = shared_state.get_state()
+    assert state.acquire(LEADER_LOCK, "other-worker", 60)
+    try:
+        with StubRpc() as rpc:
+            assert run_due(scheduler, rpc) == 0
+            assert rpc.calls["http"] == 0
+    finally:
+        state.release(LEADER_LOCK, "other-worker")
+    assert scheduler._next_due() == NOW + 30
+    scheduler.rescan([oracle_claim])
+    assert scheduler._next_due() == NOW + 30
+    with StubRpc() as rpc:
+        assert run_due(scheduler, rpc, now=NOW + 29) == 0
+        assert run_due(scheduler, rpc, now=NOW + 30) == 1
+    assert app_store.get_claim("claim-eth").status == "resolved_yes"
+
+
+def test_fetch_error_retries_after_delay(scheduler, app_store, oracle_claim, run_due):
+    with StubRpc(fail=True) as rpc:
+        assert run_due(scheduler, rpc) == 0
+        assert rpc.calls["http"] >= 1
+    scheduler.rescan([oracle_claim])
+    assert scheduler._next_due() == NOW + 30
+    assert app_store.get_claim("claim-eth").status == "active"
+    with StubRpc() as rpc:
+        assert run_due(scheduler, rpc, now=NOW + 30) == 1
+
+
+def test_failed_pass_requeues_claims(monkeypatch, scheduler, run_due):
+    def broken(claims, snapshot):
+        raise RuntimeError("evaluation failed")
+
+    monkeypatch.setattr(oracle, "evaluate_claims", broken)
+    with StubRpc() as rpc, pytest.raises(RuntimeError):
+        run_due(scheduler, rpc)
+    assert scheduler._next_due() == NOW + 30
@@ -0,0 +1,83 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import pytest
+
+from app.models.records import PositionRecord, new_id
+from app.services import database
+from app.services.resolution import plan_settlement, resolve_claim
+from tests.conftest import START_POINTS, USERS
+
+STAKES = [("user0", "yes", 30.0), ("user1", "yes", 10.0), ("user2", "no", 20.0), ("user3", "no", 0.5)]
+
+
+@pytest.fixture
+def staked(app_store):
+    for username, side, stake in STAKES:
+        app_store.place_position(PositionRecord(
+            new_id("pos"), "claim-0", username, side, stake, 0.7, datetime.now(timezone.utc),
+        ))
+    # A stake on another claim stays out of the settlement.
+    app_store.place_position(PositionRecord(
+        new_id("pos"), "claim-1", "user0", "no", 5.0, 0.7, datetime.now(timezone.utc),
+    ))
+    return app_store
+
+
+def _points(store) -> dict[str, float]:
+    return {u.username: u.points for u in store.get_all_users()}
+
+
+def _conserved(store) -> bool:
+    claims = {c.id: c for c in store.get_all_claims()}
+    at_stake = sum(p.stake for p in store.get_all_positions() if claims[p.claim_id].status == "active")
+    return sum(_points(store).values()) + at_stake == pytest.approx(USERS * START_POINTS)
+
+
+def test_winners_split_the_losing_pool(staked):
+    assert _conserved(staked)
+    claim = resolve_claim("claim-0", "yes")
+    assert claim.status == "resolved_yes" and claim.resolved_at is not None
+    points = _points(staked)
+    # 20.5 lost, shared 3:1 by the yes stakes.
+    assert points["user0"] == pytest.approx(START_POINTS - 5 + 20.5 * 0.75)
+    assert points["user1"] == pytest.approx(START_POINTS + 20.5 * 0.25)
+    assert (points["user2"], points["user3"]) == (START_POINTS - 20, START_POINTS - 0.5)
+    assert _conserved(staked)
+
+
+def test_second_resolve_is_rejected(staked, open_store):
+    resolve_claim("claim-0", "no")
+    settled = _points(staked)
+    with pytest.raises(ValueError):
+        resolve_claim("claim-0", "yes")
+    with pytest.raises(ValueError):
+        open_store().settle_claim("claim-0", lambda c, ps: plan_settlement(c, ps, "yes"))
+    assert _points(open_store()) == settled
+    assert database.get_claim("claim-0").status == "resolved_no"
+    assert _conserved(staked)
+
+
+def test_failed_plan_writes_nothing(staked):
+    before = _points(staked), database.data_version()
+
+    def plan(claim, positions):
+        raise RuntimeError("plan failed")
+
+    with pytest.raises(RuntimeError):
+        database.settle_claim("claim-0", plan)
+    assert (_points(staked), database.data_version()) == before
+    assert database.get_claim("claim-0").status == "active"
+
+
+def test_concurrent_resolves_settle_once(staked, open_store):
+    def settle(side: str) -> bool:
+        try:
+            open_store().settle_claim("claim-0", lambda c, ps: plan_settlement(c, ps, side))
+        except ValueError:
+            return False
+        return True
+
+    with ThreadPoolExecutor(8) as pool:
+        assert sum(pool.map(settle, ["yes", "no"] * 4)) == 1
+    assert _conserved(open_store())
@@ -0,0 +1,117 @@
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from app.services.nonces import SqliteNonces
+from app.services.scheduler import LEADER_LOCK
+from app.services.shared_state import LockTimeout, MemoryState, SqliteState
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def workers(request, tmp_path) -> tuple:
+    """Two views of one shared state, as two workers would hold."""
+    if request.param == "memory":
+        state = MemoryState()
+        return state, state
+    return SqliteState(tmp_path / "state.db"), SqliteState(tmp_path / "state.db")
+
+
+def test_lease_handoff(workers):
+    a, b = workers
+    assert a.acquire("leader", "a", ttl=60)
+    assert not b.acquire("leader", "b", ttl=60)
+    assert a.acquire("leader", "a", ttl=0.05)  # the holder extends (here: shortens) its lease
+    b.release("leader", "b")  # not the holder: no effect
+    assert not b.acquire("leader", "b", ttl=60)
+    time.sleep(0.1)
+    assert b.acquire("leader", "b", ttl=60)  # expired: taken over
+    assert not a.acquire("leader", "a", ttl=60)
+    a.release("leader", "a")  # the old holder cannot drop the new lease
+    assert not a.acquire("leader", "a", ttl=60)
+    b.release("leader", "b")
+    assert a.acquire("leader", "a", ttl=60)
+
+
+def test_lock_excludes_other_workers(workers):
+    a, b = workers
+    inside = 0
+    overlaps = []
+
+    def work(state) -> None:
+        nonlocal inside
+        for _ in range(10):
+            with state.lock("section", ttl=5):
+                inside += 1
+                overlaps.append(inside)
+                time.sleep(0.001)
+                inside -= 1
+
+    with ThreadPoolExecutor(4) as pool:
+        list(pool.map(work, [a, b, a, b]))
+    assert max(overlaps) == 1
+
+    with a.lock("section"):
+        with pytest.raises(LockTimeout):
+            with b.lock("section", timeout=0.05):
+                pass
+
+
+def test_take_is_atomic(workers):
+    a, b = workers
+    a.set("nonces", "0xabc", "n1", ttl=60)
+    barrier = threading.Barrier(8)
+
+    def take(state):
+        barrier.wait()
+        return state.take("nonces", "0xabc")
+
+    with ThreadPoolExecutor(8) as pool:
+        taken = list(pool.map(take, [a, b] * 4))
+    assert taken.count("n1") == 1
+    assert taken.count(None) == 7
+
+
+def test_entries_expire(workers):
+    a, b = workers
+    a.set("prices", "ETH/USD", [3000.0, 1], ttl=0.05)
+    assert b.get("prices", "ETH/USD") == [3000.0, 1]
+    time.sleep(0.1)
+    assert b.get("prices", "ETH/USD") is None
+    assert b.take("prices", "ETH/USD") is None
+
+
+# Run in worker processes, each opening the state file itself as a uvicorn worker does.
+
+def _issue(path: str, address: str) -> str:
+    return SqliteNonces(SqliteState(path)).issue(address)
+
+
+def _consume(path: str, address: str, nonce: str) -> bool:
+    return SqliteNonces(SqliteState(path)).consume(address, nonce)
+
+
+def _lead(path: str, owner: str) -> bool:
+    return SqliteState(path).acquire(LEADER_LOCK, owner, ttl=60)
+
+
+def _worker():
+    return ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn"))
+
+
+def test_nonce_issued_by_one_worker_is_consumed_by_another(tmp_path):
+    path, address = str(tmp_path / "state.db"), "0xAbC0000000000000000000000000000000000001"
+    with _worker() as issuer, _worker() as verifier:
+        nonce = issuer.submit(_issue, path, address).result()
+        assert verifier.submit(_consume, path, address.lower(), nonce).result()
+        assert not issuer.submit(_consume, path, address, nonce).result()
+
+
+def test_one_worker_holds_the_scheduler_lease(tmp_path):
+    path = str(tmp_path / "state.db")
+    SqliteState(path)
+    with ProcessPoolExecutor(4, mp_context=multiprocessing.get_context("spawn")) as pool:
+        leaders = [pool.submit(_lead, path, f"worker-{i}") for i in range(8)]
+        assert sum(f.result() for f in leaders) == 1
@@ -0,0 +1,74 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import pytest
+
+from app.models.records import PositionRecord, new_id
+from app.services.odds import OddsTotals, accumulate_totals, totals_match
+from tests.conftest import CLAIMS, START_POINTS, USERS
+
+
+def _position(username: str, claim_id: str, stake: float, side: str = "yes") -> PositionRecord:
+    return PositionRecord(
+        new_id("pos"), claim_id, username, side, stake, 0.75, datetime.now(timezone.utc),
+    )
+
+
+def _stake_concurrently(open_store, stakes: list[PositionRecord], threads: int = 8) -> int:
+    """Place ``stakes`` from ``threads`` threads, each on its own store handle; returns how many went in."""
+    def worker(batch: list[PositionRecord]) -> int:
+        store = open_store()
+        placed = 0
+        for position in batch:
+            try:
+                store.place_position(position)
+                placed += 1
+            except ValueError as e:
+                assert str(e).startswith("Insufficient points"), e
+        return placed
+
+    with ThreadPoolExecutor(threads) as pool:
+        return sum(pool.map(worker, [stakes[i::threads] for i in range(threads)]))
+
+
+def test_concurrent_stakes_conserve_points(open_store):
+    rng = random.Random(0)
+    stakes = [
+        _position(f"user{rng.randrange(USERS)}", f"claim-{rng.randrange(CLAIMS)}",
+                  float(rng.randint(1, 20)), rng.choice(("yes", "no")))
+        for _ in range(400)
+    ]
+    placed = _stake_concurrently(open_store, stakes)
+
+    store = open_store()
+    users = store.get_all_users()
+    positions = store.get_all_positions()
+    assert 0 < placed < len(stakes)
+    assert len(positions) == placed
+    assert all(u.points >= 0 for u in users)
+    assert sum(u.points for u in users) + sum(p.stake for p in positions) == USERS * START_POINTS
+    stored, expected = store.get_all_claim_stats(), accumulate_totals(positions)
+    assert all(
+        totals_match(stored.get(c, OddsTotals()), expected.get(c, OddsTotals()))
+        for c in stored.keys() | expected.keys()
+    )
+
+
+def test_concurrent_stakes_never_overdraw(open_store):
+    stakes = [_position("user0", "claim-0", 10.0) for _ in range(64)]
+    assert _stake_concurrently(open_store, stakes) == START_POINTS / 10
+    assert open_store().get_user("user0").points == 0
+
+
+@pytest.mark.parametrize("claim_id, status, message", [
+    ("claim-missing", None, "Claim not found"),
+    ("claim-0", "resolved_yes", "Claim is already resolved"),
+])
+def test_stake_on_unavailable_claim_is_refused(store, claim_id, status, message):
+    if status:
+        store.update_claim(store.get_claim(claim_id).model_copy(update={"status": status}))
+    with pytest.raises(ValueError, match=message):
+        store.place_position(_position("user0", claim_id, 1.0))
+    assert store.get_user("user0").points == START_POINTS
+    assert store.get_all_positions() == []
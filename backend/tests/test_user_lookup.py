@@ -0,0 +1,61 @@
+import pytest
+
+from app.models.schemas import User
+from app.services.json_store import JsonStore
+from app.services.sqlite_store import SqliteStore
+from tests.helpers import make_dataset, scan_user, scan_wallet, write_dataset
+
+QUERIES = [
+    "user3", "user7", "USER3", "nobody", "0x", "0xnobody", "mixed", "MIXED", "late", "mover",
+    f"0x{3:040x}", f"0x{3:040X}".replace("0X", "0x"), f"0x{5:040x}", f"0x{5:040X}", f"0x{7:040x}",
+    "0xabcdef0000000000000000000000000000000001", "0xABCDEF0000000000000000000000000000000001",
+    "0xfeed000000000000000000000000000000000001", "0xFEED000000000000000000000000000000000001",
+    "0xbeef000000000000000000000000000000000001", "0xc0ffee0000000000000000000000000000000001",
+]
+
+
+def _user(username: str, wallet: str | None) -> dict:
+    return {
+        "username": username, "display_name": username, "wallet_address": wallet,
+        "points": 1000.0, "created_at": "2025-01-01T00:00:00+00:00",
+    }
+
+
+@pytest.fixture
+def stores(tmp_path) -> list:
+    """Both stores holding the awkward cases, after writes that move index entries."""
+    data = make_dataset(10, 1, 0)
+    data["users"] += [
+        _user("0xAbCdEf0000000000000000000000000000000001", None),
+        _user("0xabcdef0000000000000000000000000000000001", "0xFEED000000000000000000000000000000000001"),
+        _user("mixed", "0xfeed000000000000000000000000000000000001"),
+        _user(f"0x{5:040X}", None),
+        _user("mover", "0xBEEF000000000000000000000000000000000001"),
+    ]
+    write_dataset(tmp_path / "data.json", data)
+    stores = [JsonStore(tmp_path / "data.json"), SqliteStore(tmp_path / "data.db")]
+    stores[1].import_data(data)
+    for store in stores:
+        store.add_user(User(**_user("late", "0xbeef000000000000000000000000000000000001")))
+        store.update_user(store.get_user("mover").model_copy(
+            update={"wallet_address": "0xC0FFEE0000000000000000000000000000000001"}))
+        store.update_user(store.get_user("user3").model_copy(update={"wallet_address": f"0x{7:040X}"}))
+    return stores + [JsonStore(tmp_path / "data.json")]  # the last one replays the log
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_indexed_lookup_matches_scan(stores, query):
+    for store in stores:
+        users = store.get_all_users()
+        assert store.get_user(query) == scan_user(users, query)
+        assert store.get_user_by_wallet(query) == scan_wallet(users, query)
+
+
+def test_every_user_is_found_like_the_scan(stores):
+    for store in stores:
+        users = store.get_all_users()
+        for user in users:
+            for query in (user.username, user.wallet_address, (user.wallet_address or "").upper().replace("0X", "0x")):
+                if query:
+                    assert store.get_user(query) == scan_user(users, query)
+                    assert store.get_user_by_wallet(query) == scan_wallet(users, query)